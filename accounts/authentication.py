@@ -0,0 +1,31 @@
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from .tokens import InvalidToken, revoked_accounts, user_from_payload, verify_token
+
+
+class SignedTokenAuthentication(TokenAuthentication):
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        # Database tokens never contain a dot, so they are left to TokenAuthentication.
+        if len(auth) != 2 or auth[0].lower() != self.keyword.lower().encode() or b"." not in auth[1]:
+            return None
+
+        try:
+            token = auth[1].decode("ascii")
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Invalid token header. Token string should not contain invalid characters.")
+
+        return self.authenticate_credentials(token)
+
+    def authenticate_credentials(self, key):
+        try:
+            payload = verify_token(key)
+        except InvalidToken as error:
+            raise exceptions.AuthenticationFailed(str(error))
+
+        if revoked_accounts.is_revoked(payload["sub"], payload.get("iat", 0)):
+            raise exceptions.AuthenticationFailed("User inactive or deleted.")
+
+        return (user_from_payload(payload), key)
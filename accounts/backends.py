@@ -0,0 +1,36 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+
+from .hashers import get_hashing_pool, verify_password
+from .models import Account
+
+
+# ModelBackend with the password hashing moved to the hashing pool. Raises
+# HashingPoolFull when the pool has no room left.
+class PooledModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(Account.USERNAME_FIELD)
+
+        if username is None or password is None:
+            return None
+
+        pool = get_hashing_pool()
+
+        try:
+            user = Account._default_manager.get_by_natural_key(username)
+        except Account.DoesNotExist:
+            # Hash anyway, so unknown usernames take as long as wrong passwords.
+            pool.run(make_password, password)
+            return None
+
+        valid, upgraded = pool.run(verify_password, password, user.password)
+
+        if not valid or not self.user_can_authenticate(user):
+            return None
+
+        if upgraded:
+            user.password = upgraded
+            user.save(update_fields=["password"])
+
+        return user
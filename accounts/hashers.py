@@ -0,0 +1,67 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    # Same algorithm name as Django's hasher, so existing hashes still verify;
+    # any with a different iteration count are rehashed on the next login.
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHING["ITERATIONS"] or hashers.PBKDF2PasswordHasher.iterations
+
+
+class HashingPoolFull(Exception):
+    pass
+
+
+# Runs password hashing outside of the request threads, at most WORKERS at a
+# time with up to QUEUE_SIZE more waiting. Anything beyond that is refused at
+# once, so a burst of logins cannot take every worker away from other requests.
+# hashlib releases the GIL while hashing, so threads are enough.
+class HashingPool:
+    def __init__(self, workers, queue_size):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def run(self, function, *args):
+        if not self.slots.acquire(blocking=False):
+            raise HashingPoolFull
+
+        try:
+            future = self.executor.submit(function, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self.slots.release())
+
+        return future.result()
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_hashing_pool() -> HashingPool:
+    # Threads do not survive a fork, so each worker process gets its own pool.
+    with pools_lock:
+        if os.getpid() not in pools:
+            pools[os.getpid()] = HashingPool(
+                settings.PASSWORD_HASHING["WORKERS"], settings.PASSWORD_HASHING["QUEUE_SIZE"]
+            )
+
+        return pools[os.getpid()]
+
+
+def verify_password(password, encoded):
+    # Returns whether the password matches and, when the hash is outdated, a
+    # new one, so that both hashes are computed in the pool.
+    upgraded = []
+
+    valid = hashers.check_password(password, encoded, setter=lambda raw: upgraded.append(hashers.make_password(raw)))
+
+    return valid, upgraded[0] if upgraded else None
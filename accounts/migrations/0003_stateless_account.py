@@ -0,0 +1,35 @@
+# Generated by Django 4.1 on 2026-10-18 20:13
+
+import django.contrib.auth.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_account_account_date_joined_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatelessAccount",
+            fields=[],
+            options={
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("accounts.account",),
+            managers=[
+                ("objects", django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="account",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["id"],
+                name="account_inactive_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.1 on 2026-10-18 20:35
+
+from django.db import migrations, models
+import utils.ids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_stateless_account"),
+    ]
+
+    # The default only exists in Python, so existing ids stay as they are and
+    # the table does not need to be touched.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="account",
+                    name="id",
+                    field=models.UUIDField(
+                        default=utils.ids.uuid7,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1 on 2026-10-18 21:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_account_uuid7_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TokenRevocation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("account_id", models.UUIDField()),
+                ("revoked_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
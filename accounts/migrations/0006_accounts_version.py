@@ -0,0 +1,33 @@
+import time
+
+from django.db import migrations
+
+ACCOUNTS_VERSION_KEY = "accounts:version"
+
+
+# Creates the counter up front, so reading it is a single lookup from the
+# first request on.
+def create_accounts_version(apps, schema_editor):
+    Generation = apps.get_model("utils", "Generation")
+
+    Generation.objects.using(schema_editor.connection.alias).get_or_create(
+        key=ACCOUNTS_VERSION_KEY, defaults={"value": time.time_ns()}
+    )
+
+
+def delete_accounts_version(apps, schema_editor):
+    Generation = apps.get_model("utils", "Generation")
+
+    Generation.objects.using(schema_editor.connection.alias).filter(key=ACCOUNTS_VERSION_KEY).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_token_revocation"),
+        ("utils", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_accounts_version, delete_accounts_version),
+    ]
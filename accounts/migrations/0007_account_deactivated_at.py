@@ -0,0 +1,41 @@
+# Generated by Django 4.1 on 2026-10-18 22:25
+
+import accounts.models
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Accounts already inactive count as deactivated now, so the signed tokens
+# they still hold stay revoked for a token lifetime.
+def time_deactivations(apps, schema_editor):
+    Account = apps.get_model("accounts", "Account")
+
+    Account.objects.using(schema_editor.connection.alias).filter(is_active=False).update(
+        deactivated_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_accounts_version"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="account",
+            managers=[
+                ("objects", accounts.models.AccountManager()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="account",
+            name="account_inactive_idx",
+        ),
+        migrations.AddField(
+            model_name="account",
+            name="deactivated_at",
+            field=models.DateTimeField(db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(time_deactivations, migrations.RunPython.noop),
+    ]
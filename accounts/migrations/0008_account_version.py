@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_account_deactivated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -1,13 +1,81 @@
-import uuid
-
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.utils import timezone
+
+from utils.ids import uuid7
+
+class AccountQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        # Deactivations that bypass save() are timed as well, so they still
+        # revoke the signed tokens (see accounts.tokens.RevocationSet).
+        if kwargs.get("is_active") is False:
+            kwargs.setdefault("deactivated_at", timezone.now())
+
+        return super().update(**kwargs)
+
+class AccountManager(UserManager.from_queryset(AccountQuerySet)):
+    pass
 
 class Account(AbstractUser):
-    id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
+    id = models.UUIDField(default=uuid7, primary_key=True, editable=False)
     username = models.CharField(max_length=20, unique=True)
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     is_seller = models.BooleanField(default=False)
+    # When the account was last deactivated, None if it never was.
+    deactivated_at = models.DateTimeField(null=True, editable=False, db_index=True)
+    # Bumped by every write to the fields the API shows, the ETags of the
+    # seller's products are built from it (see products.versions).
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = AccountManager()
 
     REQUIRED_FIELDS = ["first_name", "last_name"]
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["-date_joined", "-id"], name="account_date_joined_id_idx"),
+        ]
+
+    # The values read from the database, so a save can tell what it changed
+    # (see accounts.receivers.revoke_changed_tokens).
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded_values = getattr(self, "_loaded_values", {})
+
+        if self.__dict__.get("is_active") is False and loaded_values.get("is_active", True) is not False:
+            self.deactivated_at = timezone.now()
+
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "deactivated_at"}
+
+        super().save(*args, **kwargs)
+
+
+class StatelessAccount(Account):
+    # Built from signed token claims without a query. Touching any field that
+    # is not in the token loads all the missing fields at once.
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred_fields = self.get_deferred_fields()
+
+        if fields is not None and set(fields) <= deferred_fields:
+            fields = deferred_fields
+
+        super().refresh_from_db(using=using, fields=fields)
+
+
+class TokenRevocation(models.Model):
+    # Signed tokens of the account issued up to revoked_at are rejected. The
+    # account is not a foreign key, so revocations outlive deleted accounts.
+    account_id = models.UUIDField()
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
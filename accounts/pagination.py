@@ -0,0 +1,5 @@
+from utils.pagination import KeysetPagination
+
+
+class AccountPagination(KeysetPagination):
+    ordering = ("-date_joined", "-id")
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Account
+from .serializers import ACCOUNT_READ_FIELDS
+from .tokens import REVOKING_FIELDS, revoke_tokens
+from .versions import invalidate_accounts
+
+MISSING = object()
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def account_written(sender, instance, using, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the account list does not show.
+    if update_fields is not None and not set(update_fields) & set(ACCOUNT_READ_FIELDS):
+        return
+
+    # After the commit, so the counter's row is locked for this statement only.
+    transaction.on_commit(invalidate_accounts, using=using)
+
+
+@receiver(post_save, sender=Account)
+def account_saved(sender, instance, created, using, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not set(update_fields) & set(ACCOUNT_READ_FIELDS)):
+        return
+
+    # In the transaction of the save, a single row whatever the account owns.
+    Account.objects.using(using).filter(id=instance.id).update(version=F("version") + 1)
+
+
+@receiver(post_save, sender=Account)
+def revoke_changed_tokens(sender, instance, created, using, update_fields=None, **kwargs):
+    # Signed tokens carry the roles of the account, so they must not outlive
+    # a change to them. Queryset updates bypass this; deactivations made that
+    # way are still caught by RevocationSet.load().
+    fields = REVOKING_FIELDS if update_fields is None else set(update_fields) & set(REVOKING_FIELDS)
+    loaded_values = getattr(instance, "_loaded_values", None)
+
+    if not created and (loaded_values is None or any(
+        loaded_values.get(field, MISSING) != instance.__dict__.get(field, MISSING) for field in fields
+    )):
+        revoke_tokens(instance.id, using=using)
+
+    # What the next save of this instance is compared with.
+    instance._loaded_values = {
+        **(loaded_values or {}),
+        **{field: instance.__dict__[field] for field in fields if field in instance.__dict__},
+    }
+
+
+@receiver(post_delete, sender=Account)
+def revoke_deleted_tokens(sender, instance, using, **kwargs):
+    revoke_tokens(instance.id, using=using)
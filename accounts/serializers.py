@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from utils.serializers import FieldsetSerializerMixin
+from utils.timing import TimedSerializerMixin
+
 from .models import Account
 
-class AccountSerializer(serializers.ModelSerializer):
+class AccountSerializer(TimedSerializerMixin, FieldsetSerializerMixin, serializers.ModelSerializer):
     username = serializers.CharField(
         validators=[UniqueValidator(queryset=Account.objects.all(), message=["username already exists"])]
     )
@@ -30,17 +33,21 @@ class AccountSerializer(serializers.ModelSerializer):
         return user_account
 
     def update(self, instance: Account, validated_data: dict) -> Account:
+        updated_fields = []
 
         for key, value in validated_data.items():
             if key == "is_active":
                 continue
 
             setattr(instance, key, value)
+            updated_fields.append(key)
 
-        instance.save()
+        instance.save(update_fields=updated_fields)
 
         return instance
 
+ACCOUNT_READ_FIELDS = [field for field in AccountSerializer.Meta.fields if field != "password"]
+
 class IsActiveSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -54,7 +61,7 @@ class IsActiveSerializer(serializers.ModelSerializer):
             "date_joined",
             "is_superuser"
         ]
-        exclude = ["password"]
+        exclude = ["password", "deactivated_at", "version"]
 
     def update(self, instance: Account, validated_data: dict) -> Account:
 
@@ -64,7 +71,7 @@ class IsActiveSerializer(serializers.ModelSerializer):
 
             setattr(instance, key, value)
 
-        instance.save()
+        instance.save(update_fields=["is_active"])
 
         return instance
 
@@ -0,0 +1,178 @@
+import time
+from datetime import timedelta
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from accounts.tokens import RevocationSet, issue_token, revoked_accounts
+
+SIGNED_TOKENS = {
+    "ISSUE_ON_LOGIN": True,
+    "LIFETIME": 60,
+    "REVOCATION_REFRESH_INTERVAL": 30,
+}
+
+@override_settings(SIGNED_TOKENS=SIGNED_TOKENS)
+class SignedTokenAuthenticationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        seller_data = {
+            "username": "victo",
+            "password": "1234",
+            "first_name": "Victoria",
+            "last_name": "Viana",
+            "is_seller": True
+        }
+
+        admin_data = {
+            "username": "rosi",
+            "password": "123456",
+            "first_name": "Rosi",
+            "last_name": "Naldo",
+            "is_seller": False
+        }
+
+        cls.seller = Account.objects.create_user(**seller_data)
+
+        admin = Account.objects.create_superuser(**admin_data)
+        cls.admin_token = Token.objects.create(user=admin)
+
+        cls.base_url_detail = f"/api/accounts/{cls.seller.id}/"
+        cls.base_url_management = f"/api/accounts/{cls.seller.id}/management/"
+
+    def setUp(self) -> None:
+        revoked_accounts.refresh()
+
+    def test_login_issues_signed_token(self):
+        print("test_login_issues_signed_token")
+
+        response = self.client.post("/api/login/", data={"username": "victo", "password": "1234"})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertIn(".", response.data["token"])
+        self.assertFalse(Token.objects.filter(user=self.seller).exists())
+
+    def test_signed_token_is_verified_without_token_lookup(self):
+        print("test_signed_token_is_verified_without_token_lookup")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + issue_token(self.seller))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/products/",
+                data={"description": "Mouse", "price": "10.00", "quantity": 1, "is_active": True}
+            )
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertEqual("Victoria", response.data["seller"]["first_name"])
+
+        for query in queries.captured_queries:
+            self.assertNotIn("authtoken_token", query["sql"])
+
+    def test_tampered_token_is_rejected(self):
+        print("test_tampered_token_is_rejected")
+
+        body, signature = issue_token(self.seller).split(".")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {body[:-2]}xx.{signature}")
+        response = self.client.patch(self.base_url_detail, data={"first_name": "Ipsaluna"})
+
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+    def test_expired_token_is_rejected(self):
+        print("test_expired_token_is_rejected")
+
+        with override_settings(SIGNED_TOKENS={**SIGNED_TOKENS, "LIFETIME": -1}):
+            token = issue_token(self.seller)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token)
+        response = self.client.patch(self.base_url_detail, data={"first_name": "Ipsaluna"})
+
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+    def test_deactivation_revokes_token_immediately(self):
+        print("test_deactivation_revokes_token_immediately")
+
+        token = issue_token(self.seller)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.admin_token.key)
+        self.client.patch(self.base_url_management, data={"is_active": False})
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token)
+        response = self.client.patch(self.base_url_detail, data={"first_name": "Ipsaluna"})
+
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+        self.seller.refresh_from_db()
+        self.assertIsNotNone(self.seller.deactivated_at)
+
+    def test_deactivation_elsewhere_applies_after_refresh_interval(self):
+        print("test_deactivation_elsewhere_applies_after_refresh_interval")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + issue_token(self.seller))
+        Account.objects.filter(id=self.seller.id).update(is_active=False)
+
+        response = self.client.patch(self.base_url_detail, data={"first_name": "Ipsaluna"})
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+        with override_settings(SIGNED_TOKENS={**SIGNED_TOKENS, "REVOCATION_REFRESH_INTERVAL": 0}):
+            response = self.client.patch(self.base_url_detail, data={"first_name": "Ipsaluna"})
+
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+    def test_only_recent_deactivations_are_loaded(self):
+        print("test_only_recent_deactivations_are_loaded")
+
+        Account.objects.filter(id=self.seller.id).update(is_active=False)
+
+        self.assertIn(self.seller.id.int, RevocationSet().load())
+
+        Account.objects.filter(id=self.seller.id).update(deactivated_at=timezone.now() - timedelta(seconds=61))
+
+        self.assertNotIn(self.seller.id.int, RevocationSet().load())
+
+    def test_role_change_revokes_token(self):
+        print("test_role_change_revokes_token")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + issue_token(self.seller))
+
+        response = self.client.patch(self.base_url_detail, data={"first_name": "Vic"})
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+        response = self.client.patch(self.base_url_detail, data={"is_seller": False})
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+        response = self.client.patch(self.base_url_detail, data={"first_name": "Ipsaluna"})
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+    def test_deletion_revokes_token(self):
+        print("test_deletion_revokes_token")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + issue_token(self.seller))
+        self.seller.delete()
+
+        response = self.client.get("/api/products/")
+
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+    def test_refresh_keeps_revocations_added_meanwhile(self):
+        print("test_refresh_keeps_revocations_added_meanwhile")
+
+        seller = self.seller
+
+        class ConcurrentRevocationSet(RevocationSet):
+            def load(self):
+                cutoffs = super().load()
+                self.add(seller.id, time.time())
+
+                return cutoffs
+
+        revocations = ConcurrentRevocationSet()
+
+        self.assertTrue(revocations.is_revoked(seller.id, int(time.time())))
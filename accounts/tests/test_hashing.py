@@ -0,0 +1,105 @@
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.hashers import HashingPool, HashingPoolFull
+from accounts.models import Account
+
+class HashingPoolTest(SimpleTestCase):
+    def test_pool_refuses_work_past_its_queue(self):
+        print("test_pool_refuses_work_past_its_queue")
+
+        pool = HashingPool(workers=1, queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        callers = [threading.Thread(target=pool.run, args=(block,)) for _ in range(2)]
+
+        for caller in callers:
+            caller.start()
+
+        started.wait(5)
+
+        # One job runs and one waits, so the queue is full.
+        while pool.slots._value:
+            time.sleep(0.01)
+
+        with self.assertRaises(HashingPoolFull):
+            pool.run(lambda: None)
+
+        release.set()
+
+        for caller in callers:
+            caller.join()
+
+        self.assertEqual(4, pool.run(lambda value: value * 2, 2))
+
+    def test_pool_frees_its_slot_when_the_job_fails(self):
+        print("test_pool_frees_its_slot_when_the_job_fails")
+
+        pool = HashingPool(workers=1, queue_size=0)
+
+        with self.assertRaises(ZeroDivisionError):
+            pool.run(lambda: 1 / 0)
+
+        self.assertEqual(1, pool.run(lambda: 1))
+
+
+class PooledLoginTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/login/"
+        cls.credentials = {"username": "victo", "password": "1234"}
+
+        with override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, "ITERATIONS": 1000}):
+            cls.account = Account.objects.create_user(
+                **cls.credentials, first_name="Victoria", last_name="Viana", is_seller=True
+            )
+
+    def test_login_answers_503_when_the_pool_is_full(self):
+        print("test_login_answers_503_when_the_pool_is_full")
+
+        pool = HashingPool(workers=1, queue_size=0)
+
+        with mock.patch("accounts.backends.get_hashing_pool", return_value=pool):
+            pool.slots.acquire()
+            response = self.client.post(self.base_url, data=self.credentials)
+            pool.slots.release()
+
+            self.assertEqual(status.HTTP_503_SERVICE_UNAVAILABLE, response.status_code)
+            self.assertEqual(str(settings.PASSWORD_HASHING["RETRY_AFTER"]), response["Retry-After"])
+
+            response = self.client.post(self.base_url, data=self.credentials)
+
+            self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    def test_login_rejects_wrong_passwords_and_unknown_users(self):
+        print("test_login_rejects_wrong_passwords_and_unknown_users")
+
+        for credentials in ({"username": "victo", "password": "4321"}, {"username": "ana", "password": "1234"}):
+            response = self.client.post(self.base_url, data=credentials)
+
+            self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    def test_login_updates_outdated_hashes(self):
+        print("test_login_updates_outdated_hashes")
+
+        self.assertIn("$1000$", self.account.password)
+
+        with override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, "ITERATIONS": 2000}):
+            response = self.client.post(self.base_url, data=self.credentials)
+
+        self.account.refresh_from_db()
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertIn("$2000$", self.account.password)
+        self.assertTrue(self.account.check_password("1234"))
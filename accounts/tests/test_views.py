@@ -201,4 +201,47 @@ class AccountAuthTest(APITestCase):
         expected_status_code = status.HTTP_200_OK
         result_status_code = response.status_code
 
-        self.assertEqual(expected_status_code, result_status_code)
\ No newline at end of file
+        self.assertEqual(expected_status_code, result_status_code)
+
+class AccountPaginationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/accounts/"
+
+        cls.accounts = [
+            Account.objects.create_user(
+                username=f"user_{index}",
+                password="1234",
+                first_name="User",
+                last_name=str(index)
+            )
+            for index in range(5)
+        ]
+
+    def test_accounts_are_paginated_newest_first(self):
+        print("test_accounts_are_paginated_newest_first")
+
+        url = f"{self.base_url}?page_size=2"
+        retrieved_usernames = []
+
+        while url:
+            data = self.client.get(url).json()
+
+            self.assertNotIn("count", data)
+            retrieved_usernames += [account["username"] for account in data["results"]]
+            url = data["next"]
+
+        expected_usernames = [f"user_{index}" for index in reversed(range(5))]
+
+        self.assertListEqual(expected_usernames, retrieved_usernames)
+
+    def test_accounts_return_only_the_requested_fields(self):
+        print("test_accounts_return_only_the_requested_fields")
+
+        data = self.client.get(f"{self.base_url}?page_size=2&fields=username").json()
+
+        self.assertListEqual([{"username": "user_4"}, {"username": "user_3"}], data["results"])
+
+        response = self.client.get(f"{self.base_url}?fields=password")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
@@ -0,0 +1,168 @@
+import base64
+import hashlib
+import hmac
+import json
+import math
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Account, StatelessAccount, TokenRevocation
+
+TOKEN_CLAIMS = {
+    "sub": "id",
+    "usr": "username",
+    "sel": "is_seller",
+    "stf": "is_staff",
+    "su": "is_superuser",
+}
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def get_signing_key() -> bytes:
+    return hashlib.sha256(b"accounts.signed-token:" + settings.SECRET_KEY.encode()).digest()
+
+
+def sign(body: str) -> str:
+    return b64encode(hmac.new(get_signing_key(), body.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(user: Account) -> str:
+    issued_at = int(time.time())
+
+    payload = {claim: getattr(user, field) for claim, field in TOKEN_CLAIMS.items()}
+    payload["sub"] = user.id.hex
+    payload["iat"] = issued_at
+    payload["exp"] = issued_at + settings.SIGNED_TOKENS["LIFETIME"]
+
+    body = b64encode(json.dumps(payload, separators=(",", ":")).encode())
+
+    return f"{body}.{sign(body)}"
+
+
+def verify_token(token: str) -> dict:
+    try:
+        body, signature = token.split(".")
+    except ValueError:
+        raise InvalidToken("Malformed token.")
+
+    if not hmac.compare_digest(sign(body), signature):
+        raise InvalidToken("Invalid token signature.")
+
+    try:
+        payload = json.loads(b64decode(body))
+        payload["sub"] = uuid.UUID(hex=payload["sub"])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidToken("Malformed token.")
+
+    if payload.get("exp", 0) < time.time():
+        raise InvalidToken("Token has expired.")
+
+    return payload
+
+
+def user_from_payload(payload: dict) -> StatelessAccount:
+    values = {field: payload[claim] for claim, field in TOKEN_CLAIMS.items()}
+    values["is_active"] = True
+
+    field_names = [field.attname for field in Account._meta.concrete_fields if field.attname in values]
+
+    return StatelessAccount.from_db(None, field_names, [values[name] for name in field_names])
+
+
+# Fields whose change revokes the account's tokens: the claims, which the
+# token would otherwise keep asserting, and is_active.
+REVOKING_FIELDS = [*TOKEN_CLAIMS.values(), "is_active"]
+
+
+# Revocation cutoff of each account: its tokens issued at or before it are
+# rejected. Tokens carry whole seconds, so a token issued in the same second
+# as a revocation is rejected too. The cutoffs are the revocations and the
+# deactivations (Account.deactivated_at, also set by queryset updates) of the
+# last token LIFETIME; older ones can only match expired tokens, and an
+# inactive account gets no new ones. They are reloaded from the database at
+# most once per
+# SIGNED_TOKENS["REVOCATION_REFRESH_INTERVAL"] seconds, so a revocation made
+# through another worker takes effect within that window; this worker's own
+# take effect right away through add().
+class RevocationSet:
+    def __init__(self):
+        self._cutoffs = {}
+        self._refreshed_at = None
+        self._added = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def load(self) -> dict:
+        since = timezone.now() - timedelta(seconds=settings.SIGNED_TOKENS["LIFETIME"])
+        revocations = TokenRevocation.objects.filter(revoked_at__gte=since).values_list("account_id", "revoked_at")
+        deactivations = Account.objects.filter(deactivated_at__gte=since).values_list("id", "deactivated_at")
+        cutoffs = {}
+
+        for rows in (revocations, deactivations):
+            for account_id, revoked_at in rows.iterator():
+                cutoffs[account_id.int] = max(cutoffs.get(account_id.int, 0), revoked_at.timestamp())
+
+        return cutoffs
+
+    def refresh(self):
+        # Revocations added while the database is read may be missing from
+        # what it returns, so they are applied again on top of it.
+        with self._lock:
+            self._added = {}
+
+        cutoffs = self.load()
+
+        with self._lock:
+            self._cutoffs = {**cutoffs, **self._added}
+            self._added = None
+            self._refreshed_at = time.monotonic()
+
+    def is_stale(self):
+        interval = settings.SIGNED_TOKENS["REVOCATION_REFRESH_INTERVAL"]
+
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= interval
+
+    def is_revoked(self, account_id: uuid.UUID, issued_at: int) -> bool:
+        # Only one thread refreshes; the others keep using the current cutoffs.
+        if self.is_stale() and self._refresh_lock.acquire(blocking=self._refreshed_at is None):
+            try:
+                if self.is_stale():
+                    self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+        return issued_at <= self._cutoffs.get(account_id.int, -math.inf)
+
+    def add(self, account_id: uuid.UUID, revoked_at: float):
+        with self._lock:
+            self._cutoffs = {**self._cutoffs, account_id.int: revoked_at}
+
+            if self._added is not None:
+                self._added[account_id.int] = revoked_at
+
+
+revoked_accounts = RevocationSet()
+
+
+def revoke_tokens(account_id: uuid.UUID, using="default"):
+    revocation = TokenRevocation.objects.using(using).create(account_id=account_id)
+
+    # Right away for this worker; should the transaction roll back, the next
+    # refresh drops it again.
+    revoked_accounts.add(account_id, revocation.revoked_at.timestamp())
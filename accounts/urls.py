@@ -6,5 +6,6 @@ urlpatterns = (
     path("login/", views.LoginView.as_view()),
     path("accounts/newest/<int:num>/", views.AccountDetailView.as_view()),
     path("accounts/<pk>/", views.AccountUpdateView.as_view()),
-    path("accounts/<pk>/management/", views.ManagementView.as_view())
+    path("accounts/<pk>/management/", views.ManagementView.as_view()),
+    path("async/accounts/", views.AccountAsyncView.as_view()),
 )
\ No newline at end of file
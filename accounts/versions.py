@@ -0,0 +1,11 @@
+from utils.generations import bump_generation, get_generation
+
+ACCOUNTS_VERSION_KEY = "accounts:version"
+
+
+def get_accounts_version() -> int:
+    return get_generation(ACCOUNTS_VERSION_KEY)
+
+
+def invalidate_accounts():
+    bump_generation(ACCOUNTS_VERSION_KEY)
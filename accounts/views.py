@@ -1,19 +1,47 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
 
 from rest_framework.views import APIView, Request, Response, status
 from rest_framework.generics import ListCreateAPIView, ListAPIView, UpdateAPIView
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAdminUser
+from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from accounts.permissions import IsAccountOwner
+from utils.generations import query_digest
+from utils.mixins import CachedResponseMixin, SparseFieldsetMixin, ValuesListMixin
+from utils.schema import fieldset_parameters
+from utils.serializers import ValuesSerializer
+from utils.views import AsyncListView
 
-from .serializers import AccountSerializer, IsActiveSerializer, LoginSerializer
+from .serializers import ACCOUNT_READ_FIELDS, AccountSerializer, IsActiveSerializer, LoginSerializer
 
+from .hashers import HashingPoolFull
 from .models import Account
+from .pagination import AccountPagination
+from .tokens import issue_token
+from .versions import get_accounts_version
 
-class AccountView(ListCreateAPIView):
-    queryset = Account.objects.all()
+@extend_schema_view(get=extend_schema(parameters=fieldset_parameters()))
+class AccountView(CachedResponseMixin, SparseFieldsetMixin, ValuesListMixin, ListCreateAPIView):
+    queryset = Account.objects.only(*ACCOUNT_READ_FIELDS)
     serializer_class = AccountSerializer
+    values_serializer = ValuesSerializer(AccountSerializer)
+    pagination_class = AccountPagination
+
+    def get_response_cache_key(self, request):
+        return f"accounts:list:{get_accounts_version()}:{query_digest(request)}"
+
+    def get_stale_cache_key(self, request):
+        return f"accounts:list-stale:{query_digest(request)}"
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(request) or super().list(request, *args, **kwargs)
+
+class AccountAsyncView(AsyncListView):
+    queryset = AccountView.queryset
+    serializer_class = AccountSerializer
+    pagination_class = AccountPagination
 
 class AccountDetailView(ListAPIView):
     queryset = Account.objects.all()
@@ -32,14 +60,24 @@ class LoginView(APIView):
         serialized_login = LoginSerializer(data=request.data)
         serialized_login.is_valid(raise_exception=True)
 
-        user = authenticate(
-            username=serialized_login.validated_data["username"],
-            password=serialized_login.validated_data["password"]
-        )
+        try:
+            user = authenticate(
+                username=serialized_login.validated_data["username"],
+                password=serialized_login.validated_data["password"]
+            )
+        except HashingPoolFull:
+            return Response(
+                {"detail": "too many login attempts, try again later"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(settings.PASSWORD_HASHING["RETRY_AFTER"])},
+            )
 
         if not user:
             return Response({"detail": "invalid username or password"}, status=status.HTTP_400_BAD_REQUEST)
 
+        if settings.SIGNED_TOKENS["ISSUE_ON_LOGIN"]:
+            return Response({"token": issue_token(user)})
+
         token, _ = Token.objects.get_or_create(user=user)
 
         return Response({"token": token.key})
@@ -52,4 +90,4 @@ class AccountUpdateView(UpdateAPIView):
 class ManagementView(UpdateAPIView):
     permission_classes = [IsAdminUser]
     queryset = Account.objects.all()
-    serializer_class = IsActiveSerializer
\ No newline at end of file
+    serializer_class = IsActiveSerializer
@@ -0,0 +1,110 @@
+import collections
+import contextlib
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "komercio.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database():
+    # Benchmarks run against a throwaway database, never the configured one.
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextlib.contextmanager
+def serve(arguments, port, env=None):
+    # Runs gunicorn with the given arguments until the block exits.
+    command = [sys.executable, "-m", "gunicorn", *arguments, "--bind", f"127.0.0.1:{port}"]
+    server = subprocess.Popen(
+        command, env={**os.environ, **(env or {})}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        deadline = time.monotonic() + 30
+
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise SystemExit(f"{' '.join(command)} did not start.")
+
+                time.sleep(0.1)
+
+        yield
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def client(port, requests, deadline, latencies, errors):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    index = 0
+
+    while time.monotonic() < deadline:
+        method, path, body = requests[index % len(requests)]
+        started = time.perf_counter()
+        index += 1
+
+        try:
+            connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(None)
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            continue
+
+        if response.status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(response.status)
+
+
+def load(port, requests, concurrency, duration):
+    # Sends requests, a list of (method, path, body), from concurrency clients
+    # for duration seconds. Returns successful requests per second, the p50
+    # and p99 latencies in milliseconds and the failed responses by status.
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+
+    clients = [
+        threading.Thread(target=client, args=(port, requests, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+
+    latencies.sort()
+
+    def percentile(value):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * value))] * 1000 if latencies else 0
+
+    return len(latencies) / duration, percentile(0.5), percentile(0.99), collections.Counter(errors)
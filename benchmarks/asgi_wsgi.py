@@ -0,0 +1,66 @@
+"""
+Compares the sync views under gunicorn's WSGI workers with the async views
+under uvicorn workers, at the same number of workers, for a growing number of
+concurrent clients. The response cache is turned off so every request queries.
+Needs a PostgreSQL database, gunicorn and uvicorn.
+
+    python -m benchmarks.asgi_wsgi --workers 2 --concurrency 1 16 64 --duration 10
+"""
+import argparse
+
+from benchmarks import load, serve, setup, test_database
+
+SERVERS = {
+    "wsgi": (["komercio.wsgi"], "/api/products/"),
+    "asgi": (["komercio.asgi", "--worker-class", "uvicorn.workers.UvicornWorker"], "/api/async/products/"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.db import connection
+
+    from accounts.models import Account
+    from products.models import Product
+
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs a PostgreSQL database.")
+
+    with test_database():
+        seller = Account.objects.create_user(
+            username="bench", password="bench", first_name="Bench", last_name="Seller", is_seller=True
+        )
+        products = Product.objects.bulk_create(
+            Product(description=f"Produto {index}", price=index % 1000, quantity=index % 50, seller=seller)
+            for index in range(args.products)
+        )
+        env = {"POSTGRES_DB": connection.settings_dict["NAME"], "RESPONSE_CACHE_TIMEOUT": "0"}
+        connection.close()
+
+        for name, (arguments, list_path) in SERVERS.items():
+            requests = [
+                ("GET", f"{list_path}?page_size=20", None),
+                *(("GET", f"{list_path}{product.id}/", None) for product in products[:100]),
+            ]
+
+            with serve([*arguments, "--workers", str(args.workers)], args.port, env):
+                for concurrency in args.concurrency:
+                    rate, p50, p99, errors = load(args.port, requests, concurrency, args.duration)
+
+                    print(
+                        f"{name} {args.workers} workers, {concurrency:4} clients: {rate:8.0f} req/s   "
+                        f"p50 {p50:8.1f} ms   p99 {p99:8.1f} ms   errors {sum(errors.values())}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
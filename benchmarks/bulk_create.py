@@ -0,0 +1,58 @@
+"""
+Compares creating products one request at a time with the bulk endpoint.
+
+    python -m benchmarks.bulk_create --items 2000
+"""
+import argparse
+import time
+
+from benchmarks import setup, test_database
+
+
+def make_products(amount):
+    return [
+        {"description": f"Produto {index}", "price": f"{index % 1000}.99", "quantity": index % 50, "is_active": True}
+        for index in range(amount)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from accounts.models import Account
+    from products.models import Product
+
+    with test_database():
+        seller = Account.objects.create_user(
+            username="bench", password="bench", first_name="Bench", last_name="Seller", is_seller=True
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Token " + Token.objects.create(user=seller).key)
+
+        products = make_products(args.items)
+
+        started = time.perf_counter()
+        for product in products:
+            client.post("/api/products/", data=product, format="json")
+        one_by_one = time.perf_counter() - started
+
+        Product.objects.all().delete()
+
+        started = time.perf_counter()
+        client.post("/api/products/bulk/", data=products, format="json")
+        bulk = time.perf_counter() - started
+
+    print(f"one by one: {args.items / one_by_one:10.0f} products/s ({one_by_one:.2f}s)")
+    print(f"bulk:       {args.items / bulk:10.0f} products/s ({bulk:.2f}s)")
+    print(f"speedup:    {one_by_one / bulk:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares get/set throughput of the shared memory cache with Django's
+local-memory and file based caches, from one process and from several.
+With several processes each locmem cache is private, so the workers never see
+each other's writes; the other two are shared.
+
+    python -m benchmarks.cache_backends --operations 20000 --processes 4
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+from benchmarks import setup
+
+VALUE = {"id": "6f1c2a4e-8d4b-4d8e-9f55-3f1e8f3e2b10", "description": "Produto", "price": "19.90", "quantity": 3}
+
+
+def make_caches(directory, entries):
+    from django.core.cache.backends.filebased import FileBasedCache
+    from django.core.cache.backends.locmem import LocMemCache
+
+    from utils.cache import SharedMemoryCache
+
+    options = {"OPTIONS": {"MAX_ENTRIES": entries}}
+
+    return {
+        "locmem": lambda: LocMemCache("benchmark", options),
+        "filebased": lambda: FileBasedCache(f"{directory}/filebased", options),
+        "shared memory": lambda: SharedMemoryCache(f"{directory}/shared", {"OPTIONS": {**options["OPTIONS"], "SLOT_SIZE": 512}}),
+    }
+
+
+def run(make_cache, operations, keys):
+    cache = make_cache()
+
+    started = time.perf_counter()
+    for index in range(operations):
+        cache.set(f"key-{index % keys}", VALUE)
+    set_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for index in range(operations):
+        cache.get(f"key-{index % keys}")
+    get_elapsed = time.perf_counter() - started
+
+    return set_elapsed, get_elapsed
+
+
+def run_processes(make_cache, operations, keys, processes):
+    context = multiprocessing.get_context("fork")
+
+    workers = [context.Process(target=run, args=(make_cache, operations, keys)) for _ in range(processes)]
+
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    setup()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, make_cache in make_caches(directory, args.keys * 2).items():
+            set_elapsed, get_elapsed = run(make_cache, args.operations, args.keys)
+            elapsed = run_processes(make_cache, args.operations, args.keys, args.processes)
+
+            print(
+                f"{name:14} set {args.operations / set_elapsed:10.0f}/s   get {args.operations / get_elapsed:10.0f}/s   "
+                f"{args.processes} processes {2 * args.operations * args.processes / elapsed:10.0f} ops/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
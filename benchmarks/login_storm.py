@@ -0,0 +1,80 @@
+"""
+Measures login throughput and catalog latency while a burst of logins hits
+gunicorn, first with catalog traffic alone and then with both. Pass the
+password hashing settings through the environment to compare them, e.g.
+PASSWORD_HASHING_WORKERS=1 PASSWORD_HASHING_QUEUE_SIZE=4.
+Needs a PostgreSQL database and gunicorn.
+
+    python -m benchmarks.login_storm --workers 2 --threads 8 --logins 32 --duration 10
+"""
+import argparse
+import json
+import threading
+
+from benchmarks import load, serve, setup, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--catalog", type=int, default=8, help="concurrent catalog clients")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.db import connection
+
+    from accounts.models import Account
+    from products.models import Product
+
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs a PostgreSQL database.")
+
+    with test_database():
+        sellers = [
+            Account.objects.create_user(
+                username=f"bench_{index}", password="bench", first_name="Bench", last_name="Seller", is_seller=True
+            )
+            for index in range(20)
+        ]
+        Product.objects.bulk_create(
+            Product(description=f"Produto {index}", price=index % 1000, quantity=index % 50, seller=sellers[index % 20])
+            for index in range(1000)
+        )
+        env = {"POSTGRES_DB": connection.settings_dict["NAME"], "RESPONSE_CACHE_TIMEOUT": "0"}
+        connection.close()
+
+        catalog = [("GET", "/api/products/?page_size=20", None)]
+        logins = [
+            ("POST", "/api/login/", json.dumps({"username": seller.username, "password": "bench"})) for seller in sellers
+        ]
+
+        arguments = ["komercio.wsgi", "--workers", str(args.workers), "--threads", str(args.threads)]
+
+        with serve(arguments, args.port, env):
+            rate, p50, p99, _ = load(args.port, catalog, args.catalog, args.duration)
+            print(f"catalog alone:      {rate:8.0f} req/s   p50 {p50:8.1f} ms   p99 {p99:8.1f} ms")
+
+            storm = {}
+            storm_thread = threading.Thread(
+                target=lambda: storm.update(result=load(args.port, logins, args.logins, args.duration))
+            )
+            storm_thread.start()
+            rate, p50, p99, _ = load(args.port, catalog, args.catalog, args.duration)
+            storm_thread.join()
+
+            print(f"catalog in storm:   {rate:8.0f} req/s   p50 {p50:8.1f} ms   p99 {p99:8.1f} ms")
+
+            rate, p50, p99, errors = storm["result"]
+            print(
+                f"logins:             {rate:8.0f} req/s   p50 {p50:8.1f} ms   p99 {p99:8.1f} ms   "
+                f"refused {errors.get(503, 0)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares serializing list pages with the ModelSerializers and with their
+ValuesSerializer twins, from the query to the JSON bytes, and product pages
+narrowed by ?fields= or widened by ?expand=seller.
+
+    python -m benchmarks.serializers --rows 100 --repeat 200
+"""
+import argparse
+import io
+import time
+
+from benchmarks import setup, test_database
+
+
+def measure(function, repeat):
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        function()
+
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+
+    from accounts.models import Account
+    from accounts.serializers import AccountSerializer
+    from products.models import Product
+    from products.serializers import ProductSerializer
+    from utils.serializers import ValuesSerializer
+
+    renderer = JSONRenderer()
+
+    with test_database():
+        call_command("seed", accounts=args.rows * 10, products=args.rows * 10, stdout=io.StringIO())
+
+        for name, queryset, serializer_class in [
+            ("products", Product.objects.order_by("-created_at", "-id"), ProductSerializer),
+            ("accounts", Account.objects.order_by("-date_joined", "-id"), AccountSerializer),
+        ]:
+            values_serializer = ValuesSerializer(serializer_class)
+            page = queryset[:args.rows]
+
+            def serialize_instances():
+                renderer.render(serializer_class(list(page), many=True).data)
+
+            def serialize_values():
+                renderer.render(values_serializer.serialize(list(page.values(*values_serializer.sources))))
+
+            instances = measure(serialize_instances, args.repeat)
+            values = measure(serialize_values, args.repeat)
+            rows = args.rows * args.repeat
+
+            print(f"{name} ModelSerializer:  {rows / instances:10.0f} rows/s")
+            print(f"{name} ValuesSerializer: {rows / values:10.0f} rows/s")
+            print(f"{name} speedup:          {instances / values:10.1f}x")
+
+        # What ?fields= and ?expand=seller cost compared with the full page.
+        page = Product.objects.order_by("-created_at", "-id")[:args.rows]
+
+        for fieldset in [{}, {"fields": ["id", "price"]}, {"expand": ["seller"]}]:
+            values_serializer = ValuesSerializer(ProductSerializer, **fieldset)
+
+            def serialize_fieldset():
+                return renderer.render(values_serializer.serialize(list(page.values(*values_serializer.sources))))
+
+            size = len(serialize_fieldset())
+            elapsed = measure(serialize_fieldset, args.repeat)
+            label = ", ".join(f"{key}={','.join(names)}" for key, names in fieldset.items()) or "all fields"
+
+            print(f"products {label:20} {args.rows * args.repeat / elapsed:10.0f} rows/s {size:8} bytes/page")
+
+
+if __name__ == "__main__":
+    main()
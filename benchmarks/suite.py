@@ -0,0 +1,379 @@
+"""
+Seeds a catalog, drives every operation of schema.yml from concurrent
+in-process clients and reports throughput and p50/p95/p99 latency per
+operation. With --baseline the results are compared with a stored run, and
+the command fails when an operation had failed requests or got slower than
+the tolerances allow, or when the baseline was recorded on another database
+or with other parameters. Runs with failed requests are never stored as a
+baseline.
+
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --write-baseline benchmarks/baseline.json
+"""
+import argparse
+import collections
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+
+from benchmarks import setup, test_database
+
+# Allowed change against the baseline: throughput may drop and latencies may
+# grow by these fractions. p99 has few samples and gets more room. Latencies
+# within min_latency_ms of the baseline are never a regression, they are
+# mostly noise. Failed requests always are.
+TOLERANCES = {
+    "throughput": 0.3,
+    "latency": 0.5,
+    "tail_latency": 1.5,
+    "min_latency_ms": 2.0,
+}
+
+
+class Catalog:
+    def __init__(self, sellers, products_per_seller, customers):
+        from django.contrib.auth.hashers import make_password
+        from rest_framework.authtoken.models import Token
+
+        from accounts.models import Account
+        from products.models import Product
+
+        self.counter = itertools.count()
+
+        # Hashed once, hashing it for every account would dominate the seeding.
+        password = make_password("1234")
+
+        self.sellers = Account.objects.bulk_create(
+            Account(username=f"seller_{index}", password=password, first_name="Seller", last_name=str(index), is_seller=True)
+            for index in range(sellers)
+        )
+        self.customers = Account.objects.bulk_create(
+            Account(username=f"customer_{index}", password=password, first_name="Customer", last_name=str(index))
+            for index in range(customers)
+        )
+        self.tokens = {seller.id: Token.objects.create(user=seller).key for seller in self.sellers}
+        self.admin_token = Token.objects.create(
+            user=Account.objects.create_superuser(username="admin", password="1234", first_name="A", last_name="B")
+        ).key
+
+        Product.objects.bulk_create(
+            Product(
+                description=f"Produto {index} da loja {seller.username}",
+                price=1 + index % 500,
+                quantity=1_000_000 if index % 10 == 0 else index % 50,
+                is_active=index % 20 != 0,
+                seller=seller,
+            )
+            for seller in self.sellers
+            for index in range(products_per_seller)
+        )
+
+        # Writes stay away from the stocked products, which are kept for the
+        # reservations.
+        self.products = {
+            seller.id: list(
+                Product.objects.filter(seller=seller).exclude(quantity=1_000_000).values_list("id", flat=True)
+            )
+            for seller in self.sellers
+        }
+        self.in_stock = list(Product.objects.filter(quantity=1_000_000, is_active=True).values_list("id", flat=True))
+
+    def next(self):
+        return next(self.counter)
+
+    def seller(self):
+        seller = self.sellers[self.next() % len(self.sellers)]
+
+        return seller, self.tokens[seller.id], self.products[seller.id]
+
+    def product_data(self):
+        return {"description": f"Produto novo {self.next()}", "price": "19.90", "quantity": 3, "is_active": True}
+
+
+# Requests for each operationId of schema.yml, as (path, body, token).
+def build_operations(catalog):
+    def seller_product():
+        seller, token, products = catalog.seller()
+        return seller, token, products[catalog.next() % len(products)]
+
+    def account_update():
+        seller, token, _ = catalog.seller()
+        body = {"username": seller.username, "password": "1234", "first_name": "Seller", "last_name": "Updated"}
+        return f"/api/accounts/{seller.id}/", body, token
+
+    def account_partial_update():
+        seller, token, _ = catalog.seller()
+        return f"/api/accounts/{seller.id}/", {"last_name": f"Updated {catalog.next()}"}, token
+
+    # Customers, the account updates rewrite the sellers' passwords.
+    def login():
+        customer = catalog.customers[catalog.next() % len(catalog.customers)]
+        return "/api/login/", {"username": customer.username, "password": "1234"}, None
+
+    def management_update():
+        customer = catalog.customers[catalog.next() % len(catalog.customers)]
+        return f"/api/accounts/{customer.id}/management/", {"is_active": True}, catalog.admin_token
+
+    def product_update():
+        _, token, product_id = seller_product()
+        return f"/api/products/{product_id}/", catalog.product_data(), token
+
+    def product_partial_update():
+        _, token, product_id = seller_product()
+        return f"/api/products/{product_id}/", {"price": f"{catalog.next() % 100}.90"}, token
+
+    def bulk_partial_update():
+        _, token, products = catalog.seller()
+        start = catalog.next() % (len(products) - 20)
+        body = [{"id": str(product_id), "quantity": 5} for product_id in products[start:start + 20]]
+        return "/api/products/bulk/", body, token
+
+    return {
+        "api_accounts_list": lambda: (f"/api/accounts/?page_size={10 + catalog.next() % 10}", None, None),
+        "api_accounts_create": lambda: (
+            "/api/accounts/",
+            {"username": f"new_{catalog.next()}", "password": "1234", "first_name": "New", "last_name": "User"},
+            None,
+        ),
+        "api_accounts_update": account_update,
+        "api_accounts_partial_update": account_partial_update,
+        "api_accounts_management_update": management_update,
+        "api_accounts_management_partial_update": management_update,
+        "api_accounts_newest_list": lambda: (f"/api/accounts/newest/{1 + catalog.next() % 20}/", None, None),
+        "api_login_create": login,
+        "api_products_list": lambda: (f"/api/products/?page_size=20&min_price={catalog.next() % 400}", None, None),
+        "api_products_create": lambda: ("/api/products/", catalog.product_data(), catalog.seller()[1]),
+        "api_products_bulk_create": lambda: (
+            "/api/products/bulk/", [catalog.product_data() for _ in range(20)], catalog.seller()[1]
+        ),
+        "api_products_bulk_partial_update": bulk_partial_update,
+        "api_products_changes_list": lambda: ("/api/products/changes/?since=0", None, None),
+        "api_products_export_retrieve": lambda: (
+            f"/api/products/export/?format=csv&seller={catalog.seller()[0].id}", None, None
+        ),
+        "api_products_retrieve": lambda: (f"/api/products/{seller_product()[2]}/", None, None),
+        "api_products_update": product_update,
+        "api_products_partial_update": product_partial_update,
+        "api_products_reserve_create": lambda: (
+            f"/api/products/{catalog.in_stock[catalog.next() % len(catalog.in_stock)]}/reserve/",
+            {"quantity": 1},
+            catalog.seller()[1],
+        ),
+        "schema_retrieve": lambda: ("/schema/", None, None),
+    }
+
+
+def load_schema_operations():
+    import yaml
+    from django.conf import settings
+
+    with open(settings.BASE_DIR / "schema.yml") as schema_file:
+        schema = yaml.safe_load(schema_file)
+
+    return {
+        operation["operationId"]: method
+        for path, methods in schema["paths"].items()
+        for method, operation in methods.items()
+    }
+
+
+def client(method, make_request, deadline, latencies, errors):
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    api_client = APIClient()
+
+    try:
+        while time.monotonic() < deadline:
+            path, body, token = make_request()
+            api_client.credentials(**({"HTTP_AUTHORIZATION": f"Token {token}"} if token else {}))
+
+            started = time.perf_counter()
+
+            try:
+                response = getattr(api_client, method)(path, data=body, format="json")
+
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            except Exception as error:
+                errors.append(type(error).__name__)
+                continue
+
+            if response.status_code < 400:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(response.status_code)
+    finally:
+        connection.close()
+
+
+def run_operation(method, make_request, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+
+    clients = [
+        threading.Thread(target=client, args=(method, make_request, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+
+    latencies.sort()
+
+    def percentile(value):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * value))] * 1000, 2) if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_kinds": {str(kind): count for kind, count in collections.Counter(errors).items()},
+        "throughput": round(len(latencies) / duration, 1),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def compare(run, baseline, tolerances):
+    # A run is only comparable with a baseline recorded on the same database
+    # with the same catalog and load.
+    if run["environment"]["database"] != baseline["environment"]["database"]:
+        return [
+            f"recorded on {run['environment']['database']}, the baseline on {baseline['environment']['database']}"
+        ]
+
+    if run["config"] != baseline["config"]:
+        return [f"run with {run['config']}, the baseline with {baseline['config']}"]
+
+    regressions = []
+
+    for operation_id, result in run["results"].items():
+        if result["errors"]:
+            regressions.append(f"{operation_id}: {result['errors']} failed requests {result['error_kinds']}")
+
+        expected = baseline["results"].get(operation_id)
+
+        if expected is None:
+            continue
+
+        if result["throughput"] < expected["throughput"] * (1 - tolerances["throughput"]):
+            regressions.append(
+                f"{operation_id}: {result['throughput']} req/s, baseline {expected['throughput']} req/s"
+            )
+
+        for metric, tolerance in (("p50_ms", "latency"), ("p95_ms", "latency"), ("p99_ms", "tail_latency")):
+            if result[metric] is None or expected[metric] is None:
+                continue
+
+            limit = max(
+                expected[metric] * (1 + tolerances[tolerance]), expected[metric] + tolerances["min_latency_ms"]
+            )
+
+            if result[metric] > limit:
+                regressions.append(f"{operation_id}: {metric} {result[metric]}, baseline {expected[metric]}")
+
+    return regressions
+
+
+def write_json(path, data):
+    with open(path, "w") as output:
+        json.dump(data, output, indent=2)
+        output.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sellers", type=int, default=50)
+    parser.add_argument("--products-per-seller", type=int, default=400)
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5, help="seconds per operation")
+    parser.add_argument("--operations", nargs="+", help="only run these operationIds")
+    parser.add_argument("--baseline", help="fail when slower than this baseline")
+    parser.add_argument("--write-baseline", help="store the results as a baseline")
+    parser.add_argument("--output", help="also write the results to this file")
+    args = parser.parse_args()
+
+    # Every client is admitted to the password hashing pool, logins past it
+    # would get a 503. benchmarks/login_storm.py measures that part.
+    os.environ.setdefault("PASSWORD_HASHING_QUEUE_SIZE", str(args.concurrency))
+
+    setup()
+
+    from django.db import connection
+
+    # Failed requests are counted, not logged one by one.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+    with test_database():
+        catalog = Catalog(args.sellers, args.products_per_seller, args.customers)
+        operations = build_operations(catalog)
+        schema_operations = load_schema_operations()
+
+        missing = set(schema_operations) - set(operations)
+
+        if missing:
+            raise SystemExit(f"No benchmark requests for: {', '.join(sorted(missing))}")
+
+        results = {}
+
+        for operation_id in args.operations or sorted(schema_operations):
+            results[operation_id] = run_operation(
+                schema_operations[operation_id], operations[operation_id], args.concurrency, args.duration
+            )
+
+            result = results[operation_id]
+            print(
+                f"{operation_id:40} {result['throughput']:8.1f} req/s   p50 {result['p50_ms']} ms   "
+                f"p95 {result['p95_ms']} ms   p99 {result['p99_ms']} ms   errors {result['errors']}"
+            )
+
+        run = {
+            "environment": {
+                "database": connection.vendor,
+                "python": platform.python_version(),
+            },
+            "config": {
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "sellers": args.sellers,
+                "products_per_seller": args.products_per_seller,
+                "customers": args.customers,
+            },
+            "results": results,
+        }
+
+    if args.output:
+        write_json(args.output, run)
+
+    if args.write_baseline:
+        failed = [operation_id for operation_id, result in results.items() if result["errors"]]
+
+        if failed:
+            raise SystemExit(f"Not writing a baseline with failed requests in: {', '.join(failed)}")
+
+        write_json(args.write_baseline, {**run, "tolerances": TOLERANCES})
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = compare(run, baseline, baseline.get("tolerances", TOLERANCES))
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
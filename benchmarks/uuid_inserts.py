@@ -0,0 +1,58 @@
+"""
+Compares inserting rows keyed by random (uuid4) and time-ordered (uuid7) ids.
+Needs a PostgreSQL database.
+
+    python -m benchmarks.uuid_inserts --rows 200000 --batch 1000
+"""
+
+import argparse
+import time
+import uuid
+
+from benchmarks import setup, test_database
+
+
+def run(cursor, table, make_id, rows, batch):
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(f"CREATE TABLE {table} (id uuid PRIMARY KEY, description text NOT NULL)")
+
+    started = time.perf_counter()
+    for start in range(0, rows, batch):
+        values = [(make_id(), f"Produto {index}") for index in range(start, min(start + batch, rows))]
+        cursor.executemany(f"INSERT INTO {table} (id, description) VALUES (%s, %s)", values)
+    elapsed = time.perf_counter() - started
+
+    cursor.execute(f"SELECT pg_indexes_size('{table}'), pg_relation_size('{table}')")
+    index_size, table_size = cursor.fetchone()
+
+    return rows / elapsed, index_size, table_size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.db import connection, transaction
+
+    from utils.ids import uuid7
+
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs a PostgreSQL database.")
+
+    with test_database(), connection.cursor() as cursor:
+        for name, make_id in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+            with transaction.atomic():
+                rate, index_size, table_size = run(cursor, f"benchmark_{name}", make_id, args.rows, args.batch)
+
+            print(
+                f"{name}: {rate:10.0f} rows/s, index {index_size / 2**20:7.1f} MiB, "
+                f"table {table_size / 2**20:7.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
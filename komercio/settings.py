@@ -15,6 +15,7 @@ import dotenv
 
 import dj_database_url
 
+from django.core.exceptions import ImproperlyConfigured
 from pathlib import Path
 
 dotenv.load_dotenv()
@@ -46,11 +47,12 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
     "drf_spectacular",
+    "utils",
     "accounts",
     "products"
 ]
 
-MIDDLEWARE = [
+FULL_MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -60,6 +62,32 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The API authenticates with tokens, so it needs no sessions, CSRF checks,
+# request.user or messages.
+API_MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+# Each request runs the chain of the first prefix its path starts with, see
+# utils.middleware.RoutedMiddleware.
+MIDDLEWARE = [
+    "utils.timing.RequestTimingMiddleware",
+    "utils.middleware.RoutedMiddleware",
+]
+
+MIDDLEWARE_ROUTES = [
+    ("/api/docs/", FULL_MIDDLEWARE),
+    ("/api/redoc/", FULL_MIDDLEWARE),
+    ("/api/", API_MIDDLEWARE),
+    ("", FULL_MIDDLEWARE),
+]
+
+# The admin checks look for its middleware in MIDDLEWARE, it runs in the
+# FULL_MIDDLEWARE chain instead.
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
 ROOT_URLCONF = "komercio.urls"
 
 TEMPLATES = [
@@ -102,6 +130,38 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND") or "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", 300)),
+    }
+}
+
+# Shared backends (Redis, Memcached) evict on the server and take their own
+# client options, so the entry limit only applies to the local ones.
+if CACHES["default"]["BACKEND"] in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+    "django.core.cache.backends.db.DatabaseCache",
+):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 1000)),
+        "CULL_FREQUENCY": int(os.getenv("CACHE_CULL_FREQUENCY", 3)),
+    }
+
+# One memory-mapped file shared by every worker on the machine, see
+# utils/cache.py. It takes MAX_ENTRIES * SLOT_SIZE bytes, and its name ends
+# with the layout, so workers started with other values use another file.
+if CACHES["default"]["BACKEND"] == "utils.cache.SharedMemoryCache":
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 4096)),
+        "SLOT_SIZE": int(os.getenv("CACHE_SLOT_SIZE", 16384)),
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -120,6 +180,16 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHERS = [
+    "accounts.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+AUTHENTICATION_BACKENDS = ["accounts.backends.PooledModelBackend"]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
@@ -147,6 +217,7 @@ AUTH_USER_MODEL = "accounts.Account"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
+        "accounts.authentication.SignedTokenAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -154,12 +225,104 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+PRODUCTS_BULK = {
+    "MAX_ITEMS": 5000,
+    "BATCH_SIZE": 500,
+}
+
+PRODUCTS_EXPORT = {
+    "CHUNK_SIZE": 2000,
+}
+
+PRODUCTS_IMPORT = {
+    "CHUNK_SIZE": 5000,
+}
+
+# /api/products/changes/. Changes show up SETTLE_SECONDS after they were
+# logged, so one whose id was taken before an earlier id committed is never
+# skipped by a client already past it. compact_product_changes drops entries
+# older than COMPACT_AFTER_DAYS that a later entry of the same product
+# superseded.
+PRODUCTS_CHANGES = {
+    "PAGE_SIZE": 100,
+    "MAX_PAGE_SIZE": 1000,
+    "SETTLE_SECONDS": 1,
+    "COMPACT_AFTER_DAYS": 7,
+    "COMPACT_BATCH_SIZE": 10000,
+}
+
+# Rendered GET responses, see utils.mixins.CachedResponseMixin. They are keyed
+# by counters kept in the database (utils.generations), so a write made on any
+# node stops the stale entries of every node's cache from being read.
+RESPONSE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300)),
+    # A single request rebuilds a missing response; identical ones wait for
+    # it up to LOCK_WAIT seconds before rebuilding it themselves.
+    "LOCK_TIMEOUT": 10,
+    "LOCK_WAIT": 2,
+    "LOCK_POLL_INTERVAL": 0.01,
+}
+
+SIGNED_TOKENS = {
+    "ISSUE_ON_LOGIN": os.getenv("SIGNED_TOKENS_ON_LOGIN", "false").lower() == "true",
+    "LIFETIME": int(os.getenv("SIGNED_TOKENS_LIFETIME", 60 * 60 * 24)),
+    "REVOCATION_REFRESH_INTERVAL": int(os.getenv("SIGNED_TOKENS_REVOCATION_REFRESH_INTERVAL", 30)),
+}
+
+# Logins hash passwords in a pool of WORKERS threads per process, with room for
+# QUEUE_SIZE more; past that they get a 503 asking to retry after RETRY_AFTER
+# seconds. ITERATIONS of PBKDF2 (Django's default when 0), hashes made with
+# another count are updated on login. WORKERS + QUEUE_SIZE stays below the
+# request threads of a process (WEB_THREADS in the Procfile, 8 by default), so
+# a burst of logins is refused before it holds every thread.
+PASSWORD_HASHING = {
+    "ITERATIONS": int(os.getenv("PASSWORD_HASHING_ITERATIONS") or 0),
+    "WORKERS": int(os.getenv("PASSWORD_HASHING_WORKERS") or 2),
+    "QUEUE_SIZE": int(os.getenv("PASSWORD_HASHING_QUEUE_SIZE") or 4),
+    "RETRY_AFTER": 1,
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Komercio',
     'DESCRIPTION': 'Komercio é um projeto que simula a API para um site de compra e venda.',
     'VERSION': '1.0.0',
+    # Signed tokens use the same "Token" header as the authtoken ones.
+    'AUTHENTICATION_WHITELIST': ['rest_framework.authentication.TokenAuthentication'],
+}
+
+# A SAMPLE_RATE fraction of the requests (none when 0) get their query count,
+# database, serializer and render times in a Server-Timing header and a JSON
+# log line. SELECTs slower than SLOW_QUERY_MS are logged with their EXPLAIN
+# plan. See utils.timing.RequestTimingMiddleware.
+REQUEST_TIMING = {
+    "SAMPLE_RATE": float(os.getenv("REQUEST_TIMING_SAMPLE_RATE") or 0),
+    "SLOW_QUERY_MS": float(os.getenv("REQUEST_TIMING_SLOW_QUERY_MS") or 200),
 }
 
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "utils.timing": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+# How schema/ is served: "live" introspects every view on each request,
+# "build" builds the schema once per process and "file" serves FILE, written by
+# `python manage.py spectacular --file schema.yml`. Both cached modes answer
+# with precompressed bytes and an ETag, see utils.schema.CachedSchemaView.
+API_SCHEMA = {
+    "MODE": os.getenv("API_SCHEMA_MODE") or "build",
+    "FILE": BASE_DIR / "schema.yml",
+}
+
+if API_SCHEMA["MODE"] not in ("live", "build", "file"):
+    raise ImproperlyConfigured(f"API_SCHEMA_MODE must be live, build or file, not {API_SCHEMA['MODE']!r}.")
+
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
 if DATABASE_URL:
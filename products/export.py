@@ -0,0 +1,25 @@
+import itertools
+
+from django.conf import settings
+
+from .pagination import ProductPagination
+
+EXPORT_FIELDS = ["id", "seller", "description", "price", "quantity", "is_active", "created_at"]
+
+
+def export_rows(queryset, chunk_size=None):
+    # Plain tuples straight from the cursor: no model instances and no
+    # serializers, and on PostgreSQL .iterator() uses a server-side cursor, so
+    # memory does not grow with the size of the catalog.
+    chunk_size = chunk_size or settings.PRODUCTS_EXPORT["CHUNK_SIZE"]
+
+    rows = queryset.order_by(*ProductPagination.ordering).values_list(*EXPORT_FIELDS)
+
+    return rows.iterator(chunk_size=chunk_size)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
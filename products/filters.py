@@ -0,0 +1,97 @@
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .search import search_products
+from .serializers import ProductFilterSerializer
+
+
+def filter_products(queryset, params):
+    serialized_filters = ProductFilterSerializer(data=params)
+    serialized_filters.is_valid(raise_exception=True)
+
+    filters = serialized_filters.validated_data
+
+    if "seller" in filters:
+        queryset = queryset.filter(seller_id=filters["seller"])
+
+    if "seller_username" in filters:
+        queryset = queryset.filter(seller__username=filters["seller_username"])
+
+    if filters["is_active"] is not None:
+        queryset = queryset.filter(is_active=filters["is_active"])
+
+    if "min_price" in filters:
+        queryset = queryset.filter(price__gte=filters["min_price"])
+
+    if "max_price" in filters:
+        queryset = queryset.filter(price__lte=filters["max_price"])
+
+    if filters["in_stock"]:
+        queryset = queryset.filter(quantity__gt=0)
+
+    return queryset
+
+
+class ProductFilter(BaseFilterBackend):
+    def filter_queryset(self, request, queryset, view):
+        return filter_products(queryset, request.query_params.dict())
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            ("seller", "Only products of the seller with this id.", {"type": "string", "format": "uuid"}),
+            ("seller_username", "Only products of the seller with this username.", {"type": "string"}),
+            ("is_active", "Only active or inactive products.", {"type": "boolean"}),
+            ("min_price", "Only products priced at least this value.", {"type": "string", "format": "decimal"}),
+            ("max_price", "Only products priced at most this value.", {"type": "string", "format": "decimal"}),
+            ("in_stock", "Only products with quantity greater than zero.", {"type": "boolean"}),
+        ]
+
+        return [
+            {"name": name, "required": False, "in": "query", "description": description, "schema": schema}
+            for name, description, schema in parameters
+        ]
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    search_param = "q"
+
+    def get_search_query(self, request):
+        return request.query_params.get(self.search_param, "").replace("\x00", "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+
+        if not query:
+            return queryset
+
+        return search_products(queryset, query)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search over the product description. Results are ranked by relevance.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class ProductOrderingFilter(OrderingFilter):
+    ordering_fields = ["price", "created_at"]
+
+    def get_default_ordering(self, view):
+        if ProductSearchFilter().get_search_query(view.request):
+            return ("-rank",)
+
+        return super().get_default_ordering(view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+
+        # With the id last the ordering is a unique key, which is what
+        # KeysetPagination pages on when the first fields tie.
+        if "id" not in ordering and "-id" not in ordering:
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+
+        return ordering
@@ -0,0 +1,187 @@
+import csv
+import io
+import json
+import os
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from utils.ids import uuid7
+
+from .export import chunked
+from .models import Product, ProductChange
+
+PRODUCT_TABLE = Product._meta.db_table
+
+# version has no database default, new rows are written with the model's.
+IMPORT_COLUMNS = ["id", "seller_id", "description", "price", "quantity", "is_active", "created_at", "version"]
+IMPORT_UPDATE_FIELDS = ["description", "price", "quantity", "is_active"]
+
+
+def read_csv(file):
+    for row in csv.DictReader(file):
+        # Empty cells mean "not given", so optional fields fall back to their defaults.
+        yield {field: value for field, value in row.items() if value != ""}
+
+
+def read_jsonl(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+readers = {
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+}
+
+
+def build_products(rows: list) -> list:
+    # The last occurrence wins when an id repeats inside a chunk, the same as
+    # it would if the rows had been imported one by one.
+    products = {}
+
+    for row in rows:
+        product = Product(
+            id=row.get("id") or uuid7(),
+            seller_id=row["seller"],
+            description=row["description"],
+            price=row["price"],
+            quantity=row["quantity"],
+            is_active=row["is_active"],
+            created_at=timezone.now(),
+        )
+        products[product.id] = product
+
+    return list(products.values())
+
+
+def read_existing(connection, product_ids: list, lock=False) -> dict:
+    # Version and is_active of the products that are already there, by id.
+    products = Product.objects.using(connection.alias)
+
+    if lock:
+        products = products.select_for_update()
+
+    return {
+        product_id: (version, is_active)
+        for batch in chunked(product_ids, settings.PRODUCTS_BULK["BATCH_SIZE"])
+        for product_id, version, is_active in products.filter(id__in=batch).values_list("id", "version", "is_active")
+    }
+
+
+def log_changes(connection, products: list, existing: dict):
+    # existing holds the versions the import gave the products it overwrote,
+    # and whether they were active before it.
+    ProductChange.objects.using(connection.alias).record(
+        [
+            ProductChange(
+                product_id=product.id,
+                action=ProductChange.get_action(existing[product.id][1], product.is_active),
+                version=existing[product.id][0],
+            )
+            if product.id in existing
+            else ProductChange(product_id=product.id, action=ProductChange.CREATED, version=1)
+            for product in products
+        ],
+        batch_size=settings.PRODUCTS_BULK["BATCH_SIZE"],
+    )
+
+
+class PostgresCopyLoader:
+    staging_table = f"{PRODUCT_TABLE}_import"
+
+    def load(self, connection, products: list):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        for product in products:
+            writer.writerow([getattr(product, column) for column in IMPORT_COLUMNS])
+
+        buffer.seek(0)
+
+        columns = ", ".join(f'"{column}"' for column in IMPORT_COLUMNS)
+        updates = ", ".join(
+            [f'"{field}" = EXCLUDED."{field}"' for field in IMPORT_UPDATE_FIELDS]
+            + [f'"version" = "{PRODUCT_TABLE}"."version" + 1']
+        )
+
+        # Locked until the commit, so no other write moves their version
+        # between this read and the upsert.
+        existing = read_existing(connection, [product.id for product in products], lock=True)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE IF NOT EXISTS "{self.staging_table}" '
+                f'(LIKE "{PRODUCT_TABLE}" INCLUDING DEFAULTS) ON COMMIT DELETE ROWS'
+            )
+            cursor.copy_expert(f'COPY "{self.staging_table}" ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+            cursor.execute(
+                f'INSERT INTO "{PRODUCT_TABLE}" ({columns}) SELECT {columns} FROM "{self.staging_table}" '
+                f'ON CONFLICT ("id") DO UPDATE SET {updates}'
+            )
+
+        overwritten = {product_id: (version + 1, is_active) for product_id, (version, is_active) in existing.items()}
+
+        log_changes(connection, products, overwritten)
+
+
+class BulkCreateLoader:
+    def load(self, connection, products: list):
+        product_ids = [product.id for product in products]
+
+        # The upsert cannot increment the version of the rows it overwrites,
+        # so those are bumped beforehand.
+        for batch in chunked(product_ids, settings.PRODUCTS_BULK["BATCH_SIZE"]):
+            Product.objects.using(connection.alias).filter(id__in=batch).update(version=F("version") + 1)
+
+        existing = read_existing(connection, product_ids)
+
+        Product.objects.using(connection.alias).bulk_create(
+            products,
+            batch_size=settings.PRODUCTS_BULK["BATCH_SIZE"],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=IMPORT_UPDATE_FIELDS,
+        )
+
+        log_changes(connection, products, existing)
+
+
+loaders = {
+    "postgresql": PostgresCopyLoader,
+}
+
+
+def get_loader(using="default"):
+    connection = connections[using]
+
+    return connection, loaders.get(connection.vendor, BulkCreateLoader)()
+
+
+# Number of rows already committed, so an import that failed halfway can be
+# resumed without loading the first part of the file again.
+class ImportCheckpoint:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self) -> int:
+        try:
+            with open(self.path) as checkpoint_file:
+                return json.load(checkpoint_file)["rows"]
+        except FileNotFoundError:
+            return 0
+
+    def save(self, rows: int):
+        temporary_path = f"{self.path}.tmp"
+
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump({"rows": rows}, checkpoint_file)
+
+        os.replace(temporary_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from products.models import ProductChange
+
+
+class Command(BaseCommand):
+    help = "Drops old entries of the product change log that a later entry of the same product superseded."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.PRODUCTS_CHANGES["COMPACT_AFTER_DAYS"])
+        parser.add_argument("--batch-size", type=int, default=settings.PRODUCTS_CHANGES["COMPACT_BATCH_SIZE"])
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+        deleted = ProductChange.objects.compact(before, batch_size=options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} superseded changes logged before {before:%Y-%m-%d}."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from products.export import export_rows
+from products.filters import filter_products
+from products.models import Product
+from products.renderers import CSVRenderer, NDJSONRenderer
+
+RENDERERS = {renderer.format: renderer for renderer in (NDJSONRenderer, CSVRenderer)}
+
+
+class Command(BaseCommand):
+    help = "Streams every product as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(RENDERERS), default="ndjson")
+        parser.add_argument("--seller", help="Only products of the seller with this id.")
+        parser.add_argument("--is-active", choices=["true", "false"], help="Only active or inactive products.")
+        parser.add_argument("--output", "-o", help="File to write to, stdout by default.")
+        parser.add_argument("--chunk-size", type=int, help="Rows fetched from the database at a time.")
+
+    def handle(self, *args, **options):
+        params = {name: options[name] for name in ("seller", "is_active") if options[name] is not None}
+
+        try:
+            queryset = filter_products(Product.objects.all(), params)
+        except ValidationError as error:
+            raise CommandError(error.detail)
+
+        rows = export_rows(queryset, chunk_size=options["chunk_size"])
+        chunks = RENDERERS[options["format"]]().encode_rows(rows)
+
+        if not options["output"]:
+            for data in chunks:
+                self.stdout.write(data, ending="")
+
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            output.writelines(chunks)
@@ -0,0 +1,116 @@
+import itertools
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import Account
+from products.export import chunked
+from products.imports import ImportCheckpoint, build_products, get_loader, readers
+from products.models import Product
+from products.serializers import ProductImportSerializer
+
+MAX_REPORTED_ERRORS = 10
+
+
+class Command(BaseCommand):
+    help = "Imports products from a CSV or JSONL file, resuming from the last checkpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(readers), help="Defaults to the file extension.")
+        parser.add_argument("--seller", help="Id of the seller of rows without a seller column.")
+        parser.add_argument("--chunk-size", type=int, default=settings.PRODUCTS_IMPORT["CHUNK_SIZE"])
+        parser.add_argument("--checkpoint", help="Checkpoint file, <path>.checkpoint by default.")
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+
+        if file_format not in readers:
+            raise CommandError(f"Unknown format {file_format!r}, use --format {' or '.join(sorted(readers))}.")
+
+        checkpoint = ImportCheckpoint(options["checkpoint"] or f"{path}.checkpoint")
+        done = 0 if options["restart"] else checkpoint.load()
+
+        if done:
+            self.stdout.write(f"Resuming after row {done}.")
+
+        connection, loader = get_loader()
+        imported = 0
+        started = time.perf_counter()
+
+        try:
+            with open(path, newline="", encoding="utf-8") as file:
+                rows = itertools.islice(readers[file_format](file), done, None)
+
+                for chunk in chunked(rows, options["chunk_size"]):
+                    products = self.validate_chunk(chunk, first_row=done + 1, seller=options["seller"])
+
+                    with transaction.atomic(using=connection.alias):
+                        loader.load(connection, products)
+
+                    done += len(chunk)
+                    imported += len(chunk)
+                    checkpoint.save(done)
+
+                    if options["verbosity"] >= 2:
+                        self.stdout.write(f"{done} rows ({imported / (time.perf_counter() - started):.0f} rows/s)")
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Could not read row {done + 1} onwards of {path}: {error}")
+
+        checkpoint.clear()
+
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} rows in {elapsed:.2f}s ({imported / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    def validate_chunk(self, chunk: list, first_row: int, seller=None) -> list:
+        if seller:
+            chunk = [{"seller": seller, **row} for row in chunk]
+
+        serializer = ProductImportSerializer(data=chunk, many=True)
+
+        if not serializer.is_valid():
+            self.fail(first_row, enumerate(serializer.errors))
+
+        rows = serializer.validated_data
+
+        seller_ids = {row["seller"] for row in rows}
+        existing_seller_ids = set(Account.objects.filter(id__in=seller_ids).values_list("id", flat=True))
+
+        if seller_ids - existing_seller_ids:
+            self.fail(first_row, (
+                (index, {"seller": ["seller does not exist"]})
+                for index, row in enumerate(rows)
+                if row["seller"] not in existing_seller_ids
+            ))
+
+        # A row can only overwrite a product of its own seller.
+        product_ids = [row["id"] for row in rows if "id" in row]
+        owners = {
+            product_id: seller_id
+            for batch in chunked(product_ids, settings.PRODUCTS_BULK["BATCH_SIZE"])
+            for product_id, seller_id in Product.objects.filter(id__in=batch).values_list("id", "seller_id")
+        }
+
+        if any(owners.get(row.get("id"), row["seller"]) != row["seller"] for row in rows):
+            self.fail(first_row, (
+                (index, {"id": ["product belongs to another seller"]})
+                for index, row in enumerate(rows)
+                if owners.get(row.get("id"), row["seller"]) != row["seller"]
+            ))
+
+        return build_products(rows)
+
+    def fail(self, first_row: int, errors):
+        messages = [f"row {first_row + index}: {error}" for index, error in errors if error]
+
+        raise CommandError(
+            "Invalid rows, nothing from this chunk was imported:\n" + "\n".join(messages[:MAX_REPORTED_ERRORS])
+        )
@@ -0,0 +1,66 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from products.seeding import SeedPlan, block_random, run_blocks, seed_accounts, seed_products
+from products.versions import bump_catalog_version
+
+
+class Command(BaseCommand):
+    help = "Fills the database with synthetic accounts and products for scale testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--accounts", type=int, default=100_000)
+        parser.add_argument("--products", type=int, default=1_000_000)
+        parser.add_argument("--seller-share", type=float, default=0.1, help="Share of the accounts that sell.")
+        parser.add_argument("--seed", type=int, default=0, help="The same seed always gives the same rows.")
+        parser.add_argument("--password", default="1234", help="Password of every account.")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Rows per INSERT.")
+        parser.add_argument("--workers", type=int, default=1, help="Processes inserting blocks in parallel.")
+
+    def handle(self, *args, **options):
+        plan = SeedPlan(options["seed"], options["accounts"], options["products"], options["seller_share"])
+
+        if plan.products and not (plan.accounts and plan.seller_every):
+            raise CommandError("Products need sellers, use --accounts and --seller-share above 0.")
+
+        # Hashed once for every account, with a salt from the seed so the rows
+        # stay the same.
+        salt = "".join(block_random(plan.seed, "salt", 0).choices("abcdefghijklmnopqrstuvwxyz0123456789", k=22))
+        password = make_password(options["password"], salt=salt)
+
+        if plan.products:
+            # Before the workers fork, so they inherit it.
+            plan.sellers()
+
+        started = time.perf_counter()
+
+        accounts = self.seed("accounts", run_blocks(seed_accounts, [
+            (plan, block, password, options["batch_size"]) for block in plan.blocks(plan.accounts)
+        ], options["workers"]), started, options["verbosity"])
+
+        products = self.seed("products", run_blocks(seed_products, [
+            (plan, block, options["batch_size"]) for block in plan.blocks(plan.products)
+        ], options["workers"]), started, options["verbosity"])
+
+        if products:
+            bump_catalog_version()
+
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {accounts} accounts and {products} products in {elapsed:.2f}s "
+            f"({(accounts + products) / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    def seed(self, name: str, blocks, started: float, verbosity: int) -> int:
+        done = 0
+
+        for rows in blocks:
+            done += rows
+
+            if verbosity >= 2:
+                self.stdout.write(f"{done} {name} ({done / (time.perf_counter() - started):.0f} rows/s)")
+
+        return done
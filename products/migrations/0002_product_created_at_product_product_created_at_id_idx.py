@@ -0,0 +1,28 @@
+# Generated by Django 4.1 on 2026-10-18 20:07
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="product_created_at_id_idx"
+            ),
+        ),
+    ]
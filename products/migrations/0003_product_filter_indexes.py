@@ -0,0 +1,37 @@
+# Generated by Django 4.1 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0002_product_created_at_product_product_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["price", "id"], name="product_price_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["is_active", "price"], name="product_active_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["seller", "is_active"], name="product_seller_active_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("quantity__gt", 0)),
+                fields=["is_active", "price"],
+                name="product_in_stock_price_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import migrations
+
+POSTGRESQL_FORWARD_SQL = [
+    "ALTER TABLE products_product ADD COLUMN search_vector tsvector",
+    "UPDATE products_product SET search_vector = to_tsvector('simple', description)",
+    "CREATE INDEX product_search_vector_idx ON products_product USING gin (search_vector)",
+    """
+    CREATE FUNCTION products_product_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector('simple', coalesce(NEW.description, ''));
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER products_product_search_vector_insert
+    BEFORE INSERT ON products_product
+    FOR EACH ROW EXECUTE PROCEDURE products_product_search_vector_update()
+    """,
+    """
+    CREATE TRIGGER products_product_search_vector_update
+    BEFORE UPDATE OF description ON products_product
+    FOR EACH ROW WHEN (OLD.description IS DISTINCT FROM NEW.description)
+    EXECUTE PROCEDURE products_product_search_vector_update()
+    """,
+]
+
+POSTGRESQL_BACKWARD_SQL = [
+    "DROP TRIGGER IF EXISTS products_product_search_vector_update ON products_product",
+    "DROP TRIGGER IF EXISTS products_product_search_vector_insert ON products_product",
+    "DROP FUNCTION IF EXISTS products_product_search_vector_update()",
+    "ALTER TABLE products_product DROP COLUMN IF EXISTS search_vector",
+]
+
+# The triggers that keep the SQLite index in sync are installed after every
+# migrate by products.search.install_search_index(), since SQLite drops them
+# whenever the table is remade.
+SQLITE_FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE products_product_fts
+    USING fts5(description, content="products_product", content_rowid="rowid")
+    """,
+]
+
+SQLITE_BACKWARD_SQL = [
+    "DROP TRIGGER IF EXISTS products_product_fts_insert",
+    "DROP TRIGGER IF EXISTS products_product_fts_delete",
+    "DROP TRIGGER IF EXISTS products_product_fts_update",
+    "DROP TABLE IF EXISTS products_product_fts",
+]
+
+
+def run_for_vendor(**statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_product_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(
+                postgresql=POSTGRESQL_FORWARD_SQL, sqlite=SQLITE_FORWARD_SQL
+            ),
+            run_for_vendor(
+                postgresql=POSTGRESQL_BACKWARD_SQL, sqlite=SQLITE_BACKWARD_SQL
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1 on 2026-10-18 21:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0006_product_uuid7_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductChange",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "created"),
+                            ("updated", "updated"),
+                            ("deactivated", "deactivated"),
+                            ("deleted", "deleted"),
+                        ],
+                        max_length=11,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(null=True)),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="products.product",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productchange",
+            index=models.Index(
+                fields=["product", "id"], name="product_change_product_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+import time
+
+from django.db import migrations
+
+CATALOG_VERSION_KEY = "products:catalog-version"
+
+
+# Creates the counter up front, so reading it is a single lookup from the
+# first request on.
+def create_catalog_version(apps, schema_editor):
+    Generation = apps.get_model("utils", "Generation")
+
+    Generation.objects.using(schema_editor.connection.alias).get_or_create(
+        key=CATALOG_VERSION_KEY, defaults={"value": time.time_ns()}
+    )
+
+
+def delete_catalog_version(apps, schema_editor):
+    Generation = apps.get_model("utils", "Generation")
+
+    Generation.objects.using(schema_editor.connection.alias).filter(key=CATALOG_VERSION_KEY).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0007_product_change"),
+        ("utils", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_catalog_version, delete_catalog_version),
+    ]
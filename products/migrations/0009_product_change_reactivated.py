@@ -0,0 +1,27 @@
+# Generated by Django 4.1 on 2026-10-18 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0008_catalog_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="productchange",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("created", "created"),
+                    ("updated", "updated"),
+                    ("deactivated", "deactivated"),
+                    ("reactivated", "reactivated"),
+                    ("deleted", "deleted"),
+                ],
+                max_length=11,
+            ),
+        ),
+    ]
@@ -1,12 +1,219 @@
-import uuid
+from django.db import models, router, transaction
 
-from django.db import models
+from utils.ids import uuid7
+
+from .versions import bump_catalog_version
+
+PRODUCT_BULK_UPDATE_FIELDS = ["price", "quantity", "is_active"]
+
+class ProductQuerySet(models.QuerySet):
+
+    def apply_updates(self, changes: list, batch_size: int) -> list:
+        logged = []
+
+        with transaction.atomic(using=self.db):
+            for start in range(0, len(changes), batch_size):
+                batch = changes[start:start + batch_size]
+                batch_products = self.filter(id__in=[change["id"] for change in batch])
+                values = {}
+
+                for field_name in PRODUCT_BULK_UPDATE_FIELDS:
+                    whens = [
+                        models.When(id=change["id"], then=models.Value(change[field_name]))
+                        for change in batch
+                        if field_name in change
+                    ]
+
+                    if whens:
+                        values[field_name] = models.Case(
+                            *whens, default=models.F(field_name), output_field=self.model._meta.get_field(field_name)
+                        )
+
+                # is_active is written after the read, which then tells which
+                # products the batch turns on or off.
+                activity = values.pop("is_active", None)
+
+                # The update goes first, so the transaction holds the write
+                # locks before it reads: a read first leaves two concurrent
+                # batches on SQLite both waiting to upgrade their lock, and
+                # one of them fails at once with "database is locked".
+                batch_products.update(**values, version=models.F("version") + 1)
+                products = list(batch_products.values_list("id", "version", "is_active"))
+
+                if activity is not None:
+                    batch_products.update(is_active=activity)
+
+                is_active = {change["id"]: change["is_active"] for change in batch if "is_active" in change}
+                logged += [
+                    ProductChange(
+                        product_id=product_id,
+                        action=ProductChange.get_action(was_active, is_active.get(product_id, was_active)),
+                        version=version,
+                    )
+                    for product_id, version, was_active in products
+                ]
+
+            ProductChange.objects.using(self.db).record(logged, batch_size=batch_size)
+
+        return [change.product_id for change in logged]
+
+    def reserve(self, product_id, quantity: int) -> bool:
+        # A single conditional UPDATE: the stock check and the decrement happen
+        # atomically in the database, so concurrent reservations cannot oversell.
+        with transaction.atomic(using=self.db, savepoint=False):
+            reserved = self.filter(id=product_id, is_active=True, quantity__gte=quantity).update(
+                quantity=models.F("quantity") - quantity, version=models.F("version") + 1
+            )
+
+            if reserved:
+                # The insert reads the new version itself.
+                version = models.Subquery(self.filter(id=product_id).values("version"))
+
+                ProductChange.objects.using(self.db).record(
+                    [ProductChange(product_id=product_id, action=ProductChange.UPDATED, version=version)]
+                )
+
+        return reserved == 1
 
 class Product(models.Model):
-    id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
+    id = models.UUIDField(default=uuid7, primary_key=True, editable=False)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     quantity = models.PositiveIntegerField()
     is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by every write, the product ETag is built from it.
+    version = models.PositiveIntegerField(default=1)
+
+    seller = models.ForeignKey("accounts.Account", on_delete=models.CASCADE, related_name="products")
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="product_created_at_id_idx"),
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+            models.Index(fields=["is_active", "price"], name="product_active_price_idx"),
+            models.Index(fields=["seller", "is_active"], name="product_seller_active_idx"),
+            models.Index(
+                fields=["is_active", "price"],
+                condition=models.Q(quantity__gt=0),
+                name="product_in_stock_price_idx",
+            ),
+        ]
+
+    # The values read from the database, so a save can tell whether it turned
+    # the product off or back on.
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            action = ProductChange.CREATED
+        else:
+            action = ProductChange.get_action(
+                getattr(self, "_loaded_values", {}).get("is_active"), self.__dict__.get("is_active")
+            )
+
+            # Incremented in the database so concurrent saves never hand out
+            # the same version twice.
+            self.version = models.F("version") + 1
+
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+
+        # The change is logged in the transaction of the write, so both commit
+        # or roll back together.
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+            if isinstance(self.version, models.expressions.Combinable):
+                self.refresh_from_db(fields=["version"])
+
+            ProductChange.objects.using(using).record(
+                [ProductChange(product_id=self.id, action=action, version=self.version)]
+            )
+
+        self._loaded_values = {**getattr(self, "_loaded_values", {}), "is_active": self.__dict__.get("is_active")}
+
+class ProductChangeQuerySet(models.QuerySet):
+
+    def record(self, changes: list, batch_size: int = 500) -> list:
+        # Called by every write to products, in its transaction. The catalog
+        # version is bumped after the commit, so its row is locked for that
+        # statement only and writes to different products never wait for
+        # each other.
+        using = self.db
+        transaction.on_commit(lambda: bump_catalog_version(using=using), using=using)
+
+        return self.bulk_create(changes, batch_size=batch_size)
+
+    def compact(self, before, batch_size: int) -> int:
+        # Drops the entries logged before `before` that a later entry of the
+        # same product superseded, a batch of ids at a time. The latest entry
+        # of each product stays, so reading from the start still gives the
+        # whole catalog.
+        bounds = self.filter(changed_at__lt=before).aggregate(first=models.Min("id"), last=models.Max("id"))
+
+        if bounds["first"] is None:
+            return 0
+
+        superseded = models.Exists(
+            ProductChange.objects.filter(product_id=models.OuterRef("product_id"), id__gt=models.OuterRef("id"))
+        )
+        deleted = 0
+
+        for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+            count, _ = self.filter(
+                superseded, id__gte=start, id__lt=min(start + batch_size, bounds["last"] + 1), changed_at__lt=before
+            ).delete()
+            deleted += count
+
+        return deleted
+
+class ProductChange(models.Model):
+    # Append-only log of product writes, read by /api/products/changes/. The
+    # id is the feed cursor. Products are not a real foreign key, entries of
+    # deleted products stay.
+    CREATED = "created"
+    UPDATED = "updated"
+    DEACTIVATED = "deactivated"
+    REACTIVATED = "reactivated"
+    DELETED = "deleted"
+
+    id = models.BigAutoField(primary_key=True)
+    product = models.ForeignKey(
+        Product, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name="+"
+    )
+    action = models.CharField(
+        max_length=11,
+        choices=[(action, action) for action in (CREATED, UPDATED, DEACTIVATED, REACTIVATED, DELETED)],
+    )
+    # Version of the product the entry was logged for, None once deleted.
+    version = models.PositiveIntegerField(null=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ProductChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["product", "id"], name="product_change_product_id_idx"),
+        ]
+
+    # Action of an update that took is_active from was_active to is_active,
+    # either of them None when the update did not load or set it.
+    @classmethod
+    def get_action(cls, was_active, is_active) -> str:
+        if was_active and is_active is False:
+            return cls.DEACTIVATED
+
+        if was_active is False and is_active:
+            return cls.REACTIVATED
 
-    seller = models.ForeignKey("accounts.Account", on_delete=models.CASCADE, related_name="products")
\ No newline at end of file
+        return cls.UPDATED
@@ -0,0 +1,88 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from utils.pagination import KeysetPagination
+
+
+class ProductPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+# Keyset pagination over the change log: ?since=<id of the last change seen>
+# returns the changes after it, oldest first, in one range scan of the
+# primary key. `next` is where to continue from, also once the client caught
+# up: polling it later returns whatever changed meanwhile.
+class ProductChangePagination(BasePagination):
+    since_query_param = "since"
+    page_size_query_param = "page_size"
+
+    def get_since(self, request) -> int:
+        try:
+            since = int(request.query_params.get(self.since_query_param, 0))
+        except ValueError:
+            since = -1
+
+        if since < 0:
+            raise ValidationError({self.since_query_param: ["must be the id of a change"]})
+
+        return since
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.PRODUCTS_CHANGES["PAGE_SIZE"]
+
+        return max(1, min(page_size, settings.PRODUCTS_CHANGES["MAX_PAGE_SIZE"]))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.since = self.get_since(request)
+        page_size = self.get_page_size(request)
+
+        changes = list(queryset.filter(id__gt=self.since).order_by("id")[:page_size + 1])
+
+        self.has_more = len(changes) > page_size
+        self.page = changes[:page_size]
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        since = self.page[-1].id if self.page else self.since
+
+        return Response({
+            "next": replace_query_param(self.request.build_absolute_uri(), self.since_query_param, since),
+            "has_more": self.has_more,
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "format": "uri", "description": "Where to poll for the next changes."},
+                "has_more": {"type": "boolean", "description": "Whether more changes can be read right away."},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.since_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Id of the last change already read, 0 to read from the start.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of changes to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -16,4 +16,4 @@ class IsSellerUser(permissions.BasePermission):
             return True
         
         if request.user.is_seller:
-            return obj.seller == request.user
\ No newline at end of file
+            return obj.seller_id == request.user.id
\ No newline at end of file
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Account
+from accounts.serializers import ACCOUNT_READ_FIELDS
+
+from .models import Product, ProductChange
+from .versions import bump_catalog_version
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, using, **kwargs):
+    # Sent inside the transaction of the delete, so the entry commits with it.
+    ProductChange.objects.using(using).record(
+        [ProductChange(product_id=instance.id, action=ProductChange.DELETED, version=None)]
+    )
+
+
+@receiver(post_save, sender=Account)
+def seller_saved(sender, instance, created, update_fields, using, **kwargs):
+    # Product details follow the seller's own version. List pages can nest
+    # the seller too (?expand=seller), so they go stale once the edit commits.
+    if created or (update_fields is not None and not set(update_fields) & set(ACCOUNT_READ_FIELDS)):
+        return
+
+    if Product.objects.using(using).filter(seller_id=instance.id).exists():
+        transaction.on_commit(lambda: bump_catalog_version(using=using), using=using)
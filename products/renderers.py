@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+from .export import EXPORT_FIELDS, chunked
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def encode_rows(self, rows):
+        encoder = DjangoJSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+        # One write per chunk instead of one per product.
+        for chunk in chunked(rows, settings.PRODUCTS_EXPORT["CHUNK_SIZE"]):
+            yield "".join(encoder.encode(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in chunk)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only used for error responses, the export itself is streamed.
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b"\n"
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def encode_rows(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(EXPORT_FIELDS)
+
+        for chunk in chunked(rows, settings.PRODUCTS_EXPORT["CHUNK_SIZE"]):
+            writer.writerows(chunk)
+
+            yield buffer.getvalue()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        if isinstance(data, dict):
+            writer.writerow(data.keys())
+            writer.writerow(data.values())
+
+        return buffer.getvalue().encode()
@@ -0,0 +1,115 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Product
+
+PRODUCT_TABLE = Product._meta.db_table
+
+# Must match the text search configuration used by the trigger created in
+# products/migrations/0004_product_search_vector.py.
+POSTGRES_SEARCH_CONFIG = "simple"
+
+
+class PostgresSearchBackend:
+    def search(self, queryset, query):
+        tsquery = f"websearch_to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s)"
+
+        return queryset.filter(
+            RawSQL(f'"{PRODUCT_TABLE}"."search_vector" @@ {tsquery}', (query,), output_field=BooleanField())
+        ).annotate(
+            # ts_rank_cd() is a real. As a double the rank round-trips through
+            # the pagination cursor, which compares it for equality.
+            rank=RawSQL(
+                f'ts_rank_cd("{PRODUCT_TABLE}"."search_vector", {tsquery})::double precision',
+                (query,),
+                output_field=FloatField(),
+            )
+        )
+
+
+class SQLiteSearchBackend:
+    fts_table = f"{PRODUCT_TABLE}_fts"
+
+    # The FTS5 table itself is created by products/migrations/0004_product_search_vector.py.
+    install_statements = (
+        f"""CREATE TRIGGER IF NOT EXISTS "{fts_table}_insert" AFTER INSERT ON "{PRODUCT_TABLE}" BEGIN
+            INSERT INTO "{fts_table}"(rowid, description) VALUES (new.rowid, new.description);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS "{fts_table}_delete" AFTER DELETE ON "{PRODUCT_TABLE}" BEGIN
+            INSERT INTO "{fts_table}"("{fts_table}", rowid, description) VALUES ('delete', old.rowid, old.description);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS "{fts_table}_update" AFTER UPDATE OF description ON "{PRODUCT_TABLE}"
+            WHEN old.description IS NOT new.description BEGIN
+            INSERT INTO "{fts_table}"("{fts_table}", rowid, description) VALUES ('delete', old.rowid, old.description);
+            INSERT INTO "{fts_table}"(rowid, description) VALUES (new.rowid, new.description);
+        END""",
+        f"""INSERT INTO "{fts_table}"("{fts_table}") VALUES ('rebuild')""",
+    )
+
+    def install(self, connection):
+        # SQLite drops triggers whenever a migration remakes the products table,
+        # so they are checked after every migrate, see install_search_index().
+        names = [self.fts_table] + [f"{self.fts_table}_{event}" for event in ("insert", "delete", "update")]
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name IN (%s, %s, %s, %s)", names)
+
+            # Nothing to do before migration 0004 or with every trigger in place.
+            if cursor.fetchone()[0] in (0, len(names)):
+                return
+
+            for statement in self.install_statements:
+                cursor.execute(statement)
+
+    def search(self, queryset, query):
+        terms = re.findall(r"\w+", query)
+
+        if not terms:
+            return queryset.none()
+
+        match = " ".join(f'"{term}"' for term in terms)
+
+        return queryset.filter(
+            RawSQL(
+                f'"{PRODUCT_TABLE}".rowid IN (SELECT rowid FROM "{self.fts_table}" WHERE "{self.fts_table}" MATCH %s)',
+                (match,),
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            rank=RawSQL(
+                f'(SELECT -bm25("{self.fts_table}") FROM "{self.fts_table}" '
+                f'WHERE "{self.fts_table}" MATCH %s AND rowid = "{PRODUCT_TABLE}".rowid)',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+
+class FallbackSearchBackend:
+    def search(self, queryset, query):
+        for term in query.split():
+            queryset = queryset.filter(description__icontains=term)
+
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+search_backends = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def search_products(queryset, query):
+    backend_class = search_backends.get(connections[queryset.db].vendor, FallbackSearchBackend)
+
+    return backend_class().search(queryset, query)
+
+
+def install_search_index(using, **kwargs):
+    connection = connections[using]
+
+    if connection.vendor == "sqlite":
+        SQLiteSearchBackend().install(connection)
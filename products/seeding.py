@@ -0,0 +1,205 @@
+import bisect
+import contextlib
+import datetime
+import functools
+import hashlib
+import math
+import multiprocessing
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from django.db import connections
+from faker import Faker
+
+from accounts.models import Account
+from utils.ids import make_uuid7
+
+from .models import Product
+
+# Synthetic catalog for scale testing. Everything about row N is derived from
+# the seed and N alone: ids and timestamps are hashed from them, the rest is
+# drawn from generators seeded per block of BLOCK_SIZE rows. The same seed
+# gives the same rows, however many workers or whatever batch size made them.
+BLOCK_SIZE = 10_000
+
+# Timestamps are spread over this window, in creation order, so the UUIDv7 ids
+# grow with them the way real ones do.
+STARTS_AT = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+ENDS_AT = datetime.datetime(2022, 10, 1, tzinfo=datetime.timezone.utc)
+
+# Sellers get lognormal weights: most stores are small, a few hold a good part
+# of the catalog.
+SELLER_WEIGHT_SIGMA = 1.5
+
+INACTIVE_ACCOUNT_SHARE = 0.02
+INACTIVE_PRODUCT_SHARE = 0.08
+OUT_OF_STOCK_SHARE = 0.1
+
+PRODUCT_KINDS = [
+    "Caneca", "Camiseta", "Boné", "Mochila", "Tênis", "Livro", "Fone de ouvido", "Luminária", "Cadeira",
+    "Garrafa térmica", "Relógio", "Teclado", "Mouse", "Panela", "Vaso", "Jaqueta", "Carregador", "Almofada",
+]
+
+
+def stable_bits(seed: int, kind: str, index: int) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest(), "big")
+
+
+def block_random(seed: int, kind: str, block: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{block}")
+
+
+def spread_timestamp(index: int, total: int, bits: int) -> datetime.datetime:
+    # Row index picks a slot of the window, the hash a point inside the slot.
+    span = (ENDS_AT - STARTS_AT) / total
+    return STARTS_AT + span * index + span * ((bits & 0xFFFF) / 0x10000)
+
+
+def row_id(timestamp: datetime.datetime, bits: int):
+    return make_uuid7(int(timestamp.timestamp() * 1000), bits >> 16, bits >> 28)
+
+
+class SeedPlan:
+    def __init__(self, seed: int, accounts: int, products: int, seller_share: float):
+        self.seed = seed
+        self.accounts = accounts
+        self.products = products
+        self.seller_every = max(1, round(1 / seller_share)) if seller_share else 0
+
+    def is_seller(self, index: int) -> bool:
+        return bool(self.seller_every) and index % self.seller_every == 0
+
+    def account_identity(self, index: int) -> tuple:
+        bits = stable_bits(self.seed, "account", index)
+        date_joined = spread_timestamp(index, self.accounts, bits)
+
+        return row_id(date_joined, bits), date_joined
+
+    def sellers(self) -> tuple:
+        return get_sellers(self.seed, self.accounts, self.seller_every)
+
+    def blocks(self, rows: int) -> range:
+        return range((rows + BLOCK_SIZE - 1) // BLOCK_SIZE)
+
+
+@functools.lru_cache(maxsize=1)
+def get_sellers(seed: int, accounts: int, seller_every: int) -> tuple:
+    # Ids, join dates and cumulative weights of the sellers, in join order.
+    # Computed once per process, workers forked afterwards inherit it.
+    plan = SeedPlan(seed, accounts, 0, 0)
+    ids, joined, cumulative_weights = [], [], []
+    total_weight = 0.0
+
+    for index in range(0, accounts, seller_every):
+        account_id, date_joined = plan.account_identity(index)
+        uniform = (stable_bits(seed, "seller-weight", index) % 1_000_000 + 1) / 1_000_001
+        total_weight += math.exp(SELLER_WEIGHT_SIGMA * statistics.NormalDist().inv_cdf(uniform))
+
+        ids.append(account_id)
+        joined.append(date_joined)
+        cumulative_weights.append(total_weight)
+
+    return ids, joined, cumulative_weights
+
+
+def build_accounts(plan: SeedPlan, block: int, password: str) -> list:
+    rng = block_random(plan.seed, "accounts", block)
+    fake = Faker("pt_BR")
+    fake.seed_instance(f"{plan.seed}:accounts:{block}")
+
+    accounts = []
+
+    for index in range(block * BLOCK_SIZE, min((block + 1) * BLOCK_SIZE, plan.accounts)):
+        account_id, date_joined = plan.account_identity(index)
+        # Account.username is 20 characters long, the index keeps it unique.
+        username = f"{fake.user_name()[:11]}_{index}"
+
+        accounts.append(Account(
+            id=account_id,
+            username=username,
+            password=password,
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            email=f"{username}@{fake.free_email_domain()}",
+            is_seller=plan.is_seller(index),
+            is_active=rng.random() >= INACTIVE_ACCOUNT_SHARE,
+            date_joined=date_joined,
+        ))
+
+    return accounts
+
+
+def build_products(plan: SeedPlan, block: int) -> list:
+    seller_ids, seller_joined, cumulative_weights = plan.sellers()
+    rng = block_random(plan.seed, "products", block)
+    fake = Faker("pt_BR")
+    fake.seed_instance(f"{plan.seed}:products:{block}")
+
+    products = []
+
+    for index in range(block * BLOCK_SIZE, min((block + 1) * BLOCK_SIZE, plan.products)):
+        bits = stable_bits(plan.seed, "product", index)
+        created_at = spread_timestamp(index, plan.products, bits)
+
+        # Only sellers that had joined by then, weighted.
+        joined = max(1, bisect.bisect_right(seller_joined, created_at))
+        seller = bisect.bisect_left(cumulative_weights, rng.random() * cumulative_weights[joined - 1], hi=joined - 1)
+
+        price = min(rng.lognormvariate(4, 1.1), 99_999)
+        quantity = 0 if rng.random() < OUT_OF_STOCK_SHARE else min(int(rng.paretovariate(1.1) * 5), 100_000)
+
+        products.append(Product(
+            id=row_id(created_at, bits),
+            description=f"{rng.choice(PRODUCT_KINDS)} {fake.color_name().lower()} {fake.sentence(rng.randint(2, 10))}",
+            price=Decimal(f"{max(1, int(price))}.{rng.choice(('00', '50', '90', '99'))}"),
+            quantity=quantity,
+            is_active=rng.random() >= INACTIVE_PRODUCT_SHARE,
+            created_at=created_at,
+            seller_id=seller_ids[seller],
+        ))
+
+    return products
+
+
+@contextlib.contextmanager
+def historical_created_at():
+    # auto_now_add would overwrite the generated timestamps on insert.
+    field = Product._meta.get_field("created_at")
+    field.auto_now_add = False
+
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def seed_accounts(plan: SeedPlan, block: int, password: str, batch_size: int) -> int:
+    accounts = build_accounts(plan, block, password)
+    # Ids are deterministic, so seeding twice with the same seed adds nothing.
+    Account.objects.bulk_create(accounts, batch_size=batch_size, ignore_conflicts=True)
+
+    return len(accounts)
+
+
+def seed_products(plan: SeedPlan, block: int, batch_size: int) -> int:
+    products = build_products(plan, block)
+
+    with historical_created_at():
+        Product.objects.bulk_create(products, batch_size=batch_size, ignore_conflicts=True)
+
+    return len(products)
+
+
+def run_blocks(function, arguments: list, workers: int):
+    # Yields the number of rows of each block as it finishes.
+    if workers <= 1 or len(arguments) <= 1:
+        yield from (function(*block_arguments) for block_arguments in arguments)
+        return
+
+    # Forked workers must open connections of their own.
+    connections.close_all()
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as executor:
+        yield from executor.map(function, *zip(*arguments))
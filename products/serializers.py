@@ -1,20 +1,95 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 
 from accounts.serializers import AccountSerializer
+from utils.serializers import FieldsetSerializerMixin
+from utils.timing import TimedSerializerMixin
 
-from .models import Product
+from .models import Product, ProductChange
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(TimedSerializerMixin, FieldsetSerializerMixin, serializers.ModelSerializer):
     
     class Meta:
         model = Product
         fields = "__all__"
+        expandable_fields = {"seller": AccountSerializer}
 
-class ProductDetailSerializer(serializers.ModelSerializer):
+class ProductBulkCreateSerializer(serializers.ListSerializer):
+
+    def create(self, validated_data: list) -> list:
+        products = [Product(**attrs) for attrs in validated_data]
+
+        # bulk_create() skips save() and its receivers.
+        with transaction.atomic():
+            products = Product.objects.bulk_create(products, batch_size=settings.PRODUCTS_BULK["BATCH_SIZE"])
+            ProductChange.objects.record(
+                [ProductChange(product_id=product.id, action=ProductChange.CREATED, version=1) for product in products],
+                batch_size=settings.PRODUCTS_BULK["BATCH_SIZE"],
+            )
+
+        return products
+
+class ProductDetailSerializer(TimedSerializerMixin, FieldsetSerializerMixin, serializers.ModelSerializer):
     seller = AccountSerializer(read_only=True)
 
     class Meta:
         model = Product
         fields = ["id", "seller", "description", "price", "quantity", "is_active"]
-        read_only_fields = ["id"]
\ No newline at end of file
+        read_only_fields = ["id"]
+        # Already nested, accepted so list and detail take the same parameters.
+        expandable_fields = {"seller": AccountSerializer}
+        list_serializer_class = ProductBulkCreateSerializer
+
+class ProductFilterSerializer(serializers.Serializer):
+    seller = serializers.UUIDField(required=False)
+    seller_username = serializers.CharField(required=False)
+    is_active = serializers.BooleanField(allow_null=True, default=None)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    in_stock = serializers.BooleanField(default=False)
+
+
+class ProductBulkUpdateListSerializer(serializers.ListSerializer):
+
+    def validate(self, attrs: list) -> list:
+        ids = [change["id"] for change in attrs]
+
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("each product can only be updated once per request")
+
+        return attrs
+
+class ProductBulkUpdateSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    quantity = serializers.IntegerField(min_value=0, max_value=2147483647, required=False)
+    is_active = serializers.BooleanField(required=False)
+
+    class Meta:
+        list_serializer_class = ProductBulkUpdateListSerializer
+
+class ProductBulkUpdateResultSerializer(serializers.Serializer):
+    updated = serializers.ListField(child=serializers.UUIDField())
+    not_found = serializers.ListField(child=serializers.UUIDField())
+
+class ProductReserveSerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(min_value=1, max_value=2147483647)
+
+class ProductImportSerializer(serializers.Serializer):
+    id = serializers.UUIDField(required=False)
+    seller = serializers.UUIDField()
+    description = serializers.CharField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    quantity = serializers.IntegerField(min_value=0, max_value=2147483647)
+    is_active = serializers.BooleanField(default=True)
+
+class ProductChangeSerializer(serializers.ModelSerializer):
+    product_id = serializers.UUIDField(read_only=True)
+    # The product as it is now, None once it was deleted.
+    product = ProductSerializer(read_only=True, allow_null=True)
+
+    class Meta:
+        model = ProductChange
+        fields = ["id", "product_id", "action", "version", "changed_at", "product"]
@@ -0,0 +1,134 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product
+
+class ProductAsyncViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+        cls.other_seller = Account.objects.create_user(
+            username="ana", password="1234", first_name="Ana", last_name="Souza", is_seller=True
+        )
+
+        cls.products = [
+            Product.objects.create(
+                description=f"Caneca {index}",
+                price=10 + index,
+                quantity=index,
+                seller=cls.seller if index % 2 else cls.other_seller,
+            )
+            for index in range(5)
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_async_list_matches_the_sync_list(self):
+        print("test_async_list_matches_the_sync_list")
+
+        for query in ("", "?page_size=3", f"?seller={self.seller.id}", "?ordering=price&in_stock=true"):
+            sync_response = self.client.get(f"/api/products/{query}")
+            async_response = self.client.get(f"/api/async/products/{query}")
+
+            self.assertEqual(status.HTTP_200_OK, async_response.status_code)
+            self.assertEqual(sync_response.json()["results"], async_response.json()["results"])
+            self.assertEqual(sync_response["ETag"], async_response["ETag"])
+
+    async def test_async_list_under_asgi(self):
+        print("test_async_list_under_asgi")
+
+        response = await self.async_client.get("/api/async/products/?page_size=5")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(5, len(response.json()["results"]))
+
+    def test_async_list_follows_cursors(self):
+        print("test_async_list_follows_cursors")
+
+        url = "/api/async/products/?page_size=2"
+        ids = []
+
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                page = self.client.get(url).json()
+
+            self.assertEqual(2, len(queries))
+
+            ids += [product["id"] for product in page["results"]]
+            url = page["next"]
+
+        self.assertListEqual([str(product.id) for product in reversed(self.products)], ids)
+
+    def test_async_list_rejects_invalid_filters(self):
+        print("test_async_list_rejects_invalid_filters")
+
+        response = self.client.get("/api/async/products/?min_price=abc")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn("min_price", response.json())
+
+    def test_async_list_answers_304_when_unchanged(self):
+        print("test_async_list_answers_304_when_unchanged")
+
+        etag = self.client.get("/api/async/products/")["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/async/products/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        self.assertEqual(1, len(queries))
+
+    def test_async_detail_matches_the_sync_detail(self):
+        print("test_async_detail_matches_the_sync_detail")
+
+        product = self.products[1]
+        sync_response = self.client.get(f"/api/products/{product.id}/")
+
+        with CaptureQueriesContext(connection) as queries:
+            async_response = self.client.get(f"/api/async/products/{product.id}/")
+
+        self.assertEqual(1, len(queries))
+        self.assertEqual(status.HTTP_200_OK, async_response.status_code)
+        self.assertEqual(sync_response.json(), async_response.json())
+        self.assertEqual(sync_response["ETag"], async_response["ETag"])
+
+        response = self.client.get(f"/api/async/products/{product.id}/", HTTP_IF_NONE_MATCH=async_response["ETag"])
+
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_async_detail_of_missing_product(self):
+        print("test_async_detail_of_missing_product")
+
+        for pk in (uuid.uuid4(), "not-a-uuid"):
+            response = self.client.get(f"/api/async/products/{pk}/")
+
+            self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+            self.assertEqual({"detail": "Not found."}, response.json())
+
+    def test_async_views_are_read_only(self):
+        print("test_async_views_are_read_only")
+
+        self.client.force_authenticate(self.seller)
+
+        response = self.client.post("/api/async/products/", {"description": "Copo"}, format="json")
+
+        self.assertEqual(status.HTTP_405_METHOD_NOT_ALLOWED, response.status_code)
+
+    def test_async_account_list_matches_the_sync_list(self):
+        print("test_async_account_list_matches_the_sync_list")
+
+        sync_response = self.client.get("/api/accounts/?page_size=1")
+        async_response = self.client.get("/api/async/accounts/?page_size=1")
+
+        self.assertEqual(status.HTTP_200_OK, async_response.status_code)
+        self.assertEqual(sync_response.json()["results"], async_response.json()["results"])
+        self.assertIsNotNone(async_response.json()["next"])
@@ -0,0 +1,212 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from faker import Faker
+
+from accounts.models import Account
+from products.models import Product
+
+class ProductBulkCreateViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/products/bulk/"
+
+        cls.fake = Faker()
+
+        seller_data = {
+            "username": "victo",
+            "password": "1234",
+            "first_name": "Victoria",
+            "last_name": "Viana",
+            "is_seller": True
+        }
+
+        not_seller_data = {
+            "username": "alex",
+            "password": "abcd",
+            "first_name": "Alexandre",
+            "last_name": "Alves",
+            "is_seller": False
+        }
+
+        cls.seller = Account.objects.create_user(**seller_data)
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        common_user = Account.objects.create_user(**not_seller_data)
+        cls.common_user_token = Token.objects.create(user=common_user)
+
+    def make_products(self, amount):
+        return [
+            {
+                "description": self.fake.sentence(nb_words=5),
+                "price": str(self.fake.pydecimal(left_digits=3, right_digits=2, positive=True)),
+                "quantity": self.fake.pyint(min_value=1, max_value=20),
+                "is_active": True
+            }
+            for _ in range(amount)
+        ]
+
+    def test_seller_can_create_products_in_bulk(self):
+        print("test_seller_can_create_products_in_bulk")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.post(self.base_url, data=self.make_products(3), format="json")
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertEqual(3, len(response.json()))
+        self.assertEqual(3, Product.objects.filter(seller=self.seller).count())
+
+    def test_common_user_cannot_create_products_in_bulk(self):
+        print("test_common_user_cannot_create_products_in_bulk")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.common_user_token.key)
+        response = self.client.post(self.base_url, data=self.make_products(3), format="json")
+
+        self.assertEqual(status.HTTP_403_FORBIDDEN, response.status_code)
+
+    def test_invalid_items_are_reported_and_nothing_is_created(self):
+        print("test_invalid_items_are_reported_and_nothing_is_created")
+
+        products = self.make_products(3)
+        products[1]["quantity"] = "many"
+        del products[2]["price"]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.post(self.base_url, data=products, format="json")
+        errors = response.json()
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertEqual({}, errors[0])
+        self.assertIn("quantity", errors[1])
+        self.assertIn("price", errors[2])
+        self.assertFalse(Product.objects.exists())
+
+    @override_settings(PRODUCTS_BULK={"MAX_ITEMS": 2, "BATCH_SIZE": 500})
+    def test_item_limit(self):
+        print("test_item_limit")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.post(self.base_url, data=self.make_products(3), format="json")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    @override_settings(PRODUCTS_BULK={"MAX_ITEMS": 5000, "BATCH_SIZE": 10})
+    def test_insert_queries_depend_on_batches_not_items(self):
+        print("test_insert_queries_depend_on_batches_not_items")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.base_url, data=self.make_products(25), format="json")
+
+        inserts = [
+            query for query in queries.captured_queries if query["sql"].startswith('INSERT INTO "products_product" ')
+        ]
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertEqual(3, len(inserts))
+
+
+class ProductBulkUpdateViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/products/bulk/"
+
+        seller_data = {
+            "username": "victo",
+            "password": "1234",
+            "first_name": "Victoria",
+            "last_name": "Viana",
+            "is_seller": True
+        }
+
+        seller_2_data = {
+            "username": "naruto",
+            "password": "1234",
+            "first_name": "Naruto",
+            "last_name": "Uzumaki",
+            "is_seller": True
+        }
+
+        seller = Account.objects.create_user(**seller_data)
+        cls.seller_token = Token.objects.create(user=seller)
+
+        seller_2 = Account.objects.create_user(**seller_2_data)
+
+        cls.products = [
+            Product.objects.create(description=f"Produto {index}", price=10, quantity=5, seller=seller)
+            for index in range(4)
+        ]
+
+        cls.other_product = Product.objects.create(description="Produto de outro", price=10, quantity=5, seller=seller_2)
+
+    def test_seller_can_update_prices_and_stock_in_bulk(self):
+        print("test_seller_can_update_prices_and_stock_in_bulk")
+
+        changes = [
+            {"id": str(self.products[0].id), "price": "12.50"},
+            {"id": str(self.products[1].id), "quantity": 0, "is_active": False},
+            {"id": str(self.products[2].id), "price": "7.00", "quantity": 9},
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.patch(self.base_url, data=changes, format="json")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual([change["id"] for change in changes], response.json()["updated"])
+
+        products = Product.objects.in_bulk([product.id for product in self.products])
+
+        self.assertEqual(("12.50", 5, True), (str(products[self.products[0].id].price), products[self.products[0].id].quantity, products[self.products[0].id].is_active))
+        self.assertEqual(("10.00", 0, False), (str(products[self.products[1].id].price), products[self.products[1].id].quantity, products[self.products[1].id].is_active))
+        self.assertEqual(("7.00", 9, True), (str(products[self.products[2].id].price), products[self.products[2].id].quantity, products[self.products[2].id].is_active))
+        self.assertEqual(("10.00", 5, True), (str(products[self.products[3].id].price), products[self.products[3].id].quantity, products[self.products[3].id].is_active))
+
+    def test_products_from_other_sellers_are_not_updated(self):
+        print("test_products_from_other_sellers_are_not_updated")
+
+        changes = [
+            {"id": str(self.products[0].id), "quantity": 1},
+            {"id": str(self.other_product.id), "quantity": 1},
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.patch(self.base_url, data=changes, format="json")
+
+        self.assertListEqual([str(self.products[0].id)], response.json()["updated"])
+        self.assertListEqual([str(self.other_product.id)], response.json()["not_found"])
+
+        self.other_product.refresh_from_db()
+        self.assertEqual(5, self.other_product.quantity)
+
+    def test_update_runs_set_based_queries(self):
+        print("test_update_runs_set_based_queries")
+
+        changes = [{"id": str(product.id), "price": "1.00", "quantity": 2} for product in self.products]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.base_url, data=changes, format="json")
+
+        updates = [query for query in queries.captured_queries if query["sql"].startswith('UPDATE "products_product"')]
+
+        self.assertEqual(1, len(updates))
+
+    def test_invalid_changes_are_rejected(self):
+        print("test_invalid_changes_are_rejected")
+
+        changes = [
+            {"id": str(self.products[0].id), "quantity": -1},
+            {"id": str(self.products[0].id), "price": "1.00"},
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.patch(self.base_url, data=changes, format="json")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn("quantity", response.json()[0])
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product
+
+class ProductResponseCacheTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        cls.product = Product.objects.create(description="Caneca", price=10, quantity=5, seller=cls.seller)
+        cls.detail_url = f"/api/products/{cls.product.id}/"
+
+    def setUp(self):
+        cache.clear()
+
+    def get_from_cache(self, url):
+        # The one query left is the lookup of the version the cached
+        # response is keyed by.
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(1, len(queries))
+
+        return response
+
+    def test_list_and_detail_are_served_from_cache(self):
+        print("test_list_and_detail_are_served_from_cache")
+
+        for url in ["/api/products/?page_size=5", self.detail_url]:
+            response = self.client.get(url)
+            cached_response = self.get_from_cache(url)
+
+            self.assertEqual(status.HTTP_200_OK, cached_response.status_code)
+            self.assertEqual(response.content, cached_response.content)
+            self.assertEqual(response["ETag"], cached_response["ETag"])
+            self.assertEqual(response["Content-Type"], cached_response["Content-Type"])
+
+    def test_each_query_string_is_cached_separately(self):
+        print("test_each_query_string_is_cached_separately")
+
+        self.client.get("/api/products/?is_active=false")
+
+        response = self.client.get("/api/products/?is_active=true")
+
+        self.assertEqual(1, len(response.json()["results"]))
+
+    def test_product_writes_invalidate_the_cache(self):
+        print("test_product_writes_invalidate_the_cache")
+
+        self.client.get("/api/products/")
+        self.client.get(self.detail_url)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.detail_url, data={"description": "Caneca azul"}, format="json")
+            Product.objects.create(description="Camiseta", price=50, quantity=1, seller=self.seller)
+
+        self.assertEqual("Caneca azul", self.client.get(self.detail_url).json()["description"])
+        self.assertEqual(2, len(self.client.get("/api/products/").json()["results"]))
+
+    def test_seller_changes_invalidate_product_details(self):
+        print("test_seller_changes_invalidate_product_details")
+
+        self.client.get(self.detail_url)
+
+        self.seller.first_name = "Vic"
+        self.seller.save()
+
+        self.assertEqual("Vic", self.client.get(self.detail_url).json()["seller"]["first_name"])
+
+    def test_browsable_api_is_not_cached(self):
+        print("test_browsable_api_is_not_cached")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        self.client.get(self.detail_url, HTTP_ACCEPT="text/html")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.detail_url, HTTP_ACCEPT="text/html")
+
+        self.assertNotEqual(0, len(queries))
+
+    @override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, "TIMEOUT": 0})
+    def test_timeout_comes_from_settings(self):
+        print("test_timeout_comes_from_settings")
+
+        self.client.get(self.detail_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.detail_url)
+
+        self.assertEqual(2, len(queries))
@@ -0,0 +1,261 @@
+import io
+import threading
+import time
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product, ProductChange
+
+PRODUCTS_CHANGES = {
+    "PAGE_SIZE": 100,
+    "MAX_PAGE_SIZE": 1000,
+    "SETTLE_SECONDS": 0,
+    "COMPACT_AFTER_DAYS": 7,
+    "COMPACT_BATCH_SIZE": 2,
+}
+
+@override_settings(PRODUCTS_CHANGES=PRODUCTS_CHANGES)
+class ProductChangeViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/products/changes/"
+
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        cls.product_data = {"description": "Caneca", "price": "19.90", "quantity": 3}
+
+    def write(self, method, url, data):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method)(url, data=data, format="json")
+
+        self.client.credentials()
+
+        return response
+
+    def test_writes_are_logged_in_order(self):
+        print("test_writes_are_logged_in_order")
+
+        product_id = self.write("post", "/api/products/", self.product_data).json()["id"]
+        detail_url = f"/api/products/{product_id}/"
+
+        self.write("patch", detail_url, {"price": "29.90"})
+        self.write("patch", detail_url, {"is_active": False})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.filter(id=product_id).delete()
+
+        response = self.client.get(self.base_url)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+        changes = response.json()["results"]
+
+        self.assertListEqual(
+            ["created", "updated", "deactivated", "deleted"], [change["action"] for change in changes]
+        )
+        self.assertListEqual([1, 2, 3, None], [change["version"] for change in changes])
+        self.assertSetEqual({product_id}, {change["product_id"] for change in changes})
+        self.assertIsNone(changes[-1]["product"])
+
+    def test_bulk_writes_are_logged(self):
+        print("test_bulk_writes_are_logged")
+
+        products = self.write("post", "/api/products/bulk/", [self.product_data] * 3).json()
+
+        changes = self.client.get(self.base_url).json()["results"]
+
+        self.assertListEqual([product["id"] for product in products], [change["product_id"] for change in changes])
+        self.assertEqual("Caneca", changes[0]["product"]["description"])
+
+    def test_clients_page_through_the_changes(self):
+        print("test_clients_page_through_the_changes")
+
+        self.write("post", "/api/products/bulk/", [self.product_data] * 5)
+
+        url = f"{self.base_url}?page_size=2"
+        change_ids = []
+
+        while True:
+            data = self.client.get(url).json()
+            change_ids += [change["id"] for change in data["results"]]
+            url = data["next"]
+
+            if not data["has_more"]:
+                break
+
+        self.assertListEqual(list(ProductChange.objects.order_by("id").values_list("id", flat=True)), change_ids)
+
+        # A client that caught up reads nothing new, in one query, until the
+        # next write.
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(url).json()
+
+        self.assertEqual(1, len(queries))
+        self.assertListEqual([], data["results"])
+        self.assertEqual(url, data["next"])
+
+        self.write("post", "/api/products/", self.product_data)
+
+        self.assertEqual(1, len(self.client.get(url).json()["results"]))
+
+    def test_activity_changes_are_logged_as_such(self):
+        print("test_activity_changes_are_logged_as_such")
+
+        product_id = self.write("post", "/api/products/", {**self.product_data, "is_active": False}).json()["id"]
+        detail_url = f"/api/products/{product_id}/"
+
+        self.write("patch", detail_url, {"price": "29.90"})
+        self.write("patch", detail_url, {"is_active": True})
+        self.write("patch", detail_url, {"is_active": True})
+        self.write("patch", "/api/products/bulk/", [{"id": product_id, "is_active": False}])
+        self.write("patch", "/api/products/bulk/", [{"id": product_id, "quantity": 1}])
+        self.write("patch", "/api/products/bulk/", [{"id": product_id, "is_active": True}])
+
+        changes = self.client.get(self.base_url).json()["results"]
+
+        self.assertListEqual(
+            ["created", "updated", "reactivated", "updated", "deactivated", "updated", "reactivated"],
+            [change["action"] for change in changes],
+        )
+        self.assertListEqual([1, 2, 3, 4, 5, 6, 7], [change["version"] for change in changes])
+
+    def test_changes_commit_with_their_write(self):
+        print("test_changes_commit_with_their_write")
+
+        product = Product.objects.create(seller=self.seller, **self.product_data)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            product.description = "Caneca azul"
+            product.save()
+            Product.objects.create(seller=self.seller, description="Camiseta", price=10, quantity=None)
+
+        self.assertListEqual(
+            [(product.id, ProductChange.CREATED)], list(ProductChange.objects.values_list("product_id", "action"))
+        )
+
+    @override_settings(PRODUCTS_CHANGES={**PRODUCTS_CHANGES, "SETTLE_SECONDS": 60})
+    def test_changes_are_listed_once_settled(self):
+        print("test_changes_are_listed_once_settled")
+
+        self.write("post", "/api/products/", self.product_data)
+
+        self.assertListEqual([], self.client.get(self.base_url).json()["results"])
+
+        ProductChange.objects.update(changed_at=timezone.now() - timedelta(seconds=61))
+
+        self.assertEqual(1, len(self.client.get(self.base_url).json()["results"]))
+
+    def test_invalid_cursor(self):
+        print("test_invalid_cursor")
+
+        for since in ["abc", "-1"]:
+            response = self.client.get(f"{self.base_url}?since={since}")
+
+            self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+            self.assertDictEqual({"since": ["must be the id of a change"]}, response.json())
+
+@override_settings(PRODUCTS_CHANGES=PRODUCTS_CHANGES)
+class ProductChangeCompactTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        cls.products = [
+            Product.objects.create(description=f"Caneca {index}", price=10, quantity=1, seller=seller)
+            for index in range(3)
+        ]
+
+        # The log starts out empty, without the creations.
+        ProductChange.objects.all().delete()
+
+    def log(self, products: list) -> list:
+        return ProductChange.objects.record(
+            [ProductChange(product=product, action=ProductChange.UPDATED, version=1) for product in products]
+        )
+
+    def test_compaction_keeps_the_latest_change_of_each_product(self):
+        print("test_compaction_keeps_the_latest_change_of_each_product")
+
+        for products in [self.products, self.products[:1], self.products[1:2]]:
+            self.log(products)
+
+        ProductChange.objects.update(changed_at=timezone.now() - timedelta(days=10))
+        recent = self.log(self.products[:1])
+
+        stdout = io.StringIO()
+        call_command("compact_product_changes", stdout=stdout)
+
+        self.assertIn("Removed 3 superseded changes", stdout.getvalue())
+        self.assertListEqual(
+            [self.products[2].id, self.products[1].id, self.products[0].id],
+            list(ProductChange.objects.order_by("id").values_list("product_id", flat=True)),
+        )
+        self.assertEqual(recent[0].id, ProductChange.objects.latest("id").id)
+
+    def test_recent_changes_are_kept(self):
+        print("test_recent_changes_are_kept")
+
+        for _ in range(3):
+            self.log(self.products[:1])
+
+        call_command("compact_product_changes", stdout=io.StringIO())
+
+        self.assertEqual(3, ProductChange.objects.count())
+
+@skipUnless(connection.vendor == "postgresql", "concurrent writers are checked on PostgreSQL only")
+class ProductChangeConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        self.products = [
+            Product.objects.create(description=f"Caneca {index}", price=10, quantity=5, seller=seller)
+            for index in range(2)
+        ]
+
+    def test_writes_to_different_products_do_not_wait_for_each_other(self):
+        print("test_writes_to_different_products_do_not_wait_for_each_other")
+
+        logged = threading.Event()
+        committed = threading.Event()
+
+        def slow_write():
+            try:
+                with transaction.atomic():
+                    Product.objects.reserve(self.products[0].id, 1)
+                    logged.set()
+                    time.sleep(0.5)
+
+                committed.set()
+            finally:
+                connection.close()
+
+        writer = threading.Thread(target=slow_write)
+        writer.start()
+        logged.wait()
+
+        # Logging a change locks nothing shared, only the product written.
+        Product.objects.reserve(self.products[1].id, 1)
+        finished_first = not committed.is_set()
+        writer.join()
+
+        self.assertTrue(finished_first)
+        self.assertEqual(2, ProductChange.objects.filter(action=ProductChange.UPDATED).count())
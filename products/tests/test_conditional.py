@@ -0,0 +1,144 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product, ProductChange
+
+class ProductConditionalGetTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        cls.product = Product.objects.create(description="Caneca", price=10, quantity=5, seller=cls.seller)
+        cls.detail_url = f"/api/products/{cls.product.id}/"
+
+    def test_unchanged_list_answers_304_after_one_query(self):
+        print("test_unchanged_list_answers_304_after_one_query")
+
+        response = self.client.get("/api/products/")
+        etag = response["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        self.assertEqual(etag, response["ETag"])
+        self.assertEqual(1, len(queries))
+
+    def test_list_etag_depends_on_query_and_catalog_writes(self):
+        print("test_list_etag_depends_on_query_and_catalog_writes")
+
+        etag = self.client.get("/api/products/?is_active=true&page_size=5")["ETag"]
+
+        self.assertEqual(etag, self.client.get("/api/products/?page_size=5&is_active=true")["ETag"])
+        self.assertNotEqual(etag, self.client.get("/api/products/?page_size=6&is_active=true")["ETag"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.reserve(self.product.id, 1)
+
+        response = self.client.get("/api/products/?is_active=true&page_size=5", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotEqual(etag, response["ETag"])
+
+    def test_list_etag_survives_a_cache_clear(self):
+        print("test_list_etag_survives_a_cache_clear")
+
+        # The catalog version lives in the database, so a cleared or
+        # per-node cache hands out the same ETag.
+        etag = self.client.get("/api/products/")["ETag"]
+        cache.clear()
+
+        response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        self.assertEqual(etag, response["ETag"])
+
+    def test_unchanged_detail_answers_304_after_one_query(self):
+        print("test_unchanged_detail_answers_304_after_one_query")
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        self.assertEqual(1, len(queries))
+
+    def test_detail_etag_changes_with_product_and_seller(self):
+        print("test_detail_etag_changes_with_product_and_seller")
+
+        etags = [self.client.get(self.detail_url)["ETag"]]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.patch(self.detail_url, data={"price": "12.00"}, format="json")
+        etags.append(response["ETag"])
+
+        self.assertEqual(etags[-1], self.client.get(self.detail_url)["ETag"])
+
+        self.seller.first_name = "Vic"
+        self.seller.save(update_fields=["first_name"])
+        etags.append(self.client.get(self.detail_url)["ETag"])
+
+        self.seller.save(update_fields=["last_login"])
+        etags.append(self.client.get(self.detail_url)["ETag"])
+
+        self.assertEqual(3, len(set(etags)))
+        self.assertEqual(etags[2], etags[3])
+
+    def test_update_with_stale_if_match_fails(self):
+        print("test_update_with_stale_if_match_fails")
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        Product.objects.reserve(self.product.id, 1)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.patch(self.detail_url, data={"quantity": 20}, format="json", HTTP_IF_MATCH=etag)
+
+        self.assertEqual(status.HTTP_412_PRECONDITION_FAILED, response.status_code)
+
+        self.product.refresh_from_db()
+        self.assertEqual(4, self.product.quantity)
+
+    def test_update_with_current_if_match_succeeds(self):
+        print("test_update_with_current_if_match_succeeds")
+
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.patch(self.detail_url, data={"quantity": 20}, format="json", HTTP_IF_MATCH=etag)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotEqual(etag, response["ETag"])
+
+        response = self.client.patch(self.detail_url, data={"quantity": 21}, format="json", HTTP_IF_MATCH=etag)
+
+        self.assertEqual(status.HTTP_412_PRECONDITION_FAILED, response.status_code)
+
+    def test_seller_edits_leave_products_alone(self):
+        print("test_seller_edits_leave_products_alone")
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        changes = ProductChange.objects.count()
+
+        self.seller.last_name = "Vieira"
+        self.seller.save(update_fields=["last_name"])
+
+        self.product.refresh_from_db()
+        self.assertEqual(1, self.product.version)
+        self.assertEqual(changes, ProductChange.objects.count())
+        self.assertNotEqual(etag, self.client.get(self.detail_url)["ETag"])
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        response = self.client.patch(self.detail_url, data={"quantity": 20}, format="json", HTTP_IF_MATCH=etag)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(response["ETag"], self.client.get(self.detail_url)["ETag"])
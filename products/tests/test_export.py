@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product
+
+class ProductExportTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/products/export/"
+
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        cls.seller_2 = Account.objects.create_user(
+            username="naruto", password="1234", first_name="Naruto", last_name="Uzumaki", is_seller=True
+        )
+
+        cls.products = [
+            Product.objects.create(
+                description=f'Produto, "{index}"',
+                price=10 + index,
+                quantity=index,
+                is_active=index % 2 == 0,
+                seller=cls.seller
+            )
+            for index in range(5)
+        ]
+
+        cls.other_product = Product.objects.create(description="Kunai", price=5, quantity=1, seller=cls.seller_2)
+
+    def read_stream(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_streams_ndjson_by_default(self):
+        print("test_export_streams_ndjson_by_default")
+
+        response = self.client.get(self.base_url)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+
+        rows = [json.loads(line) for line in self.read_stream(response).splitlines()]
+
+        self.assertEqual(6, len(rows))
+        self.assertListEqual(
+            ["id", "seller", "description", "price", "quantity", "is_active", "created_at"], list(rows[0])
+        )
+        self.assertEqual(str(self.other_product.id), rows[0]["id"])
+        self.assertEqual(str(self.seller_2.id), rows[0]["seller"])
+        self.assertEqual("5.00", rows[0]["price"])
+
+    def test_export_streams_csv(self):
+        print("test_export_streams_csv")
+
+        response = self.client.get(self.base_url, {"format": "csv", "seller": self.seller.id})
+
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+
+        rows = list(csv.DictReader(io.StringIO(self.read_stream(response))))
+
+        self.assertEqual(5, len(rows))
+        self.assertSetEqual({product.description for product in self.products}, {row["description"] for row in rows})
+
+    @override_settings(PRODUCTS_EXPORT={"CHUNK_SIZE": 2})
+    def test_export_is_written_in_chunks(self):
+        print("test_export_is_written_in_chunks")
+
+        response = self.client.get(self.base_url, {"is_active": "true"})
+        chunks = list(response.streaming_content)
+
+        self.assertEqual(2, len(chunks))
+        self.assertEqual(4, b"".join(chunks).count(b"\n"))
+
+    def test_export_rejects_invalid_filters(self):
+        print("test_export_rejects_invalid_filters")
+
+        response = self.client.get(self.base_url, {"seller": "not-an-id"})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn("seller", json.loads(response.content))
+
+    def test_export_command_writes_products(self):
+        print("test_export_command_writes_products")
+
+        output = io.StringIO()
+        call_command("export_products", "--format", "csv", "--is-active", "false", stdout=output)
+
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+
+        self.assertListEqual([str(self.products[3].id), str(self.products[1].id)], [row["id"] for row in rows])
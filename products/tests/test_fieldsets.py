@@ -0,0 +1,111 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product
+
+class ProductFieldsetTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        cls.products = [
+            Product.objects.create(description=f"Caneca {index}", price=10 + index, quantity=5, seller=cls.seller)
+            for index in range(3)
+        ]
+        cls.detail_url = f"/api/products/{cls.products[0].id}/"
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_list_returns_only_the_requested_fields(self):
+        print("test_list_returns_only_the_requested_fields")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/products/?fields=id,price&page_size=10")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual(
+            [{"id": str(product.id), "price": f"{product.price}.00"} for product in reversed(self.products)],
+            response.json()["results"],
+        )
+
+        sql = queries.captured_queries[-1]["sql"]
+
+        self.assertNotIn("description", sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_list_pages_keep_their_order_without_the_ordering_fields(self):
+        print("test_list_pages_keep_their_order_without_the_ordering_fields")
+
+        url = "/api/products/?fields=description&page_size=2"
+        descriptions = []
+
+        while url:
+            data = self.client.get(url).json()
+            descriptions += [product["description"] for product in data["results"]]
+            url = data["next"]
+
+        self.assertListEqual(["Caneca 2", "Caneca 1", "Caneca 0"], descriptions)
+
+    def test_list_expands_the_seller_with_a_join(self):
+        print("test_list_expands_the_seller_with_a_join")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/products/?fields=id&expand=seller&page_size=10")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+        product = response.json()["results"][0]
+
+        self.assertSetEqual({"id", "seller"}, set(product))
+        self.assertEqual("victo", product["seller"]["username"])
+        self.assertNotIn("password", product["seller"])
+        self.assertIn("JOIN", queries.captured_queries[-1]["sql"])
+
+        product = self.client.get("/api/products/?page_size=10").json()["results"][0]
+
+        self.assertEqual(str(self.seller.id), product["seller"])
+
+    def test_detail_skips_the_seller_unless_requested(self):
+        print("test_detail_skips_the_seller_unless_requested")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"{self.detail_url}?fields=id,quantity")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertDictEqual({"id": str(self.products[0].id), "quantity": 5}, response.json())
+        self.assertNotIn("JOIN", queries.captured_queries[-1]["sql"])
+
+        response = self.client.get(f"{self.detail_url}?expand=seller")
+
+        self.assertEqual("victo", response.json()["seller"]["username"])
+
+    def test_detail_representations_are_cached_and_tagged_apart(self):
+        print("test_detail_representations_are_cached_and_tagged_apart")
+
+        full = self.client.get(self.detail_url)
+        narrow = self.client.get(f"{self.detail_url}?fields=id")
+
+        self.assertIn("seller", full.json())
+        self.assertDictEqual({"id": str(self.products[0].id)}, narrow.json())
+        self.assertNotEqual(full["ETag"], narrow["ETag"])
+
+        response = self.client.get(f"{self.detail_url}?fields=id", HTTP_IF_NONE_MATCH=narrow["ETag"])
+
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_unknown_fields_are_rejected(self):
+        print("test_unknown_fields_are_rejected")
+
+        response = self.client.get("/api/products/?fields=id,secret&expand=description")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertDictEqual(
+            {"fields": ["unknown field secret"], "expand": ["description cannot be expanded"]}, response.json()
+        )
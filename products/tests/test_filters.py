@@ -0,0 +1,178 @@
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.filters import filter_products
+from products.models import Product
+from products.pagination import ProductPagination
+from products.views import ProductView
+
+class ProductFilterTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/products/"
+
+        seller_data = {
+            "username": "victo",
+            "password": "1234",
+            "first_name": "Victoria",
+            "last_name": "Viana",
+            "is_seller": True
+        }
+
+        seller_2_data = {
+            "username": "naruto",
+            "password": "1234",
+            "first_name": "Naruto",
+            "last_name": "Uzumaki",
+            "is_seller": True
+        }
+
+        cls.seller = Account.objects.create_user(**seller_data)
+        cls.seller_2 = Account.objects.create_user(**seller_2_data)
+
+        cls.products_data = [
+            ("Mouse", Decimal("50.00"), 10, True, cls.seller),
+            ("Teclado", Decimal("120.00"), 0, True, cls.seller),
+            ("Monitor", Decimal("900.00"), 3, False, cls.seller),
+            ("Cadeira", Decimal("700.00"), 2, True, cls.seller_2),
+            ("Mesa", Decimal("300.00"), 0, False, cls.seller_2),
+        ]
+
+        for description, price, quantity, is_active, seller in cls.products_data:
+            Product.objects.create(
+                description=description,
+                price=price,
+                quantity=quantity,
+                is_active=is_active,
+                seller=seller
+            )
+
+    def get_descriptions(self, query_string):
+        response = self.client.get(f"{self.base_url}?page_size=100&{query_string}")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+        return {product["description"] for product in response.json()["results"]}
+
+    def test_filter_by_seller(self):
+        print("test_filter_by_seller")
+
+        result = self.get_descriptions(f"seller={self.seller_2.id}")
+
+        self.assertSetEqual({"Cadeira", "Mesa"}, result)
+
+    def test_filter_by_seller_username(self):
+        print("test_filter_by_seller_username")
+
+        result = self.get_descriptions("seller_username=victo")
+
+        self.assertSetEqual({"Mouse", "Teclado", "Monitor"}, result)
+
+    def test_filter_by_is_active(self):
+        print("test_filter_by_is_active")
+
+        self.assertSetEqual({"Monitor", "Mesa"}, self.get_descriptions("is_active=false"))
+        self.assertSetEqual({"Mouse", "Teclado", "Cadeira"}, self.get_descriptions("is_active=true"))
+
+    def test_filter_by_price_range(self):
+        print("test_filter_by_price_range")
+
+        result = self.get_descriptions("min_price=100&max_price=700")
+
+        self.assertSetEqual({"Teclado", "Cadeira", "Mesa"}, result)
+
+    def test_filter_in_stock(self):
+        print("test_filter_in_stock")
+
+        result = self.get_descriptions("in_stock=true&is_active=true")
+
+        self.assertSetEqual({"Mouse", "Cadeira"}, result)
+
+    def test_order_by_price_across_pages(self):
+        print("test_order_by_price_across_pages")
+
+        url = f"{self.base_url}?ordering=-price&page_size=2"
+        prices = []
+
+        while url:
+            data = self.client.get(url).json()
+            prices += [Decimal(product["price"]) for product in data["results"]]
+            url = data["next"]
+
+        self.assertListEqual(sorted((product[1] for product in self.products_data), reverse=True), prices)
+
+    def test_invalid_filter_value(self):
+        print("test_invalid_filter_value")
+
+        response = self.client.get(f"{self.base_url}?min_price=cheap")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn("min_price", response.json())
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are checked on PostgreSQL only")
+class ProductFilterIndexTest(APITestCase):
+    # Enough sellers and products for every filter below to be selective, so
+    # the planner picks the indexes on its own.
+    @classmethod
+    def setUpTestData(cls) -> None:
+        sellers = Account.objects.bulk_create([
+            Account(username=f"seller_{index}", first_name="Victoria", last_name="Viana", is_seller=True)
+            for index in range(50)
+        ])
+        cls.seller = sellers[0]
+
+        Product.objects.bulk_create([
+            Product(
+                description=f"Produto {index}",
+                price=Decimal(index % 500),
+                quantity=index % 7,
+                is_active=index % 3 != 0,
+                seller=sellers[index % len(sellers)]
+            )
+            for index in range(20000)
+        ], batch_size=2000)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE products_product")
+            cursor.execute("ANALYZE accounts_account")
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+
+        self.assertNotIn("Seq Scan on products_product", plan)
+        self.assertIn("Index", plan)
+
+    def test_filter_combinations_use_index_scans(self):
+        print("test_filter_combinations_use_index_scans")
+
+        combinations = [
+            ({"seller": str(self.seller.id)}, ("-created_at", "-id")),
+            ({"seller": str(self.seller.id), "is_active": "true"}, ("-created_at", "-id")),
+            ({"seller_username": self.seller.username}, ("-created_at", "-id")),
+            ({"is_active": "true", "min_price": "10", "max_price": "50"}, ("price", "id")),
+            ({"is_active": "true", "in_stock": "true"}, ("price", "id")),
+            ({"is_active": "true"}, ("-price", "-id")),
+            ({}, ("price", "id")),
+        ]
+
+        for params, ordering in combinations:
+            with self.subTest(params=params, ordering=ordering):
+                self.assertUsesIndex(filter_products(Product.objects.all(), params).order_by(*ordering)[:20])
+
+    def test_pages_past_ties_use_index_scans(self):
+        print("test_pages_past_ties_use_index_scans")
+
+        # 40 products share each price, so the second page starts inside a tie.
+        first_page = self.client.get("/api/products/?ordering=price&page_size=20").json()
+        request = Request(APIRequestFactory().get(first_page["next"]))
+        view = ProductView(request=request, format_kwarg=None)
+        paginator = ProductPagination()
+
+        self.assertUsesIndex(paginator.get_page_queryset(view.filter_queryset(Product.objects.all()), request, view))
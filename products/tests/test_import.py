@@ -0,0 +1,190 @@
+import io
+import json
+import os
+import tempfile
+from unittest import skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from accounts.models import Account
+from products.models import Product, ProductChange
+
+class ImportProductsCommandTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+        return path
+
+    def import_products(self, *args):
+        output = io.StringIO()
+        call_command("import_products", *args, stdout=output)
+
+        return output.getvalue()
+
+    def test_import_csv(self):
+        print("test_import_csv")
+
+        path = self.write_file("catalog.csv", "\n".join([
+            "seller,description,price,quantity,is_active",
+            f'{self.seller.id},"Caneca, azul",19.90,3,true',
+            f"{self.seller.id},Camiseta,49.90,0,false",
+            f"{self.seller.id},Boné,29.90,7,",
+        ]))
+
+        output = self.import_products(path)
+
+        self.assertIn("Imported 3 rows", output)
+        self.assertIn("rows/s", output)
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+        products = {product.description: product for product in Product.objects.all()}
+
+        self.assertSetEqual({"Caneca, azul", "Camiseta", "Boné"}, set(products))
+        self.assertEqual("49.90", str(products["Camiseta"].price))
+        self.assertFalse(products["Camiseta"].is_active)
+        self.assertTrue(products["Boné"].is_active)
+
+    def test_import_jsonl_with_default_seller(self):
+        print("test_import_jsonl_with_default_seller")
+
+        path = self.write_file("catalog.jsonl", "\n".join(
+            json.dumps({"description": f"Produto {index}", "price": "10.00", "quantity": index})
+            for index in range(5)
+        ))
+
+        self.import_products(path, "--seller", str(self.seller.id), "--chunk-size", "2")
+
+        self.assertEqual(5, self.seller.products.count())
+
+    def test_rows_with_an_id_update_the_existing_product(self):
+        print("test_rows_with_an_id_update_the_existing_product")
+
+        product = Product.objects.create(description="Caneca", price=10, quantity=1, seller=self.seller)
+
+        path = self.write_file("catalog.jsonl", json.dumps({
+            "id": str(product.id), "seller": str(self.seller.id), "description": "Caneca", "price": "12.00", "quantity": 8
+        }))
+
+        self.import_products(path)
+
+        product.refresh_from_db()
+
+        self.assertEqual(1, Product.objects.count())
+        self.assertEqual(8, product.quantity)
+        self.assertEqual("12.00", str(product.price))
+
+    def test_imports_are_logged_as_changes(self):
+        print("test_imports_are_logged_as_changes")
+
+        product = Product.objects.create(description="Caneca", price=10, quantity=1, seller=self.seller)
+
+        path = self.write_file("catalog.jsonl", "\n".join([
+            json.dumps({"id": str(product.id), "seller": str(self.seller.id), "description": "Caneca", "price": "12.00",
+                        "quantity": 8, "is_active": False}),
+            json.dumps({"seller": str(self.seller.id), "description": "Camiseta", "price": "49.90", "quantity": 2}),
+        ]))
+
+        self.import_products(path)
+
+        self.assertListEqual(
+            [(ProductChange.CREATED, 1), (ProductChange.DEACTIVATED, 2), (ProductChange.CREATED, 1)],
+            list(ProductChange.objects.order_by("id").values_list("action", "version")),
+        )
+
+    def test_import_resumes_after_invalid_rows(self):
+        print("test_import_resumes_after_invalid_rows")
+
+        rows = [
+            {"seller": str(self.seller.id), "description": f"Produto {index}", "price": "10.00", "quantity": index}
+            for index in range(5)
+        ]
+        rows[3]["quantity"] = -1
+
+        path = self.write_file("catalog.jsonl", "\n".join(json.dumps(row) for row in rows))
+
+        with self.assertRaisesMessage(CommandError, "row 4: {'quantity'"):
+            self.import_products(path, "--chunk-size", "2")
+
+        self.assertEqual(2, Product.objects.count())
+
+        rows[3]["quantity"] = 3
+        self.write_file("catalog.jsonl", "\n".join(json.dumps(row) for row in rows))
+
+        output = self.import_products(path, "--chunk-size", "2")
+
+        self.assertIn("Resuming after row 2", output)
+        self.assertListEqual(
+            [f"Produto {index}" for index in range(5)],
+            sorted(Product.objects.values_list("description", flat=True)),
+        )
+
+    def test_rows_of_unknown_sellers_are_rejected(self):
+        print("test_rows_of_unknown_sellers_are_rejected")
+
+        path = self.write_file("catalog.csv", "\n".join([
+            "seller,description,price,quantity",
+            "00000000-0000-0000-0000-000000000000,Caneca,19.90,3",
+        ]))
+
+        with self.assertRaisesMessage(CommandError, "seller does not exist"):
+            self.import_products(path)
+
+        self.assertFalse(Product.objects.exists())
+
+    def test_rows_cannot_overwrite_products_of_other_sellers(self):
+        print("test_rows_cannot_overwrite_products_of_other_sellers")
+
+        other_seller = Account.objects.create_user(
+            username="alex", password="abcd", first_name="Alexandre", last_name="Alves", is_seller=True
+        )
+        product = Product.objects.create(description="Caneca", price=10, quantity=1, seller=self.seller)
+
+        path = self.write_file("catalog.jsonl", "\n".join([
+            json.dumps({"seller": str(other_seller.id), "description": "Camiseta", "price": "49.90", "quantity": 2}),
+            json.dumps({"id": str(product.id), "seller": str(other_seller.id), "description": "Caneca",
+                        "price": "1.00", "quantity": 1}),
+        ]))
+
+        with self.assertRaisesMessage(CommandError, "row 2: {'id': ['product belongs to another seller']}"):
+            self.import_products(path)
+
+        product.refresh_from_db()
+
+        self.assertEqual(1, Product.objects.count())
+        self.assertEqual("10.00", str(product.price))
+
+    @skipUnless(connection.vendor == "postgresql", "the COPY loader runs on PostgreSQL only")
+    def test_copy_loader_inserts_and_updates_versions(self):
+        print("test_copy_loader_inserts_and_updates_versions")
+
+        product = Product.objects.create(description="Caneca", price=10, quantity=1, seller=self.seller)
+
+        rows = [
+            {"id": str(product.id), "description": "Caneca azul", "price": "12.00", "quantity": 8},
+            {"description": "Camiseta", "price": "49.90", "quantity": 2},
+        ]
+        path = self.write_file("catalog.jsonl", "\n".join(json.dumps(row) for row in rows))
+
+        self.import_products(path, "--seller", str(self.seller.id))
+
+        products = {product.description: product for product in Product.objects.all()}
+
+        self.assertSetEqual({"Caneca azul", "Camiseta"}, set(products))
+        self.assertEqual(2, products["Caneca azul"].version)
+        self.assertEqual(8, products["Caneca azul"].quantity)
+        self.assertEqual(1, products["Camiseta"].version)
@@ -0,0 +1,154 @@
+import threading
+import time
+from unittest import skipIf
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product
+
+class ProductReserveViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        buyer = Account.objects.create_user(
+            username="alex", password="abcd", first_name="Alexandre", last_name="Alves"
+        )
+        cls.buyer_token = Token.objects.create(user=buyer)
+
+        cls.product = Product.objects.create(description="Produto", price=10, quantity=5, seller=seller)
+        cls.inactive_product = Product.objects.create(
+            description="Produto inativo", price=10, quantity=5, is_active=False, seller=seller
+        )
+
+        cls.base_url = f"/api/products/{cls.product.id}/reserve/"
+
+    def test_buyer_can_reserve_stock(self):
+        print("test_buyer_can_reserve_stock")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        response = self.client.post(self.base_url, data={"quantity": 2}, format="json")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertDictEqual({"quantity": 2}, response.json())
+
+        self.product.refresh_from_db()
+        self.assertEqual(3, self.product.quantity)
+
+    def test_reserve_runs_a_single_conditional_update(self):
+        print("test_reserve_runs_a_single_conditional_update")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(Product.objects.reserve(self.product.id, 5))
+
+        # Then the entry of the change log, written along with it. The catalog
+        # version is bumped after the commit.
+        self.assertEqual(2, len(queries))
+        self.assertTrue(queries.captured_queries[0]["sql"].startswith('UPDATE "products_product"'))
+        self.assertTrue(queries.captured_queries[1]["sql"].startswith('INSERT INTO "products_productchange"'))
+
+    def test_cannot_reserve_more_than_available(self):
+        print("test_cannot_reserve_more_than_available")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        response = self.client.post(self.base_url, data={"quantity": 6}, format="json")
+
+        self.assertEqual(status.HTTP_409_CONFLICT, response.status_code)
+
+        self.product.refresh_from_db()
+        self.assertEqual(5, self.product.quantity)
+
+    def test_cannot_reserve_inactive_or_missing_products(self):
+        print("test_cannot_reserve_inactive_or_missing_products")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+
+        response = self.client.post(f"/api/products/{self.inactive_product.id}/reserve/", data={"quantity": 1}, format="json")
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+        response = self.client.post("/api/products/00000000-0000-0000-0000-000000000000/reserve/", data={"quantity": 1}, format="json")
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_quantity_must_be_positive(self):
+        print("test_quantity_must_be_positive")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        response = self.client.post(self.base_url, data={"quantity": 0}, format="json")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    def test_anonymous_user_cannot_reserve(self):
+        print("test_anonymous_user_cannot_reserve")
+
+        response = self.client.post(self.base_url, data={"quantity": 1}, format="json")
+
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+@skipIf(
+    connection.vendor == "sqlite" and connection.creation.is_in_memory_db(connection.settings_dict["TEST"]["NAME"] or ":memory:"),
+    "in-memory SQLite test databases reject concurrent writers instead of waiting for them",
+)
+class ProductReserveConcurrencyTest(TransactionTestCase):
+    threads = 8
+    attempts_per_thread = 25
+    stock = 100
+
+    def setUp(self):
+        seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        buyer = Account.objects.create_user(
+            username="alex", password="abcd", first_name="Alexandre", last_name="Alves"
+        )
+        self.buyer_token = Token.objects.create(user=buyer)
+
+        self.product = Product.objects.create(description="Produto", price=10, quantity=self.stock, seller=seller)
+
+    def test_concurrent_reservations_never_oversell(self):
+        print("test_concurrent_reservations_never_oversell")
+
+        url = f"/api/products/{self.product.id}/reserve/"
+        results = []
+        barrier = threading.Barrier(self.threads)
+
+        def buy():
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+            statuses = []
+
+            barrier.wait()
+
+            try:
+                for _ in range(self.attempts_per_thread):
+                    statuses.append(client.post(url, data={"quantity": 1}, format="json").status_code)
+            finally:
+                connection.close()
+
+            results.extend(statuses)
+
+        workers = [threading.Thread(target=buy) for _ in range(self.threads)]
+
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        print(f"{len(results) / elapsed:.0f} reservations/s with {self.threads} threads")
+
+        self.product.refresh_from_db()
+
+        self.assertEqual(self.threads * self.attempts_per_thread, len(results))
+        self.assertEqual(self.stock, results.count(status.HTTP_200_OK))
+        self.assertEqual(len(results) - self.stock, results.count(status.HTTP_409_CONFLICT))
+        self.assertEqual(0, self.product.quantity)
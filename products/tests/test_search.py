@@ -0,0 +1,146 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product
+from products.search import install_search_index
+
+class ProductSearchTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/products/"
+
+        seller_data = {
+            "username": "victo",
+            "password": "1234",
+            "first_name": "Victoria",
+            "last_name": "Viana",
+            "is_seller": True
+        }
+
+        cls.seller = Account.objects.create_user(**seller_data)
+
+        descriptions = [
+            "Mouse sem fio",
+            "Mouse gamer com mouse pad",
+            "Teclado mecanico",
+            "Kit teclado e mouse",
+            "Monitor ultrawide",
+        ]
+
+        cls.products = {
+            description: Product.objects.create(description=description, price=10, quantity=1, seller=cls.seller)
+            for description in descriptions
+        }
+
+    def search(self, query, extra=""):
+        response = self.client.get(self.base_url, {"q": query, "page_size": 100})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+        return [product["description"] for product in response.json()["results"]]
+
+    def test_search_returns_only_matching_products(self):
+        print("test_search_returns_only_matching_products")
+
+        result = self.search("teclado")
+
+        self.assertSetEqual({"Teclado mecanico", "Kit teclado e mouse"}, set(result))
+
+    def test_search_requires_every_term(self):
+        print("test_search_requires_every_term")
+
+        self.assertListEqual(["Kit teclado e mouse"], self.search("mouse teclado"))
+
+    def test_search_results_are_ranked(self):
+        print("test_search_results_are_ranked")
+
+        result = self.search("mouse")
+
+        self.assertEqual(3, len(result))
+        self.assertEqual("Mouse gamer com mouse pad", result[0])
+
+    def test_search_results_are_paginated(self):
+        print("test_search_results_are_paginated")
+
+        url = f"{self.base_url}?q=mouse&page_size=1"
+        result = []
+
+        while url:
+            data = self.client.get(url).json()
+            result += [product["description"] for product in data["results"]]
+            url = data["next"]
+
+        self.assertListEqual(self.search("mouse"), result)
+
+    def test_search_pages_through_rank_ties(self):
+        print("test_search_pages_through_rank_ties")
+
+        tied_ids = {
+            str(Product.objects.create(description="Cabo usb", price=10, quantity=1, seller=self.seller).id)
+            for _ in range(5)
+        }
+
+        url = f"{self.base_url}?q=cabo&page_size=2"
+        retrieved_ids = []
+
+        while url:
+            data = self.client.get(url).json()
+            retrieved_ids += [product["id"] for product in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(5, len(retrieved_ids))
+        self.assertSetEqual(tied_ids, set(retrieved_ids))
+
+    def test_search_follows_description_updates(self):
+        print("test_search_follows_description_updates")
+
+        self.search("monitor")
+
+        product = self.products["Monitor ultrawide"]
+        product.description = "Monitor curvo"
+        product.save()
+
+        self.assertListEqual([], self.search("ultrawide"))
+        self.assertListEqual(["Monitor curvo"], self.search("curvo"))
+
+    def test_search_ignores_query_syntax(self):
+        print("test_search_ignores_query_syntax")
+
+        self.assertListEqual([], self.search('" OR *'))
+
+    def test_search_runs_only_the_search_query(self):
+        print("test_search_runs_only_the_search_query")
+
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.search("teclado")
+
+        # The catalog version the response is cached by, then the search.
+        self.assertEqual(2, len(queries))
+        self.assertIn("utils_generation", queries[0]["sql"])
+
+    @skipUnless(connection.vendor == "sqlite", "the SQLite index triggers are checked on SQLite only")
+    def test_dropped_triggers_are_installed_after_migrate(self):
+        print("test_dropped_triggers_are_installed_after_migrate")
+
+        with connection.cursor() as cursor:
+            for event in ("insert", "delete", "update"):
+                cursor.execute(f'DROP TRIGGER "products_product_fts_{event}"')
+
+        Product.objects.create(description="Cadeira gamer", price=10, quantity=1, seller=self.seller)
+        install_search_index(using="default")
+
+        self.assertListEqual(["Cadeira gamer"], self.search("cadeira"))
+
+        product = self.products["Monitor ultrawide"]
+        product.description = "Monitor curvo"
+        product.save()
+
+        self.assertListEqual(["Monitor curvo"], self.search("curvo"))
@@ -0,0 +1,68 @@
+import io
+
+from django.core.management import CommandError, call_command
+from rest_framework.test import APITestCase
+
+from accounts.models import Account
+from products.models import Product
+from products.seeding import STARTS_AT, SeedPlan, build_accounts, build_products
+
+class SeedCommandTest(APITestCase):
+    def seed(self, *args):
+        output = io.StringIO()
+        call_command("seed", *args, stdout=output)
+
+        return output.getvalue()
+
+    def test_seed_accounts_and_products(self):
+        print("test_seed_accounts_and_products")
+
+        output = self.seed("--accounts", "50", "--products", "300", "--seller-share", "0.2")
+
+        self.assertIn("Seeded 50 accounts and 300 products", output)
+        self.assertEqual(50, Account.objects.count())
+        self.assertEqual(10, Account.objects.filter(is_seller=True).count())
+        self.assertEqual(300, Product.objects.count())
+        self.assertFalse(Product.objects.filter(seller__is_seller=False).exists())
+
+        account = Account.objects.first()
+
+        self.assertTrue(account.check_password("1234"))
+        self.assertEqual(1, len(set(Account.objects.values_list("password", flat=True))))
+
+        # Timestamps are the generated ones, not the time of the insert.
+        self.assertFalse(Product.objects.filter(created_at__lt=STARTS_AT).exists())
+        self.assertEqual(0, Product.objects.filter(created_at__year__gte=2023).count())
+
+    def test_same_seed_gives_same_rows(self):
+        print("test_same_seed_gives_same_rows")
+
+        plan = SeedPlan(seed=7, accounts=40, products=100, seller_share=0.25)
+        other_plan = SeedPlan(seed=8, accounts=40, products=100, seller_share=0.25)
+
+        def rows(plan):
+            accounts = [(account.id, account.username, account.date_joined) for account in build_accounts(plan, 0, "")]
+            products = [
+                (product.id, product.description, product.price, product.seller_id)
+                for product in build_products(plan, 0)
+            ]
+
+            return accounts, products
+
+        self.assertEqual(rows(plan), rows(SeedPlan(seed=7, accounts=40, products=100, seller_share=0.25)))
+        self.assertNotEqual(rows(plan), rows(other_plan))
+
+    def test_seeding_twice_adds_nothing(self):
+        print("test_seeding_twice_adds_nothing")
+
+        self.seed("--accounts", "20", "--products", "50", "--seed", "3")
+        self.seed("--accounts", "20", "--products", "50", "--seed", "3")
+
+        self.assertEqual(20, Account.objects.count())
+        self.assertEqual(50, Product.objects.count())
+
+    def test_products_need_sellers(self):
+        print("test_products_need_sellers")
+
+        with self.assertRaises(CommandError):
+            self.seed("--accounts", "20", "--products", "50", "--seller-share", "0")
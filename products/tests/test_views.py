@@ -1,8 +1,13 @@
+import base64
+
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase, APIClient
 from rest_framework.views import status, Response
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from faker import Faker
 
@@ -216,4 +221,116 @@ class ProductDetailViewTest(APITestCase):
         expected_status_code = status.HTTP_200_OK
         result_status_code = response.status_code
 
-        self.assertEqual(expected_status_code, result_status_code)
\ No newline at end of file
+        self.assertEqual(expected_status_code, result_status_code)
+
+class ProductPaginationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.base_url = "/api/products/"
+
+        cls.fake = Faker()
+
+        seller_data = {
+            "username": "victo",
+            "password": "1234",
+            "first_name": "Victoria",
+            "last_name": "Viana",
+            "is_seller": True
+        }
+
+        seller = Account.objects.create_user(**seller_data)
+
+        cls.products = [
+            Product.objects.create(
+                description=cls.fake.sentence(nb_words=10, variable_nb_words=False),
+                price=cls.fake.pydecimal(left_digits=3, right_digits=2, positive=True),
+                quantity=cls.fake.pyint(min_value=1, max_value=20),
+                seller=seller
+            )
+            for _ in range(7)
+        ]
+
+    def setUp(self) -> None:
+        # Some tests reprice the products with a queryset update, which leaves
+        # the catalog version, and so the cached pages, as they were.
+        cache.clear()
+
+    def test_cursor_pages_cover_every_product_once(self):
+        print("test_cursor_pages_cover_every_product_once")
+
+        url = f"{self.base_url}?page_size=3"
+        retrieved_ids = []
+
+        while url:
+            response = self.client.get(url)
+            data = response.json()
+
+            self.assertLessEqual(len(data["results"]), 3)
+            retrieved_ids += [product["id"] for product in data["results"]]
+            url = data["next"]
+
+        expected_ids = [str(product.id) for product in sorted(self.products, key=lambda product: (product.created_at, product.id), reverse=True)]
+
+        self.assertListEqual(expected_ids, retrieved_ids)
+
+    def test_previous_cursor_returns_to_first_page(self):
+        print("test_previous_cursor_returns_to_first_page")
+
+        first_page = self.client.get(f"{self.base_url}?page_size=3").json()
+        second_page = self.client.get(first_page["next"]).json()
+        back_page = self.client.get(second_page["previous"]).json()
+
+        self.assertListEqual(first_page["results"], back_page["results"])
+
+    def test_pages_do_not_count_rows(self):
+        print("test_pages_do_not_count_rows")
+
+        first_page = self.client.get(f"{self.base_url}?page_size=3").json()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(first_page["next"])
+
+        self.assertNotIn("count", response.json())
+
+        for query in queries.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"].upper())
+
+    def test_ties_on_the_ordering_field_page_by_key(self):
+        print("test_ties_on_the_ordering_field_page_by_key")
+
+        Product.objects.filter(id__in=[product.id for product in self.products]).update(price=10)
+
+        url = f"{self.base_url}?ordering=price&page_size=2"
+        retrieved_ids = []
+
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                data = self.client.get(url).json()
+                retrieved_ids += [product["id"] for product in data["results"]]
+                url = data["next"]
+
+        self.assertListEqual(sorted(str(product.id) for product in self.products), retrieved_ids)
+
+        for query in queries.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"].upper())
+
+        first_page = self.client.get(f"{self.base_url}?ordering=price&page_size=5").json()
+        previous_page = self.client.get(self.client.get(first_page["next"]).json()["previous"]).json()
+
+        self.assertListEqual(first_page["results"], previous_page["results"])
+
+    def test_invalid_cursors_are_not_found(self):
+        print("test_invalid_cursors_are_not_found")
+
+        next_url = self.client.get(f"{self.base_url}?ordering=price&page_size=2").json()["next"]
+        cursor = next_url.split("cursor=")[1].split("&")[0]
+        tampered = base64.b64encode(b"o=0&p=abc&p=def").decode()
+
+        for url in [
+            f"{self.base_url}?ordering=created_at&page_size=2&cursor={cursor}",
+            f"{self.base_url}?page_size=2&cursor={tampered}",
+        ]:
+            response = self.client.get(url)
+
+            self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+            self.assertDictEqual({"detail": "Invalid cursor"}, response.json())
@@ -3,5 +3,11 @@ from . import views
 
 urlpatterns = (
     path("products/", views.ProductView.as_view()),
+    path("products/bulk/", views.ProductBulkView.as_view()),
+    path("products/export/", views.ProductExportView.as_view()),
+    path("products/changes/", views.ProductChangeView.as_view()),
     path("products/<pk>/", views.ProductDetailView.as_view()),
+    path("products/<uuid:pk>/reserve/", views.ProductReserveView.as_view()),
+    path("async/products/", views.ProductAsyncView.as_view()),
+    path("async/products/<pk>/", views.ProductAsyncDetailView.as_view()),
 )
\ No newline at end of file
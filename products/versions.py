@@ -0,0 +1,51 @@
+from django.utils.http import parse_etags, quote_etag
+
+from utils.generations import aget_generation, bump_generation, get_generation, query_digest
+
+CATALOG_VERSION_KEY = "products:catalog-version"
+
+# Cached list pages are keyed by the catalog version, bumped once a write to
+# any product commits (see ProductChangeQuerySet.record()). Product details
+# are keyed by the version of the product itself, which every write bumps
+# along with the row, and by the version of its seller (see Account.version).
+
+
+def get_catalog_version() -> int:
+    return get_generation(CATALOG_VERSION_KEY)
+
+
+async def aget_catalog_version() -> int:
+    return await aget_generation(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version(using="default"):
+    bump_generation(CATALOG_VERSION_KEY, using=using)
+
+
+def catalog_etag(request, catalog_version: int) -> str:
+    return quote_etag(f"{catalog_version}-{query_digest(request)}")
+
+
+def product_etag(request, version: int, seller_version: int) -> str:
+    # Sparse fieldsets are other representations of the same version.
+    if "fields" in request.query_params or "expand" in request.query_params:
+        return quote_etag(
+            f"{version}.{seller_version}.{request.accepted_renderer.format}.{query_digest(request)[:8]}"
+        )
+
+    return quote_etag(f"{version}.{seller_version}.{request.accepted_renderer.format}")
+
+
+def is_not_modified(request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    etags = {etag.removeprefix("W/") for etag in parse_etags(request.headers.get("If-None-Match", ""))}
+
+    return "*" in etags or etag in etags
+
+
+def matches_version(request, version: int) -> bool:
+    # Any representation of the product matches, whatever its format or the
+    # version of its seller, which writes to the product never change.
+    versions = {etag.strip('"').split(".")[0] for etag in parse_etags(request.headers["If-Match"])}
+
+    return "*" in versions or str(version) in versions
@@ -1,28 +1,332 @@
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateAPIView
-from utils.mixins import SerializerByMethodMixin
+from datetime import timedelta
 
-from .models import Product
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListAPIView, ListCreateAPIView, RetrieveUpdateAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import Request, Response, status
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema, extend_schema_view
+from utils.generations import query_digest
+from utils.mixins import CachedResponseMixin, SerializerByMethodMixin, SparseFieldsetMixin, ValuesListMixin
+from utils.schema import fieldset_parameters
+from utils.serializers import ValuesSerializer
+from utils.views import AsyncListView, AsyncRetrieveView
 
-from .serializers import ProductSerializer, ProductDetailSerializer
+from accounts.serializers import ACCOUNT_READ_FIELDS
+
+from .export import export_rows
+from .filters import ProductFilter, ProductOrderingFilter, ProductSearchFilter
+from .models import Product, ProductChange
+from .pagination import ProductChangePagination, ProductPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .versions import (
+    aget_catalog_version,
+    catalog_etag,
+    get_catalog_version,
+    is_not_modified,
+    matches_version,
+    product_etag,
+)
+
+from .serializers import (
+    ProductSerializer,
+    ProductDetailSerializer,
+    ProductBulkUpdateSerializer,
+    ProductBulkUpdateResultSerializer,
+    ProductReserveSerializer,
+    ProductFilterSerializer,
+    ProductChangeSerializer,
+)
 
 from .permissions import IsSellerOrReadOnly, IsSellerUser
 
 
-class ProductView(SerializerByMethodMixin, ListCreateAPIView):
+@extend_schema_view(get=extend_schema(parameters=fieldset_parameters(expandable=["seller"])))
+class ProductView(
+    CachedResponseMixin, SerializerByMethodMixin, SparseFieldsetMixin, ValuesListMixin, ListCreateAPIView
+):
     permission_classes = [IsSellerOrReadOnly]
+    pagination_class = ProductPagination
+    filter_backends = [ProductFilter, ProductSearchFilter, ProductOrderingFilter]
+    ordering = ("-created_at", "-id")
 
     queryset = Product.objects.all()
     serializer_map = {
         "GET": ProductSerializer,
         "POST": ProductDetailSerializer,
     }
+    values_serializer = ValuesSerializer(ProductSerializer)
+
+    def get_response_cache_key(self, request):
+        return f"products:list:{self.catalog_version}:{query_digest(request)}"
+
+    def get_stale_cache_key(self, request):
+        return f"products:list-stale:{query_digest(request)}"
+
+    def list(self, request, *args, **kwargs):
+        # Read before the query, so a write racing with it can only make the
+        # ETag and the cache key older than the page, never newer.
+        self.catalog_version = get_catalog_version()
+        etag = catalog_etag(request, self.catalog_version)
+
+        if is_not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        cached_response = self.get_cached_response(request)
+
+        if cached_response:
+            return cached_response
+
+        response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+
+        return response
 
     def perform_create(self, serializer):
 
         serializer.save(seller=self.request.user)
 
-class ProductDetailView(RetrieveUpdateAPIView):
+class ProductChangeView(ListAPIView):
+    pagination_class = ProductChangePagination
+
+    queryset = ProductChange.objects.select_related("product")
+    serializer_class = ProductChangeSerializer
+
+    def get_queryset(self):
+        # Entries are logged last thing in their transaction, so once one is
+        # SETTLE_SECONDS old it and every entry with a smaller id had time to
+        # commit: a client that read past an id never misses one.
+        settled_at = timezone.now() - timedelta(seconds=settings.PRODUCTS_CHANGES["SETTLE_SECONDS"])
+
+        return super().get_queryset().filter(changed_at__lte=settled_at)
+
+class ProductExportView(GenericAPIView):
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    filter_backends = [ProductFilter]
+    pagination_class = None
+
+    queryset = Product.objects.all()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("format", enum=["ndjson", "csv"], description="Export format, ndjson by default."),
+            ProductFilterSerializer,
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR, (200, "text/csv"): OpenApiTypes.STR},
+    )
+    def get(self, request: Request) -> StreamingHttpResponse:
+        renderer = request.accepted_renderer
+        rows = export_rows(self.filter_queryset(self.get_queryset()))
+
+        response = StreamingHttpResponse(
+            renderer.encode_rows(rows), content_type=f"{renderer.media_type}; charset={renderer.charset}"
+        )
+        response["Content-Disposition"] = f'attachment; filename="products.{renderer.format}"'
+
+        return response
+
+@extend_schema_view(get=extend_schema(parameters=fieldset_parameters(expandable=["seller"])))
+class ProductDetailView(CachedResponseMixin, SparseFieldsetMixin, RetrieveUpdateAPIView):
     permission_classes = [IsSellerUser]
 
+    queryset = Product.objects.select_related("seller").only(
+        *ProductDetailSerializer.Meta.fields,
+        "version",
+        "seller__version",
+        *(f"seller__{field}" for field in ACCOUNT_READ_FIELDS),
+    )
+    serializer_class = ProductDetailSerializer
+
+    def get_queryset(self):
+        return self.narrow_queryset(super().get_queryset(), "version")
+
+    def get_version(self, lock=False):
+        products = Product.objects.select_for_update() if lock else Product.objects.all()
+
+        try:
+            return products.filter(pk=self.kwargs["pk"]).values_list("version", flat=True).first()
+        except DjangoValidationError:
+            return None
+
+    def get_versions(self):
+        # The product is rendered with its seller, so (product version, seller
+        # version) identifies the payload.
+        try:
+            return Product.objects.filter(pk=self.kwargs["pk"]).values_list("version", "seller__version").first()
+        except DjangoValidationError:
+            return None
+
+    def get_response_cache_key(self, request):
+        if self.versions is None:
+            return None
+
+        version, seller_version = self.versions
+
+        return f"products:detail:{self.kwargs['pk']}:{version}:{seller_version}:{query_digest(request)}"
+
+    def retrieve(self, request, *args, **kwargs):
+        # The one lookup a cached or unchanged product costs. Read before the
+        # product, so a write racing with it can only make the ETag and the
+        # cache key older than the payload, never newer.
+        self.versions = self.get_versions()
+
+        if self.versions is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = product_etag(request, *self.versions)
+
+        if is_not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        cached_response = self.get_cached_response(request)
+
+        if cached_response:
+            return cached_response
+
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+
+        return Response(serializer.data, headers={"ETag": etag})
+
+    def update(self, request, *args, **kwargs):
+        if "If-Match" not in request.headers:
+            return self.update_product(request, partial=kwargs.get("partial", False))
+
+        # The row stays locked from the version check until the update, and a
+        # stale version is rejected before the product is loaded at all.
+        with transaction.atomic():
+            version = self.get_version(lock=True)
+
+            if version is not None and not matches_version(request, version):
+                return Response(
+                    {"detail": "product was changed by another request"}, status=status.HTTP_412_PRECONDITION_FAILED
+                )
+
+            return self.update_product(request, partial=kwargs.get("partial", False))
+
+    def update_product(self, request, partial):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        return Response(
+            serializer.data, headers={"ETag": product_etag(request, instance.version, instance.seller.version)}
+        )
+
+class ProductBulkView(SerializerByMethodMixin, CreateAPIView):
+    permission_classes = [IsAuthenticated, IsSellerOrReadOnly]
+    parser_classes = [JSONParser]
+    pagination_class = None
+
+    serializer_map = {
+        "POST": ProductDetailSerializer,
+        "PATCH": ProductBulkUpdateSerializer,
+    }
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs["many"] = True
+
+        return super().get_serializer(*args, **kwargs)
+
+    def check_item_limit(self, request):
+        max_items = settings.PRODUCTS_BULK["MAX_ITEMS"]
+
+        if isinstance(request.data, list) and len(request.data) > max_items:
+            raise ValidationError({"detail": f"at most {max_items} products can be changed at once"})
+
+    def create(self, request, *args, **kwargs):
+        self.check_item_limit(request)
+
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+
+        serializer.save(seller=self.request.user)
+
+    @extend_schema(responses=ProductBulkUpdateResultSerializer)
+    def patch(self, request, *args, **kwargs):
+        self.check_item_limit(request)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        changes = serializer.validated_data
+
+        updated_ids = set(Product.objects.filter(seller=request.user).apply_updates(
+            changes, batch_size=settings.PRODUCTS_BULK["BATCH_SIZE"]
+        ))
+
+        result = ProductBulkUpdateResultSerializer({
+            "updated": [change["id"] for change in changes if change["id"] in updated_ids],
+            "not_found": [change["id"] for change in changes if change["id"] not in updated_ids],
+        })
+
+        return Response(result.data)
+
+class ProductReserveView(GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser]
+    pagination_class = None
+
+    queryset = Product.objects.all()
+    serializer_class = ProductReserveSerializer
+
+    @extend_schema(responses={
+        200: ProductReserveSerializer,
+        404: OpenApiResponse(description="product not found"),
+        409: OpenApiResponse(description="insufficient stock"),
+    })
+    def post(self, request: Request, pk) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        quantity = serializer.validated_data["quantity"]
+
+        if Product.objects.reserve(pk, quantity):
+            return Response({"quantity": quantity})
+
+        # Only the failure path looks the product up, to tell apart a missing
+        # product from one without enough stock.
+        if not Product.objects.filter(id=pk, is_active=True).exists():
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({"detail": "insufficient stock"}, status=status.HTTP_409_CONFLICT)
+
+class ProductAsyncView(AsyncListView):
+    filter_backends = ProductView.filter_backends
+    pagination_class = ProductPagination
+    ordering = ProductView.ordering
+
     queryset = Product.objects.all()
-    serializer_class = ProductDetailSerializer
\ No newline at end of file
+    serializer_class = ProductSerializer
+
+    async def get(self, request, *args, **kwargs):
+        etag = catalog_etag(request, await aget_catalog_version())
+
+        if is_not_modified(request, etag):
+            return self.render(None, status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response = await super().get(request, *args, **kwargs)
+        response["ETag"] = etag
+
+        return response
+
+class ProductAsyncDetailView(AsyncRetrieveView):
+    queryset = ProductDetailView.queryset
+    serializer_class = ProductDetailSerializer
+
+    async def get(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        etag = product_etag(request, instance.version, instance.seller.version)
+
+        if is_not_modified(request, etag):
+            return self.render(None, status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        return self.render(self.serializer_class(instance).data, headers={"ETag": etag})
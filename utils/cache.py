@@ -0,0 +1,288 @@
+import contextlib
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+
+# File layout: a header, one CLOCK hand per bucket, then the slots. Each key
+# hashes to a bucket of WAYS slots and can only live there, so every
+# operation touches (and locks) a single bucket.
+FILE_HEADER = struct.Struct("<8sIII")
+FILE_MAGIC = b"KMCACHE1"
+
+# used, referenced, key length, value length, expiry (0 for never).
+SLOT_HEADER = struct.Struct("<BBHId")
+
+WAYS = 8
+
+# fcntl locks belong to the process, so threads also take one of these first.
+# They are shared by every instance, since Django builds one per thread.
+thread_locks = [threading.Lock() for _ in range(64)]
+mappings = {}
+mappings_lock = threading.Lock()
+
+
+def default_location():
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+    return os.path.join(directory, "komercio-cache")
+
+
+# A cache shared by every process on the machine, kept in a memory-mapped file
+# of fixed-size slots. Values that do not fit in a slot are not cached, and
+# full buckets evict with the CLOCK algorithm. OPTIONS: MAX_ENTRIES is the
+# number of slots, SLOT_SIZE their size in bytes. The layout is part of the
+# file name, so caches (and workers) configured differently never map the
+# same file.
+class SharedMemoryCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+
+        options = params.get("OPTIONS", {})
+
+        self.buckets = max(1, self._max_entries // WAYS)
+        self.slot_size = int(options.get("SLOT_SIZE", 4096))
+        self.path = f"{location or default_location()}-{self.buckets}x{WAYS}x{self.slot_size}"
+        self.slots_offset = FILE_HEADER.size + self.buckets
+        self.size = self.slots_offset + self.buckets * WAYS * self.slot_size
+
+    def get_mapping(self):
+        # Mappings are reopened after a fork, gunicorn workers must not share
+        # the parent's file descriptor (fcntl locks are tied to the process).
+        key = (self.path, os.getpid())
+
+        with mappings_lock:
+            if key not in mappings:
+                mappings[key] = self.open_mapping()
+
+            return mappings[key]
+
+    def open_mapping(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        header = FILE_HEADER.pack(FILE_MAGIC, self.buckets, WAYS, self.slot_size)
+
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+
+        try:
+            # The first process formats the file. Anything else found there is
+            # never truncated in place, other processes may still have it mapped.
+            if os.fstat(fd).st_size == 0:
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, header, 0)
+
+            formatted = os.fstat(fd).st_size == self.size and os.pread(fd, FILE_HEADER.size, 0) == header
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+
+        if not formatted:
+            os.close(fd)
+
+            raise ImproperlyConfigured(f"{self.path} is not a cache file of this layout, remove it.")
+
+        return fd, mmap.mmap(fd, self.size)
+
+    @contextlib.contextmanager
+    def locked_bucket(self, bucket):
+        fd, memory = self.get_mapping()
+        start = self.slots_offset + bucket * WAYS * self.slot_size
+        length = WAYS * self.slot_size
+
+        with thread_locks[bucket % len(thread_locks)]:
+            fcntl.lockf(fd, fcntl.LOCK_EX, length, start)
+
+            try:
+                yield memory
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, length, start)
+
+    def bucket_of(self, key: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") % self.buckets
+
+    def slot_offset(self, bucket, way):
+        return self.slots_offset + (bucket * WAYS + way) * self.slot_size
+
+    def find(self, memory, bucket, key: bytes, now):
+        free_way = None
+
+        for way in range(WAYS):
+            offset = self.slot_offset(bucket, way)
+            used, _, key_length, _, expires = SLOT_HEADER.unpack_from(memory, offset)
+
+            if used and expires and expires <= now:
+                memory[offset] = 0
+                used = 0
+
+            if not used:
+                if free_way is None:
+                    free_way = way
+            elif memory[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + key_length] == key:
+                return way, free_way
+
+        return None, free_way
+
+    def evict(self, memory, bucket):
+        hand_offset = FILE_HEADER.size + bucket
+
+        # CLOCK: referenced slots get a second chance, the first one that was
+        # not read since the hand last passed is replaced.
+        while True:
+            way = memory[hand_offset]
+            memory[hand_offset] = (way + 1) % WAYS
+
+            referenced_offset = self.slot_offset(bucket, way) + 1
+
+            if not memory[referenced_offset]:
+                return way
+
+            memory[referenced_offset] = 0
+
+    def read_value(self, memory, bucket, way):
+        offset = self.slot_offset(bucket, way)
+        _, _, key_length, value_length, _ = SLOT_HEADER.unpack_from(memory, offset)
+        start = offset + SLOT_HEADER.size + key_length
+
+        memory[offset + 1] = 1
+
+        return memory[start:start + value_length]
+
+    def write_slot(self, memory, bucket, way, key: bytes, value: bytes, expires):
+        offset = self.slot_offset(bucket, way)
+        start = offset + SLOT_HEADER.size
+
+        memory[start:start + len(key)] = key
+        memory[start + len(key):start + len(key) + len(value)] = value
+        SLOT_HEADER.pack_into(memory, offset, 1, 1, len(key), len(value), expires)
+
+    def encode_key(self, key, version):
+        return self.make_and_validate_key(key, version=version).encode()
+
+    def get_expiry(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+
+        return 0 if timeout is None else timeout
+
+    def fits(self, key: bytes, value: bytes):
+        return SLOT_HEADER.size + len(key) + len(value) <= self.slot_size
+
+    def store(self, key, value, timeout, version, only_if_missing):
+        key = self.encode_key(key, version)
+        value = pickle.dumps(value, self.pickle_protocol)
+        bucket = self.bucket_of(key)
+
+        with self.locked_bucket(bucket) as memory:
+            way, free_way = self.find(memory, bucket, key, time.time())
+
+            if way is not None and only_if_missing:
+                return False
+
+            if not self.fits(key, value):
+                # Too big to cache; never leave an older value behind.
+                if way is not None:
+                    memory[self.slot_offset(bucket, way)] = 0
+
+                return False
+
+            if way is None:
+                way = free_way if free_way is not None else self.evict(memory, bucket)
+
+            self.write_slot(memory, bucket, way, key, value, self.get_expiry(timeout))
+
+        return True
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.store(key, value, timeout, version, only_if_missing=True)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.store(key, value, timeout, version, only_if_missing=False)
+
+    def get(self, key, default=None, version=None):
+        key = self.encode_key(key, version)
+        bucket = self.bucket_of(key)
+
+        with self.locked_bucket(bucket) as memory:
+            way, _ = self.find(memory, bucket, key, time.time())
+
+            if way is None:
+                return default
+
+            value = self.read_value(memory, bucket, way)
+
+        return pickle.loads(value)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.encode_key(key, version)
+        bucket = self.bucket_of(key)
+
+        with self.locked_bucket(bucket) as memory:
+            way, _ = self.find(memory, bucket, key, time.time())
+
+            if way is None:
+                return False
+
+            struct.pack_into("<d", memory, self.slot_offset(bucket, way) + 8, self.get_expiry(timeout))
+
+        return True
+
+    def delete(self, key, version=None):
+        key = self.encode_key(key, version)
+        bucket = self.bucket_of(key)
+
+        with self.locked_bucket(bucket) as memory:
+            way, _ = self.find(memory, bucket, key, time.time())
+
+            if way is None:
+                return False
+
+            memory[self.slot_offset(bucket, way)] = 0
+
+        return True
+
+    def has_key(self, key, version=None):
+        return self.get(key, self._missing_key, version=version) is not self._missing_key
+
+    def incr(self, key, delta=1, version=None):
+        # Read and write under the same lock, unlike BaseCache.incr(), so
+        # concurrent increments from any process are never lost.
+        key = self.encode_key(key, version)
+        bucket = self.bucket_of(key)
+
+        with self.locked_bucket(bucket) as memory:
+            way, _ = self.find(memory, bucket, key, time.time())
+
+            if way is None:
+                raise ValueError("Key '%s' not found" % key.decode())
+
+            _, _, _, _, expires = SLOT_HEADER.unpack_from(memory, self.slot_offset(bucket, way))
+            new_value = pickle.loads(self.read_value(memory, bucket, way)) + delta
+            value = pickle.dumps(new_value, self.pickle_protocol)
+
+            if not self.fits(key, value):
+                raise ValueError("Key '%s' no longer fits in a cache slot" % key.decode())
+
+            self.write_slot(memory, bucket, way, key, value, expires)
+
+        return new_value
+
+    def clear(self):
+        fd, memory = self.get_mapping()
+
+        with contextlib.ExitStack() as stack:
+            for lock in thread_locks:
+                stack.enter_context(lock)
+
+            fcntl.lockf(fd, fcntl.LOCK_EX, self.size - FILE_HEADER.size, FILE_HEADER.size)
+
+            try:
+                memory[FILE_HEADER.size:] = bytes(self.size - FILE_HEADER.size)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, self.size - FILE_HEADER.size, FILE_HEADER.size)
@@ -0,0 +1,43 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+from .models import Generation
+
+# Counters that cached responses are keyed by. Writes bump them instead of
+# deleting the cached responses, which then simply stop being read. A missing
+# counter starts from the clock, so a fresh database never hands out a value
+# that responses still cached from an older one were stored under.
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE["ALIAS"]]
+
+
+def get_generation(key) -> int:
+    generation, _ = Generation.objects.get_or_create(key=key, defaults={"value": time.time_ns()})
+
+    return generation.value
+
+
+async def aget_generation(key) -> int:
+    generation, _ = await Generation.objects.aget_or_create(key=key, defaults={"value": time.time_ns()})
+
+    return generation.value
+
+
+def bump_generation(key, using="default"):
+    generations = Generation.objects.using(using)
+
+    if not generations.filter(key=key).update(value=F("value") + 1):
+        generations.get_or_create(key=key, defaults={"value": time.time_ns()})
+
+
+def query_digest(request) -> str:
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+
+    return hashlib.sha1(f"{request.accepted_renderer.format}?{query}".encode()).hexdigest()[:16]
@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+import uuid
+
+# UUIDv7 (RFC 9562): a 48-bit Unix timestamp in milliseconds, then random
+# bits. Keys made one after the other sort one after the other, so inserts
+# append to the right edge of the primary key index instead of splitting
+# pages all over it.
+#
+# The 12 bits after the timestamp count ids made in the same millisecond,
+# starting from a random value, so ids from one process are strictly
+# increasing.
+
+lock = threading.Lock()
+last_timestamp = 0
+counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    global last_timestamp, counter
+
+    with lock:
+        timestamp = time.time_ns() // 1_000_000
+
+        if timestamp > last_timestamp:
+            last_timestamp = timestamp
+            counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            # Same millisecond, or the clock went back: keep counting on the
+            # last timestamp and move to the next one if the counter overflows.
+            counter += 1
+
+            if counter > 0xFFF:
+                last_timestamp += 1
+                counter = 0
+
+        timestamp = last_timestamp
+        sequence = counter
+
+    return make_uuid7(timestamp, sequence, int.from_bytes(os.urandom(8), "big"))
+
+
+# The UUIDv7 of the given millisecond timestamp, 12-bit sequence and random
+# bits (only the low 62 are used).
+def make_uuid7(timestamp: int, sequence: int, random_bits: int) -> uuid.UUID:
+    value = timestamp << 80 | 0x7 << 76 | (sequence & 0xFFF) << 64 | 0b10 << 62 | random_bits & 0x3FFFFFFFFFFFFFFF
+
+    return uuid.UUID(int=value)
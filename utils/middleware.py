@@ -0,0 +1,116 @@
+import asyncio
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.module_loading import import_string
+
+
+def adapt(method, is_async, method_is_async=None):
+    if method_is_async is None:
+        method_is_async = asyncio.iscoroutinefunction(method)
+
+    if is_async and not method_is_async:
+        return sync_to_async(method, thread_sensitive=True)
+
+    if not is_async and method_is_async:
+        return async_to_sync(method)
+
+    return method
+
+
+# What BaseHandler.load_middleware() builds from settings.MIDDLEWARE, for any
+# list of middleware in front of get_response.
+class MiddlewareChain:
+    def __init__(self, paths, get_response, is_async):
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler, handler_is_async = get_response, is_async
+
+        for path in reversed(paths):
+            middleware = import_string(path)
+            can_sync = getattr(middleware, "sync_capable", True)
+            middleware_is_async = getattr(middleware, "async_capable", False) and (handler_is_async or not can_sync)
+
+            try:
+                instance = middleware(adapt(handler, middleware_is_async, handler_is_async))
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(instance, "process_view"):
+                self.view_middleware.insert(0, adapt(instance.process_view, is_async))
+
+            if hasattr(instance, "process_template_response"):
+                self.template_response_middleware.append(adapt(instance.process_template_response, is_async))
+
+            if hasattr(instance, "process_exception"):
+                self.exception_middleware.append(adapt(instance.process_exception, False))
+
+            handler, handler_is_async = convert_exception_to_response(instance), middleware_is_async
+
+        self.handler = adapt(handler, is_async, handler_is_async)
+
+
+# The only entry of MIDDLEWARE. Runs each request through the chain of the
+# first MIDDLEWARE_ROUTES prefix its path starts with, and forwards the view,
+# template response and exception hooks to the middleware of that chain.
+class RoutedMiddleware(MiddlewareMixin):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+
+        is_async = bool(self._is_coroutine)
+
+        if not any(prefix == "" for prefix, _ in settings.MIDDLEWARE_ROUTES):
+            raise ImproperlyConfigured("MIDDLEWARE_ROUTES needs a route with an empty prefix, for any other path.")
+
+        self.routes = [
+            (prefix, MiddlewareChain(paths, get_response, is_async)) for prefix, paths in settings.MIDDLEWARE_ROUTES
+        ]
+
+        if is_async:
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        for prefix, chain in self.routes:
+            if request.path_info.startswith(prefix):
+                request.middleware_chain = chain
+
+                return chain.handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        for process_view in request.middleware_chain.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+
+            if response:
+                return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        for process_view in request.middleware_chain.view_middleware:
+            response = await process_view(request, view_func, view_args, view_kwargs)
+
+            if response:
+                return response
+
+    def process_template_response(self, request, response):
+        for process_template_response in request.middleware_chain.template_response_middleware:
+            response = process_template_response(request, response)
+
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        for process_template_response in request.middleware_chain.template_response_middleware:
+            response = await process_template_response(request, response)
+
+        return response
+
+    def process_exception(self, request, exception):
+        for process_exception in request.middleware_chain.exception_middleware:
+            response = process_exception(request, exception)
+
+            if response:
+                return response
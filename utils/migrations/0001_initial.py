@@ -0,0 +1,23 @@
+# Generated by Django 4.1 on 2026-10-18 21:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Generation",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("value", models.BigIntegerField()),
+            ],
+        ),
+    ]
@@ -1,3 +1,217 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .generations import get_response_cache
+from .serializers import ValuesSerializer
+
+
 class SerializerByMethodMixin:
     def get_serializer_class(self, *args, **kwargs):
-        return self.serializer_map.get(self.request.method, self.get_serializer_class)
\ No newline at end of file
+        return self.serializer_map.get(self.request.method, self.get_serializer_class)
+
+
+# ListModelMixin.list() over .values() rows, serialized by values_serializer
+# into the same JSON get_serializer() would give, without building a model
+# instance per row. Annotations (like the search rank) and the pagination
+# ordering stay in the rows, so the pagination can order by them.
+class ValuesListMixin:
+    values_serializer = None
+
+    def get_values_serializer(self):
+        return self.values_serializer
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        ordering = ()
+
+        if self.paginator is not None and hasattr(self.paginator, "get_ordering"):
+            ordering = [field.lstrip("-") for field in self.paginator.get_ordering(request, queryset, self)]
+
+        queryset = queryset.values(*dict.fromkeys([*values_serializer.sources, *ordering, *queryset.query.annotations]))
+
+        page = self.paginate_queryset(queryset)
+
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+
+        return Response(values_serializer.serialize(queryset))
+
+
+def split_parameter(value: str) -> list:
+    return list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+
+
+# ?fields=a,b renders only those fields in GET responses and ?expand=a renders
+# a with its nested serializer from Meta.expandable_fields (see
+# utils.serializers.FieldsetSerializerMixin). The query is narrowed to match,
+# through get_values_serializer() for lists and narrow_queryset() otherwise.
+class SparseFieldsetMixin:
+    fieldset = None
+
+    def get_fieldset(self) -> dict:
+        if self.request.method not in SAFE_METHODS:
+            return {}
+
+        if self.fieldset is not None:
+            return self.fieldset
+
+        fields = split_parameter(self.request.query_params.get("fields", ""))
+        expand = split_parameter(self.request.query_params.get("expand", ""))
+        self.fieldset = {}
+
+        if not fields and not expand:
+            return self.fieldset
+
+        serializer_class = self.get_serializer_class()
+        readable = [name for name, field in serializer_class().fields.items() if not field.write_only]
+        expandable = getattr(serializer_class.Meta, "expandable_fields", {})
+        errors = {}
+
+        if any(name not in readable for name in fields):
+            errors["fields"] = [f"unknown field {name}" for name in fields if name not in readable]
+
+        if any(name not in expandable for name in expand):
+            errors["expand"] = [f"{name} cannot be expanded" for name in expand if name not in expandable]
+
+        if errors:
+            raise ValidationError(errors)
+
+        self.fieldset = {"expand": expand}
+
+        if fields:
+            self.fieldset["fields"] = fields
+
+        return self.fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, **{**self.get_fieldset(), **kwargs})
+
+    def get_values_serializer(self):
+        fieldset = self.get_fieldset()
+
+        if not fieldset:
+            return super().get_values_serializer()
+
+        return ValuesSerializer(self.get_serializer_class(), **fieldset)
+
+    def narrow_queryset(self, queryset, *fields):
+        fieldset = self.get_fieldset()
+
+        if not fieldset:
+            return queryset
+
+        return ValuesSerializer(self.get_serializer_class(), **fieldset).narrow(queryset, *fields)
+
+
+class CachedResponseMixin:
+    # Stores rendered GET responses under get_response_cache_key(), so a hit
+    # skips the queryset, the serializer and the renderer. Keys must change
+    # whenever the data behind them does; nothing is deleted on writes.
+    #
+    # Misses are single-flight: one request (in any thread or worker) takes a
+    # lock in the cache and rebuilds the response, while identical requests
+    # get the last response built for them from get_stale_cache_key(), or
+    # wait for the new one.
+    cached_formats = ("json",)
+    cached_headers = ("Content-Type", "ETag")
+    response_cache_key = None
+    response_cache_lock = None
+
+    def get_response_cache_key(self, request):
+        raise NotImplementedError
+
+    def get_stale_cache_key(self, request):
+        return None
+
+    def get_cached_response(self, request):
+        # Other formats, like the browsable API, render per user.
+        if request.accepted_renderer.format not in self.cached_formats:
+            return None
+
+        self.response_cache_key = self.get_response_cache_key(request)
+
+        if self.response_cache_key is None:
+            return None
+
+        cache = get_response_cache()
+        cached = cache.get(self.response_cache_key)
+
+        if cached is None:
+            cached = self.wait_for_response(request)
+
+        if cached is None:
+            return None
+
+        content, headers = cached
+
+        return HttpResponse(content, headers=headers)
+
+    def wait_for_response(self, request):
+        cache = get_response_cache()
+        lock = f"{self.response_cache_key}:lock"
+        token = uuid.uuid4().hex
+
+        if cache.add(lock, token, timeout=settings.RESPONSE_CACHE["LOCK_TIMEOUT"]):
+            self.response_cache_lock = (lock, token)
+            return None
+
+        stale_key = self.get_stale_cache_key(request)
+        stale = cache.get(stale_key) if stale_key else None
+
+        if stale is not None:
+            return stale
+
+        deadline = time.monotonic() + settings.RESPONSE_CACHE["LOCK_WAIT"]
+
+        while time.monotonic() < deadline:
+            time.sleep(settings.RESPONSE_CACHE["LOCK_POLL_INTERVAL"])
+
+            cached = cache.get(self.response_cache_key)
+
+            if cached is not None:
+                return cached
+
+            # The request that held the lock failed, so this one takes over.
+            if cache.add(lock, token, timeout=settings.RESPONSE_CACHE["LOCK_TIMEOUT"]):
+                self.response_cache_lock = (lock, token)
+                return None
+
+        return None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        if self.response_cache_key and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+
+            cache = get_response_cache()
+            headers = {header: response[header] for header in self.cached_headers if header in response}
+            timeout = settings.RESPONSE_CACHE["TIMEOUT"]
+
+            cache.set(self.response_cache_key, (response.content, headers), timeout=timeout)
+
+            stale_key = self.get_stale_cache_key(request)
+
+            if stale_key:
+                cache.set(stale_key, (response.content, headers), timeout=timeout)
+
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self.response_cache_lock:
+                lock, token = self.response_cache_lock
+
+                # Only release the lock if it did not expire and pass to another request meanwhile.
+                if get_response_cache().get(lock) == token:
+                    get_response_cache().delete(lock)
@@ -0,0 +1,9 @@
+from django.db import models
+
+
+class Generation(models.Model):
+    # Counters that cached responses and ETags are keyed by, see
+    # utils.generations. They live in the database so every node and every
+    # cache backend sees the same values.
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField()
@@ -0,0 +1,164 @@
+from base64 import b64decode
+from urllib import parse
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+# CursorPagination keyed on the whole ordering instead of its first field.
+# The cursor holds the values of every ordering field of the row it points
+# at, and the ordering always ends with a unique field (the views append the
+# id), so a page is the rows past that key: one range scan of the matching
+# (field, id) index, whatever page it is and however many rows tie on the
+# first field. No offsets are ever used.
+class KeysetPagination(CursorPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    # CursorPagination.paginate_queryset() split around the one query it
+    # runs, so async views can run it with the async ORM.
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+
+        if queryset is None:
+            return None
+
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+
+        if queryset is None:
+            return None
+
+        return self.set_page([item async for item in queryset])
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None
+
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("ascii"), keep_blank_values=True)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        position = tokens.get("p")
+
+        if position is None or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def get_ordering_field(self, queryset, name):
+        # Ordering fields are model fields or annotations, like the search rank.
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+
+        return queryset.model._meta.get_field(name)
+
+    def parse_position(self, queryset, position: list) -> list:
+        # A tampered cursor, or one made for another ?ordering=, holds values
+        # the ordering fields do not take.
+        try:
+            return [
+                self.get_ordering_field(queryset, order.lstrip("-")).to_python(value)
+                for order, value in zip(self.ordering, position)
+            ]
+        except (FieldDoesNotExist, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, instance) -> list:
+        return [
+            str(instance[field] if isinstance(instance, dict) else getattr(instance, field))
+            for field in (order.lstrip("-") for order in self.ordering)
+        ]
+
+    def get_keyset_filter(self, position: list, reverse: bool) -> Q:
+        # (a, b, id) past (x, y, z) is a past x, or a = x and b past y, or
+        # a = x and b = y and id past z, "past" following each field's
+        # direction.
+        keyset_filter = Q()
+        equal = {}
+
+        for order, value in zip(self.ordering, position):
+            field = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") != reverse else "gt"
+
+            keyset_filter |= Q(**equal, **{f"{field}__{lookup}": value})
+            equal[field] = value
+
+        return keyset_filter
+
+    def get_page_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            self.reverse, self.current_position = False, None
+        else:
+            self.reverse = self.cursor.reverse
+            self.current_position = self.parse_position(queryset, self.cursor.position)
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            # The bound on the first field alone is redundant, but it is the
+            # index condition the planner can use to start the range scan.
+            first = self.ordering[0]
+            lookup = "lte" if first.startswith("-") != self.reverse else "gte"
+
+            queryset = queryset.filter(
+                Q(**{f"{first.lstrip('-')}__{lookup}": self.current_position[0]}),
+                self.get_keyset_filter(self.current_position, self.reverse),
+            )
+
+        # One extra item tells whether a page follows this one.
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+
+        if self.reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = self.current_position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.current_position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        position = self.get_position(self.page[-1]) if self.page else self.current_position
+
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        position = self.get_position(self.page[0]) if self.page else self.current_position
+
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
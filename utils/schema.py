@@ -0,0 +1,81 @@
+import gzip
+import hashlib
+import re
+import threading
+
+import yaml
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+accepts_gzip = re.compile(r"\bgzip\b")
+
+# Rendered schemas by renderer class, as (content, gzipped content, ETag).
+rendered_schemas = {}
+rendered_schemas_lock = threading.Lock()
+
+
+# Query parameters of views with utils.mixins.SparseFieldsetMixin.
+def fieldset_parameters(expandable=()) -> list:
+    parameters = [OpenApiParameter("fields", str, description="Comma-separated names of the only fields to return.")]
+
+    if expandable:
+        parameters.append(OpenApiParameter(
+            "expand", str, description=f"Comma-separated fields to return nested: {', '.join(expandable)}."
+        ))
+
+    return parameters
+
+
+def load_schema(view) -> dict:
+    if settings.API_SCHEMA["MODE"] == "file":
+        with open(settings.API_SCHEMA["FILE"], "rb") as file:
+            return yaml.safe_load(file)
+
+    generator = view.generator_class(urlconf=view.urlconf, api_version=view.api_version, patterns=view.patterns)
+
+    return generator.get_schema(request=None, public=view.serve_public)
+
+
+def render_schema(view, renderer):
+    key = type(renderer)
+
+    with rendered_schemas_lock:
+        if key not in rendered_schemas:
+            if "schema" not in rendered_schemas:
+                rendered_schemas["schema"] = load_schema(view)
+
+            content = renderer.render(rendered_schemas["schema"], renderer.media_type, {})
+            etag = f'W/"{hashlib.sha1(content).hexdigest()[:16]}"'
+
+            rendered_schemas[key] = (content, gzip.compress(content, mtime=0), etag)
+
+        return rendered_schemas[key]
+
+
+# SpectacularAPIView that builds the schema once per process (or reads it from
+# API_SCHEMA["FILE"]) and serves the rendered bytes, gzipped when the client
+# accepts it. The ETag is weak, so it holds for both encodings.
+class CachedSchemaView(SpectacularAPIView):
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if settings.API_SCHEMA["MODE"] == "live" or request.GET.get("lang") or request.GET.get("version"):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        content, compressed, etag = render_schema(self, renderer)
+
+        response = HttpResponse(
+            content,
+            content_type=f"{renderer.media_type}; charset={renderer.charset}" if renderer.charset else renderer.media_type,
+            headers={"ETag": etag, "Content-Disposition": f'inline; filename="{self._get_filename(request, None)}"'},
+        )
+        patch_vary_headers(response, ["Accept-Encoding"])
+
+        if accepts_gzip.search(request.headers.get("Accept-Encoding", "")):
+            response.content = compressed
+            response["Content-Encoding"] = "gzip"
+
+        return get_conditional_response(request, etag=etag, response=response)
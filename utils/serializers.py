@@ -0,0 +1,216 @@
+import decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import fields, relations, serializers
+from rest_framework.settings import api_settings
+
+from .timing import current_timings
+
+
+def convert_uuid(field):
+    if field.uuid_format != "hex_verbose":
+        return None
+
+    return str
+
+
+def convert_decimal(field):
+    if field.localize or not getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING):
+        return None
+
+    if field.decimal_places is None:
+        return "{:f}".format
+
+    quantum = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+
+    def convert(value):
+        return "{:f}".format(value.quantize(quantum, rounding=field.rounding, context=context))
+
+    return convert
+
+
+def convert_datetime(field):
+    if getattr(field, "format", api_settings.DATETIME_FORMAT).lower() != fields.ISO_8601:
+        return None
+
+    # Resolved once per page instead of once per row, as enforce_timezone() does.
+    field_timezone = getattr(field, "timezone", field.default_timezone())
+
+    if field_timezone is None:
+        return None
+
+    def convert(value):
+        if timezone.is_naive(value):
+            return field.to_representation(value)
+
+        value = value.astimezone(field_timezone).isoformat()
+
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+def convert_primary_key(field):
+    if field.pk_field is not None:
+        return None
+
+    return str
+
+
+# Fields whose representation is the database value itself.
+passthrough_fields = (fields.BooleanField, fields.CharField, fields.IntegerField)
+
+# Converters by serializer field class, made from the field they convert for
+# at the start of each serialize(). Fields without one, or whose options the
+# converter does not handle (it returns None then), use the field's own
+# to_representation().
+converter_factories = {
+    fields.UUIDField: convert_uuid,
+    fields.DecimalField: convert_decimal,
+    fields.DateTimeField: convert_datetime,
+    relations.PrimaryKeyRelatedField: convert_primary_key,
+}
+
+
+# ModelSerializer that renders only the fields= it is given, and renders the
+# expand= ones with the nested serializers of Meta.expandable_fields instead
+# of their plain representation. Expanded fields are always rendered.
+class FieldsetSerializerMixin:
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+
+        expandable_fields = getattr(self.Meta, "expandable_fields", {})
+
+        for name in expand:
+            self.fields[name] = expandable_fields[name](read_only=True)
+
+        if fields is not None:
+            for name in list(self.fields):
+                if name not in fields and name not in expand:
+                    self.fields.pop(name)
+
+
+def readable_fields(serializer, prefix="") -> list:
+    # (name, .values() key, field, readable fields of a nested serializer)
+    readable = []
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if "." in field.source or field.source == "*" or isinstance(field, serializers.ListSerializer):
+            raise ImproperlyConfigured(f"{type(serializer).__name__}.{name} is not a model field.")
+
+        key = prefix + field.source
+        nested = readable_fields(field, f"{key}__") if isinstance(field, serializers.BaseSerializer) else None
+
+        readable.append((name, key, field, nested))
+
+    return readable
+
+
+def compile_converters(fields: list) -> list:
+    # (name, .values() key, converter or None to keep the value as is, nested converters)
+    converters = []
+
+    for name, key, field, nested in fields:
+        if nested is not None or type(field) in passthrough_fields:
+            converter = None
+        else:
+            factory = converter_factories.get(type(field))
+            converter = (factory and factory(field)) or field.to_representation
+
+        converters.append((name, key, converter, nested and compile_converters(nested)))
+
+    return converters
+
+
+def represent(row: dict, converters: list) -> dict:
+    representation = {}
+
+    for name, key, converter, nested in converters:
+        value = row[key]
+
+        if value is None:
+            representation[name] = None
+        elif nested is not None:
+            representation[name] = represent(row, nested)
+        else:
+            representation[name] = value if converter is None else converter(value)
+
+    return representation
+
+
+# Read-only twin of a ModelSerializer for .values() rows: the same JSON, without
+# model instances or a walk through DRF's field machinery for every row. Model
+# fields, foreign key ids and nested serializers of a foreign key are
+# supported, the last ones from the joined columns of the related model.
+class ValuesSerializer:
+    def __init__(self, serializer_class, **kwargs):
+        self.serializer_class = serializer_class
+        self.kwargs = kwargs
+        self.fields = None
+
+    def get_fields(self) -> list:
+        if self.fields is None:
+            self.fields = readable_fields(self.serializer_class(**self.kwargs))
+
+        return self.fields
+
+    @property
+    def sources(self) -> list:
+        def keys(fields):
+            for _, key, _, nested in fields:
+                yield key
+
+                if nested is not None:
+                    yield from keys(nested)
+
+        return list(keys(self.get_fields()))
+
+    @property
+    def related(self) -> list:
+        def keys(fields):
+            for _, key, _, nested in fields:
+                if nested is not None:
+                    yield key
+                    yield from keys(nested)
+
+        return list(keys(self.get_fields()))
+
+    def narrow(self, queryset, *fields):
+        # The columns, and the joins, of what this serializer renders.
+        queryset = queryset.select_related(None)
+
+        if self.related:
+            queryset = queryset.select_related(*self.related)
+
+        return queryset.only(*self.sources, *fields)
+
+    def serialize_rows(self, rows) -> list:
+        converters = compile_converters(self.get_fields())
+
+        if any(nested is not None for _, _, _, nested in converters):
+            return [represent(row, converters) for row in rows]
+
+        return [
+            {
+                name: row[key] if converter is None or row[key] is None else converter(row[key])
+                for name, key, converter, _ in converters
+            }
+            for row in rows
+        ]
+
+    def serialize(self, rows) -> list:
+        timings = current_timings.get()
+
+        if timings is None:
+            return self.serialize_rows(rows)
+
+        with timings.timed("serializer"):
+            return self.serialize_rows(rows)
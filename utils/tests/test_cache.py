@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import tempfile
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from utils.cache import SharedMemoryCache
+
+def increment(location, times):
+    cache = SharedMemoryCache(location, {"OPTIONS": {"MAX_ENTRIES": 64, "SLOT_SIZE": 256}})
+
+    for _ in range(times):
+        cache.incr("counter")
+
+class SharedMemoryCacheTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.location = os.path.join(directory.name, "cache")
+        self.cache = self.make_cache()
+
+    def make_cache(self, **options):
+        return SharedMemoryCache(self.location, {"OPTIONS": {"MAX_ENTRIES": 64, "SLOT_SIZE": 256, **options}})
+
+    def test_basic_operations(self):
+        print("test_basic_operations")
+
+        self.cache.set("product", {"price": "10.00"})
+
+        self.assertDictEqual({"price": "10.00"}, self.cache.get("product"))
+        self.assertFalse(self.cache.add("product", "other"))
+        self.assertTrue(self.cache.add("account", "victo"))
+        self.assertEqual(["product", "account"], list(self.cache.get_many(["product", "account"])))
+
+        self.assertTrue(self.cache.delete("product"))
+        self.assertIsNone(self.cache.get("product"))
+        self.assertFalse(self.cache.delete("product"))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("account"))
+
+    def test_values_expire(self):
+        print("test_values_expire")
+
+        self.cache.set("short", 1, timeout=0.05)
+        self.cache.set("forever", 1, timeout=None)
+        self.cache.set("touched", 1, timeout=0.05)
+        self.cache.touch("touched", timeout=10)
+
+        time.sleep(0.1)
+
+        self.assertIsNone(self.cache.get("short"))
+        self.assertEqual(1, self.cache.get("forever"))
+        self.assertEqual(1, self.cache.get("touched"))
+
+    def test_values_larger_than_a_slot_are_not_cached(self):
+        print("test_values_larger_than_a_slot_are_not_cached")
+
+        self.cache.set("page", "small")
+        self.cache.set("page", "x" * 1000)
+
+        self.assertIsNone(self.cache.get("page"))
+
+    def test_full_buckets_evict_unreferenced_entries_first(self):
+        print("test_full_buckets_evict_unreferenced_entries_first")
+
+        cache = self.make_cache(MAX_ENTRIES=8)
+
+        for index in range(8):
+            cache.set(f"key-{index}", index)
+
+        # Every slot starts referenced, so the first eviction sweeps the whole
+        # clock and replaces key-0. Reading key-1 then gives it a second
+        # chance, and key-2 goes instead.
+        cache.set("key-8", 8)
+        cache.get("key-1")
+        cache.set("key-9", 9)
+
+        self.assertIsNone(cache.get("key-0"))
+        self.assertEqual(1, cache.get("key-1"))
+        self.assertIsNone(cache.get("key-2"))
+        self.assertEqual(9, cache.get("key-9"))
+
+    def test_processes_share_the_cache(self):
+        print("test_processes_share_the_cache")
+
+        self.cache.set("counter", 0)
+
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=increment, args=(self.location, 500)) for _ in range(4)]
+
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(2000, self.cache.get("counter"))
+
+    def test_each_layout_gets_its_own_file(self):
+        print("test_each_layout_gets_its_own_file")
+
+        self.cache.set("product", 1)
+
+        cache = self.make_cache(MAX_ENTRIES=128, SLOT_SIZE=512)
+        cache.set("page", "x" * 400)
+
+        self.assertIsNone(cache.get("product"))
+        self.assertEqual("x" * 400, cache.get("page"))
+        self.assertEqual(1, self.cache.get("product"))
+        self.assertNotEqual(self.cache.path, cache.path)
+
+    def test_a_file_of_another_layout_is_not_reformatted(self):
+        print("test_a_file_of_another_layout_is_not_reformatted")
+
+        cache = self.make_cache(SLOT_SIZE=512)
+
+        with open(cache.path, "wb") as cache_file:
+            cache_file.write(b"not a cache")
+
+        with self.assertRaises(ImproperlyConfigured):
+            cache.get("product")
+
+        with open(cache.path, "rb") as cache_file:
+            self.assertEqual(b"not a cache", cache_file.read())
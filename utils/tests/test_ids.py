@@ -0,0 +1,34 @@
+import time
+import uuid
+
+from django.test import SimpleTestCase
+
+from accounts.models import Account
+from products.models import Product
+from utils.ids import uuid7
+
+class UUID7Test(SimpleTestCase):
+    def test_uuid7_layout(self):
+        print("test_uuid7_layout")
+
+        before = time.time_ns() // 1_000_000
+        generated = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        self.assertEqual(7, generated.version)
+        self.assertEqual(uuid.RFC_4122, generated.variant)
+        self.assertTrue(before <= generated.int >> 80 <= after)
+
+    def test_uuid7_is_strictly_increasing(self):
+        print("test_uuid7_is_strictly_increasing")
+
+        generated = [uuid7() for _ in range(10000)]
+
+        self.assertListEqual(sorted(generated), generated)
+        self.assertEqual(len(generated), len(set(generated)))
+
+    def test_models_default_to_uuid7(self):
+        print("test_models_default_to_uuid7")
+
+        self.assertEqual(7, Account().id.version)
+        self.assertEqual(7, Product().id.version)
@@ -0,0 +1,88 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+
+class RoutedMiddlewareTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+    def test_api_runs_the_reduced_chain(self):
+        print("test_api_runs_the_reduced_chain")
+
+        response = self.client.get("/api/products/")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+        self.assertNotIn("sessionid", response.cookies)
+        self.assertEqual("DENY", response["X-Frame-Options"])
+
+    def test_api_keeps_common_middleware(self):
+        print("test_api_keeps_common_middleware")
+
+        response = self.client.get("/api/products")
+
+        self.assertEqual(status.HTTP_301_MOVED_PERMANENTLY, response.status_code)
+        self.assertEqual("/api/products/", response["Location"])
+
+    def test_api_posts_need_no_csrf_token(self):
+        print("test_api_posts_need_no_csrf_token")
+
+        client = self.client_class(enforce_csrf_checks=True)
+        client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        response = client.post(
+            "/api/products/", {"description": "Caneca", "price": 10, "quantity": 1}, format="json"
+        )
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+
+    def test_admin_and_docs_run_the_full_chain(self):
+        print("test_admin_and_docs_run_the_full_chain")
+
+        for url in ("/admin/login/", "/api/docs/", "/api/redoc/"):
+            response = Client().get(url)
+
+            self.assertEqual(status.HTTP_200_OK, response.status_code)
+            self.assertTrue(hasattr(response.wsgi_request, "session"))
+            self.assertTrue(hasattr(response.wsgi_request, "user"))
+
+    def test_admin_still_checks_csrf(self):
+        print("test_admin_still_checks_csrf")
+
+        client = Client(enforce_csrf_checks=True)
+        credentials = {"username": "victo", "password": "1234"}
+
+        self.assertEqual(status.HTTP_403_FORBIDDEN, client.post("/admin/login/", credentials).status_code)
+
+        client.get("/admin/login/")
+        response = client.post("/admin/login/", {**credentials, "csrfmiddlewaretoken": client.cookies["csrftoken"].value})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    async def test_chains_run_under_asgi(self):
+        print("test_chains_run_under_asgi")
+
+        response = await self.async_client.get("/api/async/products/")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertFalse(hasattr(response.asgi_request, "session"))
+
+        response = await self.async_client.get("/admin/login/")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertTrue(hasattr(response.asgi_request, "session"))
+
+    @override_settings(MIDDLEWARE_ROUTES=[("/api/", [])])
+    def test_routes_need_a_catch_all(self):
+        print("test_routes_need_a_catch_all")
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.client.get("/api/products/")
@@ -0,0 +1,167 @@
+import yaml
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from accounts.models import Account
+from benchmarks.suite import build_operations
+from products.models import Product
+
+# Maximum number of SQL queries each operation of schema.yml may run,
+# keyed by operationId. New endpoints must declare their budget here.
+QUERY_BUDGETS = {
+    "api_accounts_list": 2,
+    "api_accounts_create": 3,
+    "api_accounts_update": 9,
+    "api_accounts_partial_update": 8,
+    "api_accounts_management_update": 9,
+    "api_accounts_management_partial_update": 8,
+    "api_accounts_newest_list": 2,
+    "api_login_create": 5,
+    "api_products_list": 2,
+    "api_products_create": 4,
+    "api_products_bulk_create": 6,
+    "api_products_bulk_partial_update": 7,
+    "api_products_changes_list": 1,
+    "api_products_export_retrieve": 1,
+    "api_products_retrieve": 2,
+    "api_products_update": 6,
+    "api_products_partial_update": 6,
+    "api_products_reserve_create": 4,
+    "schema_retrieve": 0,
+}
+
+
+def load_schema_operations():
+    with open(settings.BASE_DIR / "schema.yml") as schema_file:
+        schema = yaml.safe_load(schema_file)
+
+    return {
+        operation["operationId"]: (method.upper(), path)
+        for path, methods in schema["paths"].items()
+        for method, operation in methods.items()
+    }
+
+
+class QueryBudgetTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        cls.common_user = Account.objects.create_user(
+            username="alex", password="abcd", first_name="Alexandre", last_name="Alves"
+        )
+
+        cls.admin = Account.objects.create_superuser(
+            username="rosi", password="123456", first_name="Rosi", last_name="Naldo"
+        )
+        cls.admin_token = Token.objects.create(user=cls.admin)
+
+        for index in range(5):
+            Account.objects.create_user(
+                username=f"user_{index}", password="1234", first_name="User", last_name=str(index), is_seller=True
+            )
+
+        cls.products = [
+            Product.objects.create(
+                description=f"Produto {index}",
+                price=10 + index,
+                quantity=index,
+                seller=cls.seller
+            )
+            for index in range(5)
+        ]
+
+        cls.product_data = {"description": "Produto novo", "price": "19.90", "quantity": 3, "is_active": True}
+
+    def get_request(self, operation_id):
+        product_id = self.products[0].id
+
+        requests = {
+            "api_accounts_list": ("/api/accounts/?page_size=10", None, None),
+            "api_accounts_create": (
+                "/api/accounts/",
+                {"username": "novo", "password": "1234", "first_name": "Novo", "last_name": "Usuario"},
+                None,
+            ),
+            "api_accounts_update": (
+                f"/api/accounts/{self.seller.id}/",
+                {"username": "victo", "password": "1234", "first_name": "Vic", "last_name": "Viana"},
+                self.seller_token,
+            ),
+            "api_accounts_partial_update": (f"/api/accounts/{self.seller.id}/", {"first_name": "Vic"}, self.seller_token),
+            "api_accounts_management_update": (
+                f"/api/accounts/{self.common_user.id}/management/", {"is_active": False}, self.admin_token
+            ),
+            "api_accounts_management_partial_update": (
+                f"/api/accounts/{self.common_user.id}/management/", {"is_active": False}, self.admin_token
+            ),
+            "api_accounts_newest_list": ("/api/accounts/newest/5/", None, None),
+            "api_login_create": ("/api/login/", {"username": "user_0", "password": "1234"}, None),
+            "api_products_list": ("/api/products/?page_size=10", None, None),
+            "api_products_create": ("/api/products/", self.product_data, self.seller_token),
+            "api_products_bulk_create": ("/api/products/bulk/", [self.product_data] * 20, self.seller_token),
+            "api_products_bulk_partial_update": (
+                "/api/products/bulk/",
+                [{"id": str(product.id), "price": "9.90", "quantity": 1} for product in self.products],
+                self.seller_token,
+            ),
+            "api_products_changes_list": ("/api/products/changes/?since=0", None, None),
+            "api_products_export_retrieve": ("/api/products/export/?format=csv", None, None),
+            "api_products_retrieve": (f"/api/products/{product_id}/", None, None),
+            "api_products_update": (f"/api/products/{product_id}/", self.product_data, self.seller_token),
+            "api_products_partial_update": (f"/api/products/{product_id}/", {"price": "29.90"}, self.seller_token),
+            "api_products_reserve_create": (
+                f"/api/products/{self.products[4].id}/reserve/", {"quantity": 1}, self.seller_token
+            ),
+            "schema_retrieve": ("/schema/", None, None),
+        }
+
+        return requests[operation_id]
+
+    def test_every_schema_operation_declares_a_budget(self):
+        print("test_every_schema_operation_declares_a_budget")
+
+        self.assertSetEqual(set(load_schema_operations()), set(QUERY_BUDGETS))
+
+    def test_every_schema_operation_has_a_benchmark(self):
+        print("test_every_schema_operation_has_a_benchmark")
+
+        self.assertSetEqual(set(load_schema_operations()), set(build_operations(catalog=None)))
+
+    def test_operations_stay_within_query_budget(self):
+        print("test_operations_stay_within_query_budget")
+
+        for operation_id, (method, _) in load_schema_operations().items():
+            with self.subTest(operation_id=operation_id):
+                url, data, token = self.get_request(operation_id)
+
+                if token:
+                    self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+                else:
+                    self.client.credentials()
+
+                # Budgets are for cache misses, and include what runs once the
+                # write commits.
+                cache.clear()
+
+                with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                    response = getattr(self.client, method.lower())(url, data=data, format="json")
+
+                    # Streamed responses only query the database while being consumed.
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+
+                self.assertLess(response.status_code, 400, getattr(response, "content", b""))
+                self.assertLessEqual(
+                    len(queries),
+                    QUERY_BUDGETS[operation_id],
+                    "\n".join(query["sql"] for query in queries.captured_queries),
+                )
@@ -0,0 +1,115 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.backends.utils import CursorWrapper
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+from rest_framework.views import status
+
+from accounts.models import Account
+from accounts.views import AccountView
+from products.models import Product
+from products.views import ProductView
+
+class SingleFlightTest(TransactionTestCase):
+    requests = 8
+
+    def setUp(self):
+        seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        for index in range(3):
+            Product.objects.create(description=f"Produto {index}", price=10, quantity=1, seller=seller)
+
+        cache.clear()
+
+    def count_queries(self):
+        # Counts the queries of every thread, each of which has its own
+        # connection, leaving out the version lookups every request makes.
+        queries = []
+        execute = CursorWrapper._execute
+
+        def counting_execute(cursor, sql, *args, **kwargs):
+            if "utils_generation" not in sql:
+                queries.append(sql)
+
+            return execute(cursor, sql, *args, **kwargs)
+
+        return queries, mock.patch.object(CursorWrapper, "_execute", counting_execute)
+
+    def slow_down(self, view_class):
+        # Keeps the rebuild running long enough for every request to miss.
+        filter_queryset = view_class.filter_queryset
+
+        def slow_filter_queryset(view, queryset):
+            time.sleep(0.2)
+
+            return filter_queryset(view, queryset)
+
+        return mock.patch.object(view_class, "filter_queryset", slow_filter_queryset)
+
+    def get_concurrently(self, url):
+        barrier = threading.Barrier(self.requests)
+        responses = []
+
+        def get():
+            barrier.wait()
+
+            responses.append(APIClient().get(url))
+
+        workers = [threading.Thread(target=get) for _ in range(self.requests)]
+
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return responses
+
+    def assert_single_flight(self, view_class, url):
+        queries, counting = self.count_queries()
+
+        with counting, self.slow_down(view_class):
+            responses = self.get_concurrently(url)
+
+        self.assertEqual(self.requests, len(responses))
+        self.assertSetEqual({status.HTTP_200_OK}, {response.status_code for response in responses})
+        self.assertEqual(1, len({response.content for response in responses}))
+        self.assertEqual(1, len(queries), queries)
+
+    def test_concurrent_product_list_misses_query_once(self):
+        print("test_concurrent_product_list_misses_query_once")
+
+        self.assert_single_flight(ProductView, "/api/products/?page_size=10")
+
+    def test_concurrent_account_list_misses_query_once(self):
+        print("test_concurrent_account_list_misses_query_once")
+
+        self.assert_single_flight(AccountView, "/api/accounts/?page_size=10")
+
+    def test_waiting_requests_get_the_stale_response(self):
+        print("test_waiting_requests_get_the_stale_response")
+
+        stale_content = APIClient().get("/api/products/").content
+        Product.objects.update(description="Produto novo")
+        Product.objects.first().save()
+
+        rebuilt = []
+
+        with self.slow_down(ProductView):
+            leader = threading.Thread(target=lambda: rebuilt.append(APIClient().get("/api/products/")))
+            leader.start()
+            time.sleep(0.05)
+
+            started = time.perf_counter()
+            response = APIClient().get("/api/products/")
+            elapsed = time.perf_counter() - started
+
+            leader.join()
+
+        self.assertEqual(stale_content, response.content)
+        self.assertLess(elapsed, 0.15)
+        self.assertNotEqual(stale_content, rebuilt[0].content)
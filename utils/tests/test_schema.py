@@ -0,0 +1,95 @@
+import gzip
+import json
+import tempfile
+from unittest import mock, skipUnless
+
+import yaml
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from utils import schema
+
+class CommittedSchemaTest(APITestCase):
+    # Integer limits in the schema come from the database backend.
+    @skipUnless(connection.vendor == "postgresql", "schema.yml is generated against PostgreSQL")
+    def test_committed_schema_is_up_to_date(self):
+        print("test_committed_schema_is_up_to_date")
+
+        with open(settings.API_SCHEMA["FILE"], "rb") as file:
+            committed = yaml.safe_load(file)
+
+        # Compared as data, through a YAML round trip like the committed file.
+        generated = yaml.safe_load(yaml.safe_dump(SchemaGenerator().get_schema(request=None, public=True)))
+
+        self.assertEqual(
+            generated, committed, "schema.yml is stale, run `python manage.py spectacular --file schema.yml`"
+        )
+
+
+class CachedSchemaViewTest(APITestCase):
+    def setUp(self) -> None:
+        schema.rendered_schemas.clear()
+
+    def tearDown(self) -> None:
+        schema.rendered_schemas.clear()
+
+    def test_schema_is_built_once(self):
+        print("test_schema_is_built_once")
+
+        with mock.patch("utils.schema.load_schema", wraps=schema.load_schema) as load_schema:
+            yaml_response = self.client.get("/schema/")
+            json_response = self.client.get("/schema/?format=json")
+            self.client.get("/schema/")
+
+        self.assertEqual(1, load_schema.call_count)
+        self.assertEqual(status.HTTP_200_OK, yaml_response.status_code)
+        self.assertEqual("application/vnd.oai.openapi; charset=utf-8", yaml_response["Content-Type"])
+        self.assertEqual(yaml.safe_load(yaml_response.content), json.loads(json_response.content))
+        self.assertNotEqual(yaml_response["ETag"], json_response["ETag"])
+
+    def test_schema_is_served_gzipped(self):
+        print("test_schema_is_served_gzipped")
+
+        plain = self.client.get("/schema/")
+        compressed = self.client.get("/schema/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual("gzip", compressed["Content-Encoding"])
+        self.assertEqual(plain.content, gzip.decompress(compressed.content))
+        self.assertEqual(plain["ETag"], compressed["ETag"])
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+
+    def test_unchanged_schema_answers_304(self):
+        print("test_unchanged_schema_answers_304")
+
+        etag = self.client.get("/schema/")["ETag"]
+        response = self.client.get("/schema/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        self.assertEqual(b"", response.content)
+
+    def test_file_mode_serves_the_file(self):
+        print("test_file_mode_serves_the_file")
+
+        with tempfile.NamedTemporaryFile(suffix=".yml") as file:
+            file.write(b"openapi: 3.0.3\ninfo:\n  title: Komercio\n  version: 1.0.0\npaths: {}\n")
+            file.flush()
+
+            with override_settings(API_SCHEMA={"MODE": "file", "FILE": file.name}):
+                response = self.client.get("/schema/?format=json")
+
+        self.assertEqual({}, response.json()["paths"])
+
+    @override_settings(API_SCHEMA={**settings.API_SCHEMA, "MODE": "live"})
+    def test_live_mode_builds_every_time(self):
+        print("test_live_mode_builds_every_time")
+
+        with mock.patch("utils.schema.load_schema") as load_schema:
+            response = self.client.get("/schema/")
+
+        load_schema.assert_not_called()
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotIn("ETag", response)
@@ -0,0 +1,117 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from accounts.models import Account
+from accounts.serializers import AccountSerializer
+from products.models import Product
+from products.serializers import ProductDetailSerializer, ProductSerializer
+from utils.serializers import ValuesSerializer
+
+
+# The contract is the JSON, UUIDs may reach the renderer as objects or strings.
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+class ValuesSerializerTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+        cls.customer = Account.objects.create_user(
+            username="maria", password="1234", first_name="Maria", last_name="Souza", is_active=False
+        )
+
+        for description, price, quantity, is_active in [
+            ("Caneca", Decimal("19.9"), 3, True),
+            ("Camiseta", Decimal("10"), 0, False),
+            ("Boné", Decimal("0.01"), 2147483647, True),
+            ("Mochila", Decimal("99999999.99"), 1, True),
+        ]:
+            Product.objects.create(
+                description=description, price=price, quantity=quantity, is_active=is_active, seller=cls.seller
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_products_match_model_serializer(self):
+        print("test_products_match_model_serializer")
+
+        products = Product.objects.order_by("id")
+        values_serializer = ValuesSerializer(ProductSerializer)
+
+        self.assertEqual(
+            render(ProductSerializer(products, many=True).data),
+            render(values_serializer.serialize(products.values(*values_serializer.sources))),
+        )
+
+    def test_accounts_match_model_serializer(self):
+        print("test_accounts_match_model_serializer")
+
+        accounts = Account.objects.order_by("id")
+        values_serializer = ValuesSerializer(AccountSerializer)
+
+        self.assertNotIn("password", values_serializer.sources)
+        self.assertEqual(
+            render(AccountSerializer(accounts, many=True).data),
+            render(values_serializer.serialize(accounts.values(*values_serializer.sources))),
+        )
+
+    @override_settings(TIME_ZONE="America/Sao_Paulo")
+    def test_datetimes_follow_the_current_timezone(self):
+        print("test_datetimes_follow_the_current_timezone")
+
+        products = Product.objects.order_by("id")
+        values_serializer = ValuesSerializer(ProductSerializer)
+
+        data = values_serializer.serialize(products.values(*values_serializer.sources))
+
+        self.assertEqual(render(ProductSerializer(products, many=True).data), render(data))
+        self.assertTrue(data[0]["created_at"].endswith("-03:00"))
+
+    def test_list_endpoints_match_model_serializer(self):
+        print("test_list_endpoints_match_model_serializer")
+
+        response = self.client.get("/api/products/?ordering=price&page_size=10")
+        products = sorted(Product.objects.all(), key=lambda product: (product.price, product.id))
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(render(ProductSerializer(products, many=True).data), render(response.json()["results"]))
+
+        response = self.client.get("/api/accounts/?page_size=10")
+        accounts = Account.objects.order_by("-date_joined", "-id")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(render(AccountSerializer(accounts, many=True).data), render(response.json()["results"]))
+
+    def test_nested_serializers_match_model_serializer(self):
+        print("test_nested_serializers_match_model_serializer")
+
+        products = Product.objects.select_related("seller").order_by("id")
+        values_serializer = ValuesSerializer(ProductDetailSerializer)
+
+        self.assertIn("seller__username", values_serializer.sources)
+        self.assertEqual(
+            render(ProductDetailSerializer(products, many=True).data),
+            render(values_serializer.serialize(products.values(*values_serializer.sources))),
+        )
+
+    def test_related_fields_are_rejected(self):
+        print("test_related_fields_are_rejected")
+
+        class ProductSellerSerializer(serializers.ModelSerializer):
+            seller_username = serializers.CharField(source="seller.username")
+
+            class Meta:
+                model = Product
+                fields = ["id", "seller_username"]
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(ProductSellerSerializer).sources
@@ -0,0 +1,82 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from accounts.models import Account
+from products.models import Product
+
+SAMPLE_ALL = {**settings.REQUEST_TIMING, "SAMPLE_RATE": 1.0}
+
+class RequestTimingTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.seller = Account.objects.create_user(
+            username="victo", password="1234", first_name="Victoria", last_name="Viana", is_seller=True
+        )
+
+        for index in range(3):
+            Product.objects.create(description=f"Caneca {index}", price=10, quantity=5, seller=cls.seller)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_unsampled_requests_are_not_timed(self):
+        print("test_unsampled_requests_are_not_timed")
+
+        response = self.client.get("/api/products/")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(REQUEST_TIMING=SAMPLE_ALL)
+    def test_sampled_requests_report_their_timings(self):
+        print("test_sampled_requests_report_their_timings")
+
+        with self.assertLogs("utils.timing", "INFO") as logs:
+            response = self.client.get("/api/products/")
+
+        metrics = {metric.split(";")[0]: metric for metric in response["Server-Timing"].split(", ")}
+
+        self.assertSetEqual({"db", "serializer", "render", "total"}, set(metrics))
+        self.assertIn('desc="2 queries"', metrics["db"])
+
+        line = json.loads(logs.records[0].getMessage())
+
+        self.assertEqual("/api/products/", line["path"])
+        self.assertEqual(200, line["status"])
+        self.assertEqual(2, line["queries"])
+        self.assertIn("serializer_ms", line)
+        self.assertListEqual([], line["slow_queries"])
+
+    @override_settings(REQUEST_TIMING={**SAMPLE_ALL, "SLOW_QUERY_MS": 0})
+    def test_slow_queries_are_logged_with_their_plan(self):
+        print("test_slow_queries_are_logged_with_their_plan")
+
+        with self.assertLogs("utils.timing", "INFO") as logs:
+            response = self.client.get("/api/products/")
+
+        slow_queries = json.loads(logs.records[0].getMessage())["slow_queries"]
+
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        self.assertEqual(2, len(slow_queries))
+        self.assertTrue(all(query["sql"].startswith("SELECT") and query["plan"] for query in slow_queries))
+
+    @override_settings(REQUEST_TIMING=SAMPLE_ALL)
+    async def test_async_requests_are_timed(self):
+        print("test_async_requests_are_timed")
+
+        with self.assertLogs("utils.timing", "INFO"):
+            response = await self.async_client.get("/api/async/products/")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        self.assertIn("serializer;dur=", response["Server-Timing"])
+
+        with self.assertLogs("utils.timing", "INFO"):
+            response = await self.async_client.get("/admin/login/")
+
+        self.assertIn("render;dur=", response["Server-Timing"])
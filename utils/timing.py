@@ -0,0 +1,208 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Timings of the request being handled, None when it was not sampled. Context
+# variables follow the request into sync_to_async() threads.
+current_timings = contextvars.ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = collections.defaultdict(float)
+        self.running = set()
+        self.queries = 0
+        self.slow_queries = []
+        self.explaining = False
+
+    @contextlib.contextmanager
+    def timed(self, name):
+        # Nested sections of the same name (a serializer inside another) are
+        # only counted once.
+        if name in self.running:
+            yield
+            return
+
+        self.running.add(name)
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.durations[name] += time.perf_counter() - started
+            self.running.discard(name)
+
+    def add_query(self, connection, sql, params, many, duration):
+        self.queries += 1
+        self.durations["db"] += duration
+
+        if duration * 1000 < settings.REQUEST_TIMING["SLOW_QUERY_MS"]:
+            return
+
+        slow_query = {"sql": sql, "duration_ms": round(duration * 1000, 1), "plan": None}
+
+        if not many and sql.lstrip().upper().startswith("SELECT"):
+            slow_query["plan"] = self.explain(connection, sql, params)
+
+        self.slow_queries.append(slow_query)
+
+    def explain(self, connection, sql, params):
+        self.explaining = True
+
+        try:
+            # A savepoint, so a failed EXPLAIN cannot break the request's transaction.
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+
+                return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+        except DatabaseError:
+            return None
+        finally:
+            self.explaining = False
+
+    def server_timing(self):
+        metrics = [f'db;dur={self.durations["db"] * 1000:.1f};desc="{self.queries} queries"']
+        metrics += [
+            f"{name};dur={duration * 1000:.1f}" for name, duration in self.durations.items() if name != "db"
+        ]
+        metrics.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+
+        return ", ".join(metrics)
+
+    def log(self, request, response):
+        logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": self.queries,
+            **{f"{name}_ms": round(duration * 1000, 1) for name, duration in self.durations.items()},
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "slow_queries": self.slow_queries,
+        }))
+
+
+def record_query(execute, sql, params, many, context):
+    timings = current_timings.get()
+
+    if timings is None or timings.explaining:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(context["connection"], sql, params, many, time.perf_counter() - started)
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+class TimedSerializerMixin:
+    def to_representation(self, instance):
+        timings = current_timings.get()
+
+        if timings is None:
+            return super().to_representation(instance)
+
+        with timings.timed("serializer"):
+            return super().to_representation(instance)
+
+
+# Samples REQUEST_TIMING["SAMPLE_RATE"] of the requests and reports their
+# database, serializer and render times in a Server-Timing header and a JSON
+# log line. Requests that are not sampled only cost a random number.
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+    _is_coroutine = None
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+            self.process_template_response = self.aprocess_template_response
+
+    def start(self):
+        if random.random() >= settings.REQUEST_TIMING["SAMPLE_RATE"]:
+            return None
+
+        # Connections opened before this module was imported missed the signal.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+        return current_timings.set(RequestTimings())
+
+    def finish(self, token, request, response):
+        timings = current_timings.get()
+        current_timings.reset(token)
+
+        if response is not None:
+            response["Server-Timing"] = timings.server_timing()
+            timings.log(request, response)
+
+        return response
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+
+        token = self.start()
+
+        if token is None:
+            return self.get_response(request)
+
+        response = None
+
+        try:
+            response = self.get_response(request)
+        finally:
+            self.finish(token, request, response)
+
+        return response
+
+    async def __acall__(self, request):
+        token = self.start()
+
+        if token is None:
+            return await self.get_response(request)
+
+        response = None
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.finish(token, request, response)
+
+        return response
+
+    def process_template_response(self, request, response):
+        # Renders here instead of in the handler, to time it.
+        timings = current_timings.get()
+
+        if timings is not None:
+            with timings.timed("render"):
+                response.render()
+
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return RequestTimingMiddleware.process_template_response(self, request, response)
@@ -0,0 +1,85 @@
+import inspect
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+
+# Read-only JSON views for ASGI servers. They reuse the DRF filter backends,
+# pagination and serializers, but run their queries with the async ORM, so a
+# slow query suspends the request instead of holding a worker. There is no
+# authentication or permission check, only public reads belong here.
+class AsyncReadView(View):
+    http_method_names = ["get", "head", "options"]
+    renderer = JSONRenderer()
+
+    queryset = None
+    serializer_class = None
+    lookup_field = "pk"
+
+    def initialize_request(self, request):
+        request = Request(request)
+        request.accepted_renderer = self.renderer
+        request.accepted_media_type = self.renderer.media_type
+
+        return request
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            self.renderer.render(data), status=status, content_type=self.renderer.media_type, headers=headers
+        )
+
+    async def aget_object(self):
+        try:
+            return await self.queryset.aget(**{self.lookup_field: self.kwargs[self.lookup_field]})
+        except (self.queryset.model.DoesNotExist, DjangoValidationError):
+            raise Http404
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = self.initialize_request(request)
+
+        try:
+            response = super().dispatch(self.request, *args, **kwargs)
+
+            # Django 4.1 answers disallowed methods synchronously, even here.
+            return await response if inspect.isawaitable(response) else response
+        except (APIException, Http404) as exc:
+            response = exception_handler(exc, {"view": self, "request": self.request})
+
+            return self.render(response.data, status=response.status_code)
+
+
+class AsyncListView(AsyncReadView):
+    filter_backends = []
+    pagination_class = None
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+
+        return queryset
+
+    async def get(self, request, *args, **kwargs):
+        # Filters only build the query, which runs in apaginate_queryset().
+        queryset = self.filter_queryset(self.queryset.all())
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, self)
+
+        if page is None:
+            return self.render(self.serializer_class([item async for item in queryset], many=True).data)
+
+        serializer = self.serializer_class(page, many=True)
+
+        return self.render(paginator.get_paginated_response(serializer.data).data)
+
+
+class AsyncRetrieveView(AsyncReadView):
+    async def get(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+
+        return self.render(self.serializer_class(instance).data)